@@ -1,7 +1,9 @@
 from django.contrib import admin
 
-from .models import Computer, Software
+from .models import AlteracaoSoftware, Computer, InventarioPendente, Software
 
 # Register your models here.
 admin.site.register(Computer)
 admin.site.register(Software)
+admin.site.register(InventarioPendente)
+admin.site.register(AlteracaoSoftware)
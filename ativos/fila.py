@@ -0,0 +1,127 @@
+"""
+Fila de inventários.
+
+Quando um laboratório inteiro liga ao mesmo tempo, os agentes esperavam a
+gravação de cada inventário e ocupavam todos os workers da aplicação. Agora
+a view só valida o XML, guarda o conteúdo comprimido em `InventarioPendente`
+e responde; o comando `processar_inventarios` grava a fila em lotes.
+
+Os inventários de um mesmo computador são gravados na ordem em que
+chegaram: só o mais antigo de cada hostname é processado, e um que falhou
+segura os seguintes até ser gravado ou esgotar as tentativas.
+"""
+
+import json
+import logging
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from ativos.inventario import digest_softwares, registrar_inventario
+from ativos.models import Computer, InventarioPendente
+
+logger = logging.getLogger(__name__)
+
+MAXIMO_TENTATIVAS = 5
+ESPERA_RETENTATIVA = timedelta(minutes=1)
+
+
+def _pendentes_de(hostname):
+    # inventários que ainda serão gravados (os que esgotaram as tentativas não)
+    return InventarioPendente.objects.filter(
+        hostname=hostname, processar_apos__isnull=False
+    )
+
+
+def enfileirar_inventario(data: dict) -> Optional[InventarioPendente]:
+    """
+    Coloca o inventário na fila. Se os softwares são os mesmos já gravados
+    e não há nada na fila para o computador, só atualiza o `last_seen` e
+    devolve None.
+    """
+    hostname = data["CONTENT"]["HARDWARE"]["NAME"]
+    digest = digest_softwares(data["CONTENT"].get("SOFTWARES"))
+
+    if (
+        Computer.objects.filter(hostname=hostname, softwares_digest=digest)
+        .filter(~Exists(_pendentes_de(OuterRef("hostname"))))
+        .update(last_seen=timezone.now())
+    ):
+        return None
+
+    conteudo = json.dumps(
+        {"DEVICEID": data.get("DEVICEID"), "CONTENT": data["CONTENT"]}
+    )
+    return InventarioPendente.objects.create(
+        hostname=hostname, conteudo=zlib.compress(conteudo.encode())
+    )
+
+
+def _gravar(pendente: InventarioPendente) -> None:
+    data = json.loads(zlib.decompress(pendente.conteudo))
+    registrar_inventario(
+        pendente.hostname,
+        data["DEVICEID"],
+        data["CONTENT"].get("SOFTWARES"),
+        visto_em=pendente.recebido_em,
+    )
+
+
+def _processar(pendente_id: int, agora: datetime) -> Optional[bool]:
+    """True se gravou, False se falhou, None se outro worker pegou antes."""
+    with transaction.atomic():
+        pendente = (
+            InventarioPendente.objects.select_for_update(skip_locked=True)
+            .filter(pk=pendente_id, processar_apos__isnull=False)
+            .first()
+        )
+        if pendente is None:
+            return None
+
+        try:
+            # savepoint: uma falha desfaz só a gravação, não o registro dela
+            with transaction.atomic():
+                _gravar(pendente)
+        except Exception as e:
+            logger.exception("Falha ao gravar o inventário de %s", pendente.hostname)
+            pendente.tentativas += 1
+            pendente.erro = f"{type(e).__name__}: {e}"
+            pendente.processar_apos = (
+                agora + ESPERA_RETENTATIVA * 2 ** (pendente.tentativas - 1)
+                if pendente.tentativas < MAXIMO_TENTATIVAS
+                else None
+            )
+            pendente.save(update_fields=["tentativas", "erro", "processar_apos"])
+            return False
+
+        pendente.delete()
+        return True
+
+
+def processar_fila(tamanho_lote: int = 100) -> tuple[int, int]:
+    """
+    Grava um lote da fila: o inventário mais antigo de cada computador que
+    já pode ser processado. Devolve (gravados, falhas).
+    """
+    agora = timezone.now()
+    anteriores = _pendentes_de(OuterRef("hostname")).filter(id__lt=OuterRef("id"))
+    proximos = list(
+        InventarioPendente.objects.filter(processar_apos__lte=agora)
+        .filter(~Exists(anteriores))
+        .order_by("id")
+        .values_list("id", flat=True)[:tamanho_lote]
+    )
+
+    gravados = falhas = 0
+    for pendente_id in proximos:
+        resultado = _processar(pendente_id, agora)
+        if resultado is True:
+            gravados += 1
+        elif resultado is False:
+            falhas += 1
+
+    return gravados, falhas
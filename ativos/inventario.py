@@ -0,0 +1,247 @@
+"""
+Gravação em lote dos softwares de um inventário.
+
+Um inventário traz centenas de pacotes; com um `get_or_create` por pacote,
+o primeiro inventário de uma máquina custava duas consultas por software.
+Aqui o custo é fixo: uma consulta resolve os softwares já conhecidos pela
+chave natural, um `bulk_create` grava os que faltam e as instalações do
+computador são atualizadas pela diferença.
+
+`Software` é um catálogo: cada pacote aparece uma vez, não importa em
+quantos computadores está instalado. O que é de cada máquina, como a data
+de instalação, fica em `Instalacao`.
+
+Como a maioria dos inventários repete a lista da vez anterior, o computador
+guarda um resumo (`digest_softwares`) do último inventário processado; se
+o resumo não mudou, nada disso é executado.
+"""
+
+import hashlib
+import logging
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from ativos.models import AlteracaoSoftware, Computer, Instalacao, Software
+
+logger = logging.getLogger(__name__)
+
+# campos que identificam um software, na ordem do índice único de Software
+CHAVE_NATURAL = ("name", "version", "arch", "publisher", "guid")
+
+
+def _texto(valor) -> str:
+    # NULL não conflita em índice único; texto vazio sim
+    return str(valor).strip() if valor is not None else ""
+
+
+def _data_instalacao(valor) -> Optional[date]:
+    try:
+        return datetime.strptime(valor, "%d/%m/%Y").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def normalizar_softwares(softwares_data) -> dict[tuple, dict]:
+    """
+    Campos de cada <SOFTWARES> do inventário (os do software e a data de
+    instalação), indexados pela chave natural. Pacotes repetidos no mesmo
+    inventário aparecem uma vez só.
+    """
+    # com um único pacote o parser devolve um dict em vez de lista
+    if isinstance(softwares_data, dict):
+        softwares_data = [softwares_data]
+
+    softwares = {}
+    for software_data in softwares_data or []:
+        campos = {
+            "arch": _texto(software_data.get("ARCH")),
+            "guid": _texto(software_data.get("GUID")),
+            "name": _texto(software_data.get("NAME")),
+            "publisher": _texto(software_data.get("PUBLISHER")),
+            "version": _texto(software_data.get("VERSION")),
+            "install_date": _data_instalacao(software_data.get("INSTALLDATE")),
+        }
+        softwares[chave_natural(campos)] = campos
+
+    return softwares
+
+
+def digest_softwares(softwares_data) -> str:
+    """
+    Resumo SHA-256 dos softwares de um inventário, com as datas de
+    instalação como vieram do agente, independente da ordem e de pacotes
+    repetidos.
+    """
+    if isinstance(softwares_data, dict):
+        softwares_data = [softwares_data]
+
+    pacotes = sorted(
+        {
+            "\x1f".join(
+                _texto(software_data.get(campo))
+                for campo in ("NAME", "VERSION", "ARCH", "PUBLISHER", "GUID")
+            )
+            + "\x1f"
+            + _texto(software_data.get("INSTALLDATE"))
+            for software_data in softwares_data or []
+        }
+    )
+
+    return hashlib.sha256("\x1e".join(pacotes).encode()).hexdigest()
+
+
+def chave_natural(campos: dict) -> tuple:
+    return tuple(campos[campo] for campo in CHAVE_NATURAL)
+
+
+def _buscar_ids(softwares: dict[tuple, dict]) -> dict[tuple, int]:
+    # filtra pelos nomes (primeira coluna do índice único) e confere a chave
+    # completa em Python: uma consulta, sem um OR por pacote
+    nomes = {campos["name"] for campos in softwares.values()}
+    encontrados = Software.objects.filter(name__in=nomes).values("id", *CHAVE_NATURAL)
+
+    return {
+        chave: software["id"]
+        for software in encontrados
+        if (chave := chave_natural(software)) in softwares
+    }
+
+
+def resolver_softwares(softwares: dict[tuple, dict]) -> dict[tuple, int]:
+    """Ids dos softwares por chave natural, cadastrando os que faltam."""
+    ids = _buscar_ids(softwares)
+
+    faltantes = {
+        chave: campos for chave, campos in softwares.items() if chave not in ids
+    }
+    if faltantes:
+        # outro inventário pode ter cadastrado o mesmo pacote nesse meio
+        # tempo; o conflito é ignorado e o id vem da nova busca
+        Software.objects.bulk_create(
+            [
+                Software(**{campo: campos[campo] for campo in CHAVE_NATURAL})
+                for campos in faltantes.values()
+            ],
+            ignore_conflicts=True,
+        )
+        ids |= _buscar_ids(faltantes)
+
+    return ids
+
+
+def sincronizar_softwares(
+    computer: Computer, instalacoes: dict[int, Optional[date]]
+) -> tuple[set[int], set[int]]:
+    """
+    Deixa o computador com exatamente as `instalacoes` (id do software ->
+    data de instalação), alterando só a diferença. Devolve os ids
+    (adicionados, removidos).
+    """
+    atuais = {
+        software_id: (id, install_date)
+        for id, software_id, install_date in Instalacao.objects.filter(
+            computer=computer
+        ).values_list("id", "software_id", "install_date")
+    }
+    adicionados = instalacoes.keys() - atuais.keys()
+    removidos = atuais.keys() - instalacoes.keys()
+    # mesmo pacote reinstalado: só a data muda
+    alteradas = [
+        Instalacao(id=id, install_date=instalacoes[software_id])
+        for software_id, (id, install_date) in atuais.items()
+        if software_id in instalacoes and instalacoes[software_id] != install_date
+    ]
+
+    if removidos:
+        Instalacao.objects.filter(computer=computer, software_id__in=removidos).delete()
+    if adicionados:
+        Instalacao.objects.bulk_create(
+            [
+                Instalacao(
+                    computer=computer,
+                    software_id=software_id,
+                    install_date=instalacoes[software_id],
+                )
+                for software_id in adicionados
+            ],
+            ignore_conflicts=True,
+        )
+    if alteradas:
+        Instalacao.objects.bulk_update(alteradas, ["install_date"])
+
+    return adicionados, removidos
+
+
+def registrar_alteracoes(
+    computer: Computer,
+    adicionados: Iterable[int],
+    removidos: Iterable[int],
+    registrado_em: datetime,
+) -> None:
+    """Acrescenta ao histórico os softwares instalados e removidos."""
+    AlteracaoSoftware.objects.bulk_create(
+        [
+            AlteracaoSoftware(
+                computer=computer,
+                software_id=software_id,
+                instalado=instalado,
+                registrado_em=registrado_em,
+            )
+            for ids, instalado in ((adicionados, True), (removidos, False))
+            for software_id in ids
+        ]
+    )
+
+
+def registrar_inventario(
+    hostname: str,
+    device_uid: Optional[str],
+    softwares_data,
+    visto_em: Optional[datetime] = None,
+) -> Computer:
+    """
+    Grava os softwares de um inventário no computador `hostname`.
+    `visto_em` é quando o inventário foi recebido (padrão: agora).
+    """
+    digest = digest_softwares(softwares_data)
+    agora = visto_em or timezone.now()
+
+    # inventário igual ao anterior: só registra que o computador apareceu
+    if Computer.objects.filter(hostname=hostname, softwares_digest=digest).update(
+        last_seen=agora
+    ):
+        return Computer.objects.filter(hostname=hostname).first()
+
+    computer, is_new = Computer.objects.get_or_create(hostname=hostname)
+
+    if is_new:
+        computer.device_uid = device_uid
+
+    softwares = normalizar_softwares(softwares_data)
+    with transaction.atomic():
+        ids = resolver_softwares(softwares)
+        adicionados, removidos = sincronizar_softwares(
+            computer,
+            {ids[chave]: campos["install_date"] for chave, campos in softwares.items()},
+        )
+        # o primeiro inventário é a linha de base, não uma alteração
+        if not is_new:
+            registrar_alteracoes(computer, adicionados, removidos, agora)
+        # gravado junto com os softwares: se a sincronização falhar, o
+        # próximo inventário não é descartado como repetido
+        computer.softwares_digest = digest
+        computer.last_seen = agora
+        computer.save()
+
+    if not is_new and (adicionados or removidos):
+        logger.info(
+            "%s: %d softwares instalados, %d removidos",
+            computer,
+            len(adicionados),
+            len(removidos),
+        )
+
+    return computer
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ativos.fila import processar_fila
+
+
+class Command(BaseCommand):
+    help = "Grava os inventários recebidos pelos agentes que estão na fila"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote", type=int, default=100, help="inventários por lote (padrão: 100)"
+        )
+        parser.add_argument(
+            "--continuo",
+            action="store_true",
+            help="continua aguardando novos inventários quando a fila esvazia",
+        )
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=5,
+            help="segundos entre consultas com a fila vazia (padrão: 5)",
+        )
+
+    def handle(self, *args, **options):
+        total_gravados = total_falhas = 0
+
+        while True:
+            gravados, falhas = processar_fila(options["lote"])
+            total_gravados += gravados
+            total_falhas += falhas
+
+            if gravados or falhas:
+                continue
+            if not options["continuo"]:
+                break
+            time.sleep(options["intervalo"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total_gravados} inventários gravados, {total_falhas} falhas."
+            )
+        )
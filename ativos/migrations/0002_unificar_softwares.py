@@ -0,0 +1,43 @@
+from django.db import migrations
+
+CHAVE_NATURAL = ("name", "version", "arch", "publisher", "guid", "install_date")
+
+
+def unificar_softwares(apps, schema_editor):
+    """
+    O índice único trata NULL como distinto, então os campos de texto passam
+    a vazio; softwares repetidos (o `get_or_create` não impedia corridas) são
+    unificados no de menor id antes de criar o índice.
+    """
+    Software = apps.get_model("ativos", "Software")
+    Instalacao = apps.get_model("ativos", "Computer").softwares.through
+
+    for campo in CHAVE_NATURAL[:-1]:
+        Software.objects.filter(**{f"{campo}__isnull": True}).update(**{campo: ""})
+
+    mantidos = {}
+    for software in Software.objects.order_by("id").values("id", *CHAVE_NATURAL):
+        chave = tuple(software[campo] for campo in CHAVE_NATURAL)
+        mantido = mantidos.setdefault(chave, software["id"])
+        if mantido == software["id"]:
+            continue
+
+        for instalacao in Instalacao.objects.filter(software_id=software["id"]):
+            Instalacao.objects.get_or_create(
+                computer_id=instalacao.computer_id, software_id=mantido
+            )
+        Software.objects.filter(id=software["id"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ativos", "0001_initial"),
+    ]
+
+    operations = [
+        # só dados: no PostgreSQL os DELETEs deixam verificações de FK
+        # adiadas, e um ALTER TABLE em ativos_software na mesma transação
+        # falharia ("pending trigger events"). O índice vem na 0003.
+        migrations.RunPython(unificar_softwares, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ativos", "0002_unificar_softwares"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="software",
+            constraint=models.UniqueConstraint(
+                fields=("name", "version", "arch", "publisher", "guid", "install_date"),
+                name="software_chave_natural_unica",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ativos", "0003_software_chave_natural"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="computer",
+            name="last_seen",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="computer",
+            name="softwares_digest",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
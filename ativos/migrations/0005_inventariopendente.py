@@ -0,0 +1,44 @@
+# Generated by Django 5.1.3 on 2026-10-18 18:44
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ativos", "0004_computer_softwares_digest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InventarioPendente",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hostname", models.CharField(max_length=255)),
+                ("conteudo", models.BinaryField()),
+                ("recebido_em", models.DateTimeField(auto_now_add=True)),
+                (
+                    "processar_apos",
+                    models.DateTimeField(default=django.utils.timezone.now, null=True),
+                ),
+                ("tentativas", models.PositiveSmallIntegerField(default=0)),
+                ("erro", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["hostname", "id"], name="ativos_inve_hostnam_46e387_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+CHAVE_NATURAL = ("name", "version", "arch", "publisher", "guid")
+
+
+def separar_instalacoes(apps, schema_editor):
+    """
+    A data de instalação sai do software e vai para a instalação: softwares
+    que só diferiam na data passam a ser um só (o de menor id) e cada
+    computador fica com a data que tinha do seu.
+    """
+    Software = apps.get_model("ativos", "Software")
+    Instalacao = apps.get_model("ativos", "Instalacao")
+    ComputerSoftwares = apps.get_model("ativos", "Computer").softwares.through
+
+    primeiros = {}
+    mantidos = {}
+    datas = {}
+    for software in Software.objects.order_by("id").values(
+        "id", "install_date", *CHAVE_NATURAL
+    ):
+        chave = tuple(software[campo] for campo in CHAVE_NATURAL)
+        mantidos[software["id"]] = primeiros.setdefault(chave, software["id"])
+        datas[software["id"]] = software["install_date"]
+
+    instalacoes = {}
+    for computer_id, software_id in ComputerSoftwares.objects.order_by(
+        "software_id"
+    ).values_list("computer_id", "software_id"):
+        instalacoes.setdefault((computer_id, mantidos[software_id]), datas[software_id])
+
+    Instalacao.objects.bulk_create(
+        [
+            Instalacao(
+                computer_id=computer_id,
+                software_id=software_id,
+                install_date=install_date,
+            )
+            for (computer_id, software_id), install_date in instalacoes.items()
+        ],
+        batch_size=1000,
+    )
+
+    repetidos = [id for id, mantido in mantidos.items() if id != mantido]
+    for inicio in range(0, len(repetidos), 1000):
+        Software.objects.filter(id__in=repetidos[inicio : inicio + 1000]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ativos", "0006_instalacao"),
+    ]
+
+    operations = [
+        # só dados, como a 0002: as operações de schema sobre ativos_software
+        # ficam na 0008, em outra transação
+        migrations.RunPython(separar_instalacoes, migrations.RunPython.noop),
+    ]
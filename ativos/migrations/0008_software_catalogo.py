@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ativos", "0007_separar_instalacoes"),
+    ]
+
+    operations = [
+        # o Django não converte um ManyToManyField para `through`: a tabela
+        # antiga sai e a relação volta usando Instalacao
+        migrations.RemoveField(
+            model_name="computer",
+            name="softwares",
+        ),
+        migrations.AddField(
+            model_name="computer",
+            name="softwares",
+            field=models.ManyToManyField(
+                through="ativos.Instalacao", to="ativos.software"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="instalacao",
+            constraint=models.UniqueConstraint(
+                fields=("computer", "software"), name="instalacao_unica"
+            ),
+        ),
+        migrations.RemoveConstraint(
+            model_name="software",
+            name="software_chave_natural_unica",
+        ),
+        migrations.RemoveField(
+            model_name="software",
+            name="install_date",
+        ),
+        migrations.AddConstraint(
+            model_name="software",
+            constraint=models.UniqueConstraint(
+                fields=("name", "version", "arch", "publisher", "guid"),
+                name="software_chave_natural_unica",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.3 on 2026-10-18 18:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ativos", "0008_software_catalogo"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AlteracaoSoftware",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "instalado",
+                    models.BooleanField(help_text="False quando foi removido"),
+                ),
+                ("registrado_em", models.DateTimeField()),
+                (
+                    "computer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="ativos.computer",
+                    ),
+                ),
+                (
+                    "software",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="ativos.software",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["computer", "registrado_em"],
+                        name="ativos_alte_compute_352bda_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,6 +1,5 @@
-import datetime
-
 from django.db import models
+from django.utils import timezone
 
 
 # Create your models here.
@@ -12,7 +11,15 @@ class Software(models.Model):
     name = models.CharField(max_length=255, null=True, blank=True)
     publisher = models.CharField(max_length=255, null=True, blank=True)
     version = models.CharField(max_length=50, null=True)
-    install_date = models.DateField(default=datetime.date.today, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # chave natural usada pelo inventário (ativos.inventario)
+            models.UniqueConstraint(
+                fields=["name", "version", "arch", "publisher", "guid"],
+                name="software_chave_natural_unica",
+            )
+        ]
 
     def __str__(self):
         return f"{self.name}: {self.version}"
@@ -21,7 +28,75 @@ class Software(models.Model):
 class Computer(models.Model):
     hostname = models.CharField(max_length=255, null=True, blank=True)
     device_uid = models.CharField(max_length=255, null=True)
-    softwares = models.ManyToManyField(Software)
+    softwares = models.ManyToManyField(Software, through="Instalacao")
+    # resumo dos softwares do último inventário processado (ativos.inventario)
+    softwares_digest = models.CharField(max_length=64, blank=True, default="")
+    last_seen = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.device_uid if not self.hostname else self.hostname}"
+
+
+class Instalacao(models.Model):
+    """Um software do catálogo instalado em um computador."""
+
+    computer = models.ForeignKey(Computer, on_delete=models.CASCADE)
+    software = models.ForeignKey(Software, on_delete=models.CASCADE)
+    install_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["computer", "software"], name="instalacao_unica"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.software} em {self.computer}"
+
+
+class AlteracaoSoftware(models.Model):
+    """
+    Histórico de softwares de um computador: só o que foi instalado ou
+    removido em cada inventário, não a lista inteira. Somando as alterações
+    de trás para frente a partir das instalações atuais chega-se à lista
+    de qualquer data. Os registros só são incluídos, nunca alterados.
+    """
+
+    computer = models.ForeignKey(Computer, on_delete=models.CASCADE)
+    software = models.ForeignKey(Software, on_delete=models.CASCADE)
+    instalado = models.BooleanField(help_text="False quando foi removido")
+    registrado_em = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["computer", "registrado_em"])]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("O histórico de softwares não pode ser alterado.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        acao = "instalado" if self.instalado else "removido"
+        return f"{self.software} {acao} em {self.computer}"
+
+
+class InventarioPendente(models.Model):
+    """
+    Inventário recebido e ainda não gravado (ativos.fila). O conteúdo fica
+    comprimido; `processar_apos` nulo marca um inventário que esgotou as
+    tentativas e só sai da fila manualmente.
+    """
+
+    hostname = models.CharField(max_length=255)
+    conteudo = models.BinaryField()
+    recebido_em = models.DateTimeField(auto_now_add=True)
+    processar_apos = models.DateTimeField(null=True, default=timezone.now)
+    tentativas = models.PositiveSmallIntegerField(default=0)
+    erro = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [models.Index(fields=["hostname", "id"])]
+
+    def __str__(self):
+        return f"{self.hostname} ({self.recebido_em:%d/%m/%Y %H:%M})"
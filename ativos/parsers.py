@@ -41,37 +41,91 @@ from rest_framework.exceptions import ParseError
 from rest_framework.parsers import BaseParser
 
 
+def _add_child(data: dict, tag: str, value):
+    """
+    Adds `value` under `tag`, turning it into a list on the second
+    occurrence. Converted values are never lists themselves, so a list here
+    always means a repeated tag.
+    """
+    if tag not in data:
+        data[tag] = value
+    elif isinstance(data[tag], list):
+        data[tag].append(value)
+    else:
+        data[tag] = [data[tag], value]
+
+
 def xml_convert(element: Element):
     """
     convert the xml `element` into the corresponding python object
     """
-
-    children = list(element)
-    if len(children) == 0:
+    if len(element) == 0:
         return element.text
 
-    sub_tags = []
+    data = {}
+    for child in element:
+        _add_child(data, child.tag, xml_convert(child))
 
-    for child in children:
-        if child.tag not in sub_tags:
-            sub_tags.append(child.tag)
+    return data
 
-    final_data = {}
 
-    for tag in sub_tags:
-        elements_with_same_tag = element.findall(tag)
+def iter_convert(source, parser) -> dict:
+    """
+    Same result as `xml_convert` on the root of `source`, built while
+    parsing: every element is converted when it closes and then dropped from
+    the tree, so memory holds the converted data and the open elements only.
+    """
+    stack = []
+
+    for event, element in ElementTree.iterparse(
+        source, events=("start", "end"), parser=parser
+    ):
+        if event == "start":
+            stack.append((element, {}))
+            continue
+
+        # the children were already removed: a non-empty dict is what tells
+        # a parent from a leaf here
+        _, children = stack.pop()
+        value = children or element.text
 
-        if len(elements_with_same_tag) > 1:
-            data = []
-            for child in elements_with_same_tag:
-                data.append(xml_convert(child))
+        if not stack:
+            return value
 
-        else:
-            data = xml_convert(elements_with_same_tag[0])
+        parent, siblings = stack[-1]
+        _add_child(siblings, element.tag, value)
+        # closed children are removed right away, so this is O(1)
+        parent.remove(element)
 
-        final_data[tag] = data
 
-    return final_data
+class ZlibStream:
+    """
+    Read-only file object over a zlib-compressed `stream`: data is
+    decompressed as it is read, never the whole body at once.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+        self._decompressor = zlib.decompressobj()
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(self.chunk_size), b""))
+
+        while not self._decompressor.eof:
+            compressed = self._decompressor.unconsumed_tail
+            if not compressed:
+                compressed = self._stream.read(self.chunk_size)
+                if not compressed:
+                    return self._decompressor.flush()
+
+            data = self._decompressor.decompress(compressed, size)
+            if data:
+                return data
+
+        return b""
 
 
 def type_convert(value):
@@ -100,30 +154,27 @@ def type_convert(value):
     return value
 
 
+def _defused_parser(parser_context) -> ElementTree.DefusedXMLParser:
+    parser_context = parser_context or {}
+    encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+    return ElementTree.DefusedXMLParser(encoding=encoding, forbid_dtd=True)
+
+
 class XMLParser(BaseParser):
     media_type = "application/xml"
 
     def parse(self, stream: WSGIRequest, media_type=None, parser_context=None):
-        parser_context = parser_context or {}
-        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
-        parser = ElementTree.DefusedXMLParser(encoding=encoding)
         try:
-            tree = ElementTree.parse(stream, parser=parser, forbid_dtd=True)
+            return iter_convert(stream, _defused_parser(parser_context))
         except (ElementTree.ParseError, ValueError) as exc:
             raise ParseError("XML parse error - %s" % str(exc))
-        data = xml_convert(tree.getroot())
-        return data
+
 
 class ZlibXMLParser(BaseParser):
     media_type = "application/x-compress-zlib"
 
     def parse(self, stream: WSGIRequest, media_type=None, parser_context=None):
-        parser_context = parser_context or {}
-        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
-        parser = ElementTree.DefusedXMLParser(encoding=encoding)
         try:
-            tree = ElementTree.fromstring(zlib.decompress(stream.read()))
-        except (ElementTree.ParseError, ValueError) as exc:
+            return iter_convert(ZlibStream(stream), _defused_parser(parser_context))
+        except (ElementTree.ParseError, ValueError, zlib.error) as exc:
             raise ParseError("XML parse error - %s" % str(exc))
-        data = xml_convert(tree)
-        return data
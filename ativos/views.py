@@ -1,11 +1,10 @@
-from datetime import datetime
-
 from django.views.generic import ListView
 from rest_framework.decorators import APIView, api_view
 from rest_framework.response import Response
 from rest_framework.views import Request
 
-from ativos.models import Computer, Software
+from ativos.fila import enfileirar_inventario
+from ativos.models import Computer
 from ativos.parsers import ZlibXMLParser, XMLParser
 from ativos.renderers import XMLRenderer
 from ativos.serializer import ComputerSerializer
@@ -45,44 +44,11 @@ class InventoryView(APIView):
         if "PROLOG" in data.get("QUERY"):
             return Response({"PROLOG_FREQ": "24", "RESPONSE": "SEND"})
 
-        if "CONTENT" not in data:
+        if "CONTENT" not in data or not data["CONTENT"].get("HARDWARE", {}).get("NAME"):
             return Response(status=422, data="Invalid XML format.")
 
-        computer, is_new = Computer.objects.get_or_create(
-            hostname=data["CONTENT"]["HARDWARE"]["NAME"]
-        )
-
-        if is_new:
-            computer.device_uid = data["DEVICEID"]
-            computer.save()
-
-        new_software_list = []
-
-        # NOTE: primeiro inventario muito lento. too bad!
-        for software_data in data["CONTENT"]["SOFTWARES"]:
-            try:
-                install_date = datetime.strptime(
-                    software_data.get("INSTALLDATE"), "%d/%m/%Y"
-                )
-            except TypeError:
-                install_date = datetime.today()
-
-            software, is_new = Software.objects.get_or_create(
-                arch=software_data.get("ARCH"),
-                guid=software_data.get("GUID"),
-                name=software_data.get("NAME"),
-                publisher=software_data.get("PUBLISHER"),
-                version=software_data.get("VERSION"),
-                install_date=install_date,
-            )
-
-            new_software_list.append(software)
-
-        if not is_new and list(computer.softwares.all()) != new_software_list:
-            print("something changed!")
-            # TODO: handle software was altered.
-
-        computer.softwares.set(new_software_list)
+        # a gravação fica para o comando processar_inventarios
+        enfileirar_inventario(data)
 
         # TODO: retornar resposta valida para o agent
         return Response(status=200)
@@ -0,0 +1,127 @@
+"""
+Compara o envio de lembretes de devolução um a um (um `buscar_por_id` e uma
+conexão SMTP por empréstimo) com a caixa de saída: `NotificarDevolucaoUsecase`
+enfileira os lembretes e `EntregarNotificacoesUsecase` os entrega em lotes
+(uma conexão por lote), contra um servidor SMTP local. A última linha usa
+`DjangoMailServiceConcorrente`; o `--atraso` simula a latência de um relay
+real, que é o que as conexões paralelas escondem.
+
+    python -m benchmarks.bench_notificacao --lembretes 5000 --conexoes 4
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from benchmarks.utils import banco_de_teste, imprimir_tabela, medir, preparar_django
+from tests.emprestimo.smtp_local import ServidorSMTPLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lembretes", type=int, default=5_000)
+    parser.add_argument("--repeticoes", type=int, default=1)
+    parser.add_argument("--conexoes", type=int, default=4)
+    parser.add_argument(
+        "--atraso",
+        type=float,
+        default=0.005,
+        help="segundos que o servidor leva para aceitar cada mensagem",
+    )
+    args = parser.parse_args()
+
+    preparar_django()
+
+    from django.conf import settings
+    from django.utils import timezone
+
+    from benchmarks.dados import popular
+    from emprestimo.infrastructure.services.mail_django import (
+        DjangoMailService,
+        DjangoMailServiceConcorrente,
+    )
+
+    from emprestimo.models import Emprestimo, Notificacao
+    from emprestimo.repositories.django import (
+        DjangoEmprestimoRepository,
+        DjangoNotificacaoRepository,
+    )
+    from emprestimo.usecases import (
+        EntregarNotificacoesUsecase,
+        NotificarDevolucaoUsecase,
+    )
+    from ensino.repositories.django import DjangoAlunoRepository
+
+    emprestimo_repo = DjangoEmprestimoRepository()
+    aluno_repo = DjangoAlunoRepository()
+    notificacao_repo = DjangoNotificacaoRepository()
+    service = DjangoMailService()
+    # `popular` cria todos os empréstimos com devolução prevista para daqui a 7 dias
+    data_devolucao = date.today() + timedelta(days=7)
+
+    def um_a_um():
+        for e in emprestimo_repo.listar_devolucoes_ate(data_devolucao):
+            destinatario = aluno_repo.buscar_por_id(e.aluno_id).email
+            service.enviar_email(
+                f"Devolução prevista para {e.data_devolucao_prevista}",
+                [destinatario],
+                assunto=f"[SIGEMP] - Lembrete: {e.bem_descricao}",
+            )
+
+    def caixa_de_saida(service):
+        def enviar():
+            # sem limpar, as repetições encontrariam os lembretes já enviados
+            Notificacao.objects.all().delete()
+            Emprestimo.objects.update(ultimo_lembrete_em=None)
+            NotificarDevolucaoUsecase(
+                emprestimo_repo, aluno_repo, notificacao_repo
+            ).execute(date.today())
+            EntregarNotificacoesUsecase(notificacao_repo, service).execute(
+                timezone.now
+            )
+
+        return enviar
+
+    envios = [
+        ("um a um", um_a_um),
+        ("caixa de saída", caixa_de_saida(service)),
+        (
+            f"caixa de saída ({args.conexoes} conexões)",
+            caixa_de_saida(DjangoMailServiceConcorrente(args.conexoes)),
+        ),
+    ]
+
+    with banco_de_teste(), ServidorSMTPLocal(atraso=args.atraso) as servidor:
+        popular(args.lembretes)
+
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST, settings.EMAIL_PORT = servidor.endereco
+        settings.EMAIL_USE_TLS = False
+
+        linhas = []
+        for nome, funcao in envios:
+            tempo, memoria = medir(funcao, args.repeticoes)
+
+            # uma execução isolada para contar conexões e mensagens
+            servidor.zerar()
+            funcao()
+
+            linhas.append(
+                [
+                    nome,
+                    f"{tempo:.2f}",
+                    f"{args.lembretes / tempo:.0f}",
+                    servidor.conexoes,
+                    servidor.mensagens,
+                    f"{memoria / 2**20:.1f}",
+                ]
+            )
+
+    imprimir_tabela(
+        f"{args.lembretes} lembretes de devolução (melhor de {args.repeticoes})",
+        ["envio", "tempo (s)", "e-mails/s", "conexões", "mensagens", "memória (MiB)"],
+        linhas,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compara o caminho de listagem via model + `model_to_dict` (`from_model`) com
+a projeção `values_list` (`projetar`) para empréstimos, bens e alunos.
+
+    python -m benchmarks.bench_projecao --linhas 10000
+"""
+
+import argparse
+
+from benchmarks.utils import banco_de_teste, imprimir_tabela, medir, preparar_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=10_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    preparar_django()
+
+    from benchmarks.dados import popular
+    from core.repositories.django import com_relacionamentos, projetar
+    from emprestimo.infrastructure.mappers import EmprestimoMapper
+    from emprestimo.models import Emprestimo
+    from ensino.infrastructure.mappers import AlunoMapper
+    from ensino.models import Aluno
+    from patrimonio.infrastructure.mappers import BemMapper
+    from patrimonio.models import Bem
+
+    casos = [
+        ("listar_emprestimos", Emprestimo, EmprestimoMapper),
+        ("listar_bens", Bem, BemMapper),
+        ("listar_alunos", Aluno, AlunoMapper),
+    ]
+
+    with banco_de_teste():
+        popular(args.linhas)
+
+        linhas = []
+        for nome, model, mapper in casos:
+            consulta = com_relacionamentos(model.objects, mapper).order_by("id")
+
+            tempo_model, memoria_model = medir(
+                lambda: [mapper.from_model(m) for m in consulta.all()],
+                args.repeticoes,
+            )
+            tempo_proj, memoria_proj = medir(
+                lambda: projetar(consulta.all(), mapper), args.repeticoes
+            )
+
+            linhas.append(
+                [
+                    nome,
+                    f"{tempo_model * 1000:.1f}",
+                    f"{tempo_proj * 1000:.1f}",
+                    f"{tempo_model / tempo_proj:.2f}x",
+                    f"{memoria_model / 2**20:.1f}",
+                    f"{memoria_proj / 2**20:.1f}",
+                ]
+            )
+
+    imprimir_tabela(
+        f"Listagem de {args.linhas} linhas (melhor de {args.repeticoes})",
+        [
+            "listagem",
+            "model (ms)",
+            "projeção (ms)",
+            "ganho",
+            "model (MiB)",
+            "projeção (MiB)",
+        ],
+        linhas,
+    )
+
+
+if __name__ == "__main__":
+    main()
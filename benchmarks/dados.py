@@ -0,0 +1,88 @@
+"""
+Geração de massa de dados para os benchmarks, com `bulk_create`.
+"""
+
+from datetime import date, timedelta
+
+
+def popular(linhas: int) -> None:
+    """
+    Cria `linhas` alunos, `linhas` bens e `linhas` empréstimos, com poucos
+    registros auxiliares compartilhados (como em produção).
+    """
+    from emprestimo.domain.types import EmprestimoEstadoEnum
+    from emprestimo.models import Emprestimo
+    from ensino.models import Aluno, Campus, Curso, FormaSelecao
+    from patrimonio.models import (
+        Bem,
+        EstadoConservacao,
+        GrauFragilidade,
+        MarcaModelo,
+        TipoBem,
+    )
+
+    campus = Campus.objects.create(sigla="PGO", nome="Paranaguá")
+    cursos = Curso.objects.bulk_create(
+        Curso(sigla=f"C{i}", nome=f"Curso {i}", campus=campus) for i in range(5)
+    )
+    forma_selecao = FormaSelecao.objects.create(
+        descricao="Processo seletivo 2025",
+        periodo_inicio=date(2025, 1, 1),
+        periodo_fim=date(2025, 12, 31),
+    )
+
+    tipos = TipoBem.objects.bulk_create(
+        TipoBem(descricao=f"Tipo {i}") for i in range(5)
+    )
+    estados = EstadoConservacao.objects.bulk_create(
+        EstadoConservacao(descricao=f"Estado {i}", nivel=i) for i in range(5)
+    )
+    grau = GrauFragilidade.objects.create(descricao="Baixo", nivel=1)
+    marca = MarcaModelo.objects.create(marca="Dell", modelo="Latitude 5420")
+
+    alunos = Aluno.objects.bulk_create(
+        (
+            Aluno(
+                nome=f"Aluno {i}",
+                cpf=f"{i:011}",
+                email=f"aluno{i}@ifpr.edu.br",
+                matricula=f"2025{i:06}",
+                telefone="41999990000",
+                forma_selecao=forma_selecao,
+                curso=cursos[i % len(cursos)],
+            )
+            for i in range(linhas)
+        ),
+        batch_size=1000,
+    )
+    bens = Bem.objects.bulk_create(
+        (
+            Bem(
+                descricao=f"Notebook {i}",
+                patrimonio=f"{i:012}",
+                tipo=tipos[i % len(tipos)],
+                estado_conservacao=estados[i % len(estados)],
+                grau_fragilidade=grau,
+                marca_modelo=marca,
+                # todos recebem um empréstimo ativo logo abaixo
+                disponivel=False,
+            )
+            for i in range(linhas)
+        ),
+        batch_size=1000,
+    )
+
+    hoje = date.today()
+    Emprestimo.objects.bulk_create(
+        (
+            Emprestimo(
+                aluno=aluno,
+                bem=bem,
+                data_emprestimo=hoje - timedelta(days=i % 365),
+                data_devolucao_prevista=hoje + timedelta(days=7),
+                estado=EmprestimoEstadoEnum.ATIVO,
+            )
+            for i, (aluno, bem) in enumerate(zip(alunos, bens))
+        ),
+        batch_size=1000,
+    )
@@ -0,0 +1,71 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+Os benchmarks rodam contra um banco de teste descartável criado a partir de
+`sigemp.test_settings`, nunca contra o banco configurado da aplicação:
+
+    python -m benchmarks.bench_projecao --linhas 10000
+"""
+
+import gc
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable
+
+
+def preparar_django(settings: str = "sigemp.test_settings"):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings)
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def banco_de_teste():
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    nome_original = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(nome_original, verbosity=0)
+        teardown_test_environment()
+
+
+def medir(funcao: Callable, repeticoes: int = 3) -> tuple[float, int]:
+    """
+    Retorna o melhor tempo (segundos) entre `repeticoes` execuções e o pico de
+    memória alocada (bytes) de uma execução medida com tracemalloc.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        _atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(tempos), pico
+
+
+def imprimir_tabela(titulo: str, cabecalho: list[str], linhas: list[list]):
+    larguras = [max(len(str(c)) for c in coluna) for coluna in zip(cabecalho, *linhas)]
+
+    print(f"\n{titulo}")
+    print("  ".join(str(c).ljust(w) for c, w in zip(cabecalho, larguras)))
+    print("  ".join("-" * w for w in larguras))
+    for linha in linhas:
+        print("  ".join(str(c).ljust(w) for c, w in zip(linha, larguras)))
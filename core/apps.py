@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # conecta os signals que invalidam as estatísticas do painel
+        import core.infrastructure.dashboard  # noqa: F401
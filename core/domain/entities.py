@@ -1,24 +1,41 @@
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields
 from datetime import date
-from typing import Any
+from functools import cache
+from typing import Any, ClassVar
 
 
-@dataclass
+@cache
+def _campos_serializados(cls: type, exclude: frozenset[str]) -> tuple[str, ...]:
+    """
+    Campos que entram no dicionário da entidade, calculados uma única vez por
+    classe e conjunto de exclusões.
+    """
+    excluidos = set(cls.campos_derivados)
+    for nome in exclude:
+        excluidos.update(cls.grupos_exclude.get(nome, (nome,)))
+
+    return tuple(f.name for f in fields(cls) if f.name not in excluidos)
+
+
+@dataclass(slots=True)
 class BaseEntity:
-    def to_dict(self, exclude=None):
-        entity_dict = asdict(self)
+    # Campos somente leitura (descrições vindas de relacionamentos) que nunca
+    # são serializados.
+    campos_derivados: ClassVar[tuple[str, ...]] = ()
+    # Exclusões usadas quando `to_dict` é chamado sem `exclude`.
+    exclude_padrao: ClassVar[tuple[str, ...]] = ()
+    # Atalhos aceitos em `exclude` que representam vários campos.
+    grupos_exclude: ClassVar[dict[str, tuple[str, ...]]] = {}
 
-        if exclude:
-            for field in exclude:
-                try:
-                    del entity_dict[field]
-                except KeyError:
-                    pass  # ignore fields that don't exist
+    def to_dict(self, exclude=None):
+        if exclude is None:
+            exclude = self.exclude_padrao
 
-        return entity_dict
+        campos = _campos_serializados(type(self), frozenset(exclude))
+        return {campo: getattr(self, campo) for campo in campos}
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeStampableEntity(BaseEntity):
     criado_em: date = None
     criado_por: Any = None
@@ -26,17 +43,12 @@ class TimeStampableEntity(BaseEntity):
     alterado_por: Any = None
     removido_em: date = None
 
-    def to_dict(self, exclude=None):
-        entity_dict = super().to_dict(exclude)
-        if exclude:
-            if "timestamps" in exclude:
-                try:
-                    del entity_dict["criado_em"]
-                    del entity_dict["criado_por"]
-                    del entity_dict["alterado_em"]
-                    del entity_dict["alterado_por"]
-                    del entity_dict["removido_em"]
-                except KeyError:
-                    pass  # in case one of the fields were excluded individually
-
-        return entity_dict
+    grupos_exclude: ClassVar[dict[str, tuple[str, ...]]] = {
+        "timestamps": (
+            "criado_em",
+            "criado_por",
+            "alterado_em",
+            "alterado_por",
+            "removido_em",
+        )
+    }
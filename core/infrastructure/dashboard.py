@@ -0,0 +1,113 @@
+"""
+Contadores do painel inicial (`home_view`).
+
+Os contadores são calculados em uma única consulta, um `SELECT` com uma
+subconsulta `COUNT` por contador, e guardados em cache. Qualquer escrita em
+Emprestimo, Ocorrencia, Aluno ou Bem invalida o cache: via signals, ou pelos
+repositórios nas edições feitas com `update()`. O `TIMEOUT` é só uma rede de
+segurança para escritas que não passam por nenhum dos dois.
+
+A invalidação só alcança o backend de cache configurado: com o
+`LocMemCache` padrão cada worker tem a sua cópia, e os outros workers
+mostram contadores antigos por até `TIMEOUT` (ver `CACHES` nas settings).
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Exists, F, Func, OuterRef, Q, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from emprestimo.domain.types import EmprestimoEstadoEnum
+from emprestimo.models import Emprestimo, Ocorrencia
+from ensino.models import Aluno
+from patrimonio.models import Bem
+
+CHAVE_CACHE = "core:painel:estatisticas"
+TIMEOUT = 5 * 60
+
+
+@dataclass(frozen=True)
+class EstatisticasPainel:
+    data: date
+    emprestimos_ativos: int
+    emprestimos_vencendo: int
+    alunos: int
+    novos_alunos: int
+    bens_disponiveis: int
+    bens_com_ocorrencias: int
+    ocorrencias: int
+
+
+def _contar(queryset: QuerySet) -> QuerySet:
+    # COUNT como Func e não Count: sem GROUP BY, a consulta devolve uma linha
+    return queryset.order_by().annotate(n=Func(F("id"), function="COUNT")).values("n")
+
+
+def _contagens(**consultas: QuerySet) -> dict[str, int]:
+    """
+    Executa `SELECT (subconsulta) AS nome, ...` em uma ida ao banco.
+
+    `aggregate()` não aceita subconsultas e `annotate()` precisaria de uma
+    tabela com ao menos uma linha, então o SELECT é montado a partir do SQL
+    que o ORM gera para cada contagem.
+    """
+    colunas, parametros = [], []
+    for nome, queryset in consultas.items():
+        sql, params = _contar(queryset).query.sql_with_params()
+        colunas.append(f"({sql}) AS {connection.ops.quote_name(nome)}")
+        parametros.extend(params)
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT " + ", ".join(colunas), parametros)
+        return dict(zip(consultas, cursor.fetchone()))
+
+
+def calcular_estatisticas() -> EstatisticasPainel:
+    hoje = timezone.localdate()
+    ativo = Q(estado=EmprestimoEstadoEnum.ATIVO)
+    com_ocorrencia = Emprestimo.all_objects.filter(
+        ativo, bem_id=OuterRef("pk"), ocorrencia__isnull=False
+    )
+
+    contagens = _contagens(
+        emprestimos_ativos=Emprestimo.objects.filter(ativo),
+        emprestimos_vencendo=Emprestimo.objects.filter(data_devolucao_prevista=hoje),
+        alunos=Aluno.objects.all(),
+        novos_alunos=Aluno.objects.filter(
+            criado_em__gt=timezone.now() - timedelta(days=30)
+        ),
+        bens_disponiveis=Bem.objects.filter(disponivel=True),
+        bens_com_ocorrencias=Bem.objects.filter(Exists(com_ocorrencia)),
+        ocorrencias=Ocorrencia.objects.filter(cancelado_em__isnull=True),
+    )
+
+    return EstatisticasPainel(data=hoje, **contagens)
+
+
+def obter_estatisticas() -> EstatisticasPainel:
+    estatisticas = cache.get(CHAVE_CACHE)
+
+    # "vencendo hoje" depende da data, então um snapshot de ontem não serve.
+    if estatisticas is None or estatisticas.data != timezone.localdate():
+        estatisticas = calcular_estatisticas()
+        cache.set(CHAVE_CACHE, estatisticas, TIMEOUT)
+
+    return estatisticas
+
+
+def invalidar_estatisticas() -> None:
+    # só limpa o backend configurado em CACHES; com LocMemCache, só este worker
+    cache.delete(CHAVE_CACHE)
+
+
+@receiver([post_save, post_delete], sender=Emprestimo)
+@receiver([post_save, post_delete], sender=Ocorrencia)
+@receiver([post_save, post_delete], sender=Aluno)
+@receiver([post_save, post_delete], sender=Bem)
+def _registro_alterado(sender, **kwargs):
+    invalidar_estatisticas()
@@ -0,0 +1,89 @@
+"""
+Busca textual indexada e insensível a acentos.
+
+Cada app registra seus documentos em `IndiceBusca` (ver
+`ensino.infrastructure.search` e `patrimonio.infrastructure.search`) e os
+filtersets usam `buscar` como subconsulta:
+
+    queryset.filter(aluno_id__in=buscar(TIPO_ALUNO, valor))
+
+O texto é normalizado em Python (minúsculo, sem acentos) tanto na indexação
+quanto na consulta, então "joao" encontra "João" em qualquer banco. A busca é
+por substring, como o `icontains` que substitui:
+
+- PostgreSQL: `LIKE '%termo%'` atendido pelo índice GIN `gin_trgm_ops`;
+- SQLite: `MATCH` na tabela FTS5 `core_indicebusca_fts` (tokenizador
+  trigram). Termos com menos de 3 caracteres não formam trigramas e caem no
+  `LIKE`.
+"""
+
+import unicodedata
+from typing import Iterable, Optional, Sequence
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+
+from core.models import IndiceBusca
+
+TABELA_FTS = "core_indicebusca_fts"
+TAMANHO_MINIMO_TRIGRAMA = 3
+
+
+def normalizar(texto: Optional[str]) -> str:
+    decomposto = unicodedata.normalize("NFKD", texto or "")
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def montar_texto(*partes: Optional[str]) -> str:
+    return normalizar(" ".join(p for p in partes if p))
+
+
+def indexar(tipo: str, objeto_id: int, *partes: Optional[str]) -> None:
+    IndiceBusca.objects.update_or_create(
+        tipo=tipo, objeto_id=objeto_id, defaults={"texto": montar_texto(*partes)}
+    )
+
+
+def indexar_em_lote(
+    tipo: str, documentos: Iterable[tuple[int, Sequence[Optional[str]]]]
+) -> None:
+    """
+    Recria todos os documentos de `tipo` a partir de pares
+    `(objeto_id, partes do texto)`.
+    """
+    IndiceBusca.objects.filter(tipo=tipo).delete()
+    IndiceBusca.objects.bulk_create(
+        (
+            IndiceBusca(tipo=tipo, objeto_id=objeto_id, texto=montar_texto(*partes))
+            for objeto_id, partes in documentos
+        ),
+        batch_size=1000,
+    )
+
+
+def desindexar(tipo: str, objeto_id: int) -> None:
+    IndiceBusca.objects.filter(tipo=tipo, objeto_id=objeto_id).delete()
+
+
+def buscar(tipo: str, termo: str) -> QuerySet:
+    """
+    Retorna a subconsulta com os ids dos objetos de `tipo` cujo texto contém
+    `termo`.
+    """
+    termo = normalizar(termo)
+    documentos = IndiceBusca.objects.filter(tipo=tipo)
+
+    if connection.vendor == "sqlite" and len(termo) >= TAMANHO_MINIMO_TRIGRAMA:
+        frase = '"' + termo.replace('"', '""') + '"'
+        documentos = documentos.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s",
+                [frase],
+            )
+        )
+    else:
+        documentos = documentos.filter(texto__contains=termo)
+
+    return documentos.values("objeto_id")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ensino.infrastructure.search import reindexar_alunos
+from patrimonio.infrastructure.search import reindexar_bens
+
+
+class Command(BaseCommand):
+    help = "Reconstrói o índice de busca textual de alunos e bens"
+
+    def handle(self, *args, **options):
+        reindexar_alunos()
+        reindexar_bens()
+
+        self.stdout.write(self.style.SUCCESS("Índice de busca reconstruído."))
@@ -12,6 +12,7 @@ from emprestimo.domain.entities import (
 )
 from emprestimo.domain.types import EmprestimoEstadoEnum
 from emprestimo.models import Emprestimo, Ocorrencia, TipoOcorrencia
+from emprestimo.repositories.django import atualizar_disponibilidade
 from ensino.domain.entities import (
     AlunoEntity,
     CampusEntity,
@@ -336,14 +337,17 @@ class Command(BaseCommand):
                     Bem.objects.get_or_create(**e.to_dict())[0]
 
                 entities = []
+                alunos_usados, bens_usados = set(), set()
                 for i in range(N):
-                    alunos_disponiveis = Aluno.objects.exclude(
-                        emprestimo__estado=1
-                    ).distinct()
+                    alunos_disponiveis = (
+                        Aluno.objects.exclude(emprestimo__estado=1)
+                        .exclude(id__in=alunos_usados)
+                        .distinct()
+                    )
 
-                    bens_disponiveis = Bem.objects.exclude(
-                        emprestimo__estado=1
-                    ).distinct()
+                    bens_disponiveis = Bem.objects.filter(disponivel=True).exclude(
+                        id__in=bens_usados
+                    )
 
                     if not alunos_disponiveis.exists() or not bens_disponiveis.exists():
                         print(
@@ -353,6 +357,8 @@ class Command(BaseCommand):
 
                     aluno = random.choice(alunos_disponiveis)
                     bem = random.choice(bens_disponiveis)
+                    alunos_usados.add(aluno.id)
+                    bens_usados.add(bem.id)
                     estado = random.choice(EmprestimoEstadoEnum.choices())[0]
                     entity = EmprestimoEntity(
                         aluno_id=aluno.id,
@@ -375,6 +381,7 @@ class Command(BaseCommand):
                 _models = [
                     Emprestimo.objects.get_or_create(**e.to_dict())[0] for e in entities
                 ]
+                atualizar_disponibilidade(*(m.bem_id for m in _models))
 
                 self.seed_ocorrencias(N)
         except Exception as e:
@@ -0,0 +1,84 @@
+# Generated by Django 6.1.2 on 2026-10-18 16:58
+
+from django.db import migrations, models
+
+
+def criar_indice_textual(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX core_indicebusca_texto_trgm "
+            "ON core_indicebusca USING gin (texto gin_trgm_ops)"
+        )
+    elif schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE core_indicebusca_fts USING fts5("
+            "texto, content='core_indicebusca', content_rowid='id', "
+            "tokenize='trigram')"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER core_indicebusca_ai AFTER INSERT ON core_indicebusca "
+            "BEGIN "
+            "INSERT INTO core_indicebusca_fts(rowid, texto) VALUES (new.id, new.texto); "
+            "END"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER core_indicebusca_ad AFTER DELETE ON core_indicebusca "
+            "BEGIN "
+            "INSERT INTO core_indicebusca_fts(core_indicebusca_fts, rowid, texto) "
+            "VALUES ('delete', old.id, old.texto); "
+            "END"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER core_indicebusca_au AFTER UPDATE ON core_indicebusca "
+            "BEGIN "
+            "INSERT INTO core_indicebusca_fts(core_indicebusca_fts, rowid, texto) "
+            "VALUES ('delete', old.id, old.texto); "
+            "INSERT INTO core_indicebusca_fts(rowid, texto) VALUES (new.id, new.texto); "
+            "END"
+        )
+
+
+def remover_indice_textual(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS core_indicebusca_texto_trgm")
+    elif schema_editor.connection.vendor == "sqlite":
+        for trigger in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS core_indicebusca_{trigger}")
+        schema_editor.execute("DROP TABLE IF EXISTS core_indicebusca_fts")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="IndiceBusca",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tipo", models.CharField(max_length=32)),
+                ("objeto_id", models.PositiveBigIntegerField()),
+                ("texto", models.TextField()),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("tipo", "objeto_id"),
+                        name="indicebusca_tipo_objeto_unico",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(criar_indice_textual, remover_indice_textual),
+    ]
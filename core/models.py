@@ -4,6 +4,10 @@ from django.utils import timezone
 
 from core.managers import DeletedManager, SoftDeleteManager
 
+# Condição dos índices parciais: o SoftDeleteManager sempre filtra por ela, então
+# as consultas feitas via `objects` podem usar esses índices.
+NAO_REMOVIDO = models.Q(removido_em__isnull=True)
+
 
 # Create your models here.
 class Timestampable(models.Model):
@@ -51,3 +55,23 @@ class Timestampable(models.Model):
 
     class Meta:
         abstract = True
+
+
+class IndiceBusca(models.Model):
+    """
+    Documento de busca textual: uma linha por objeto indexado, com o texto já
+    normalizado (minúsculo e sem acentos). No SQLite é espelhado em uma tabela
+    FTS5 com tokenizador trigram; no PostgreSQL recebe um índice GIN pg_trgm.
+    Ver `core.infrastructure.search`.
+    """
+
+    tipo = models.CharField(max_length=32)
+    objeto_id = models.PositiveBigIntegerField()
+    texto = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tipo", "objeto_id"], name="indicebusca_tipo_objeto_unico"
+            )
+        ]
@@ -0,0 +1,105 @@
+from django.contrib import messages
+from django.core.paginator import InvalidPage
+from django.http import Http404
+
+from core.types import Pagina, PaginaCursor
+
+
+class _PaginaComoLista:
+    """
+    Expõe uma `Pagina` já buscada com a interface que o `Paginator` espera,
+    sem que ele precise da lista completa.
+    """
+
+    def __init__(self, pagina: Pagina) -> None:
+        self.pagina = pagina
+
+    def count(self) -> int:
+        return self.pagina.total
+
+    def __len__(self) -> int:
+        return self.pagina.total
+
+    def __getitem__(self, fatia: slice):
+        inicio = fatia.start - self.pagina.offset
+        return list(self.pagina.itens[inicio : inicio + fatia.stop - fatia.start])
+
+
+class PaginacaoRepositorioMixin:
+    """
+    Pagina a listagem no repositório: somente a página visível é buscada e
+    mapeada.
+
+    `get_queryset` deve retornar um callable `(offset=..., limite=...)` que
+    devolve um `Result` com uma `Pagina`, normalmente o `execute` do usecase de
+    listagem com os filtros já aplicados.
+    """
+
+    def get_numero_pagina(self) -> int:
+        pagina = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+
+        try:
+            numero = int(pagina)
+        except ValueError:
+            raise Http404("Página inválida.")
+
+        if numero < 1:
+            raise Http404("Página inválida.")
+
+        return numero
+
+    def paginate_queryset(self, buscar_pagina, page_size):
+        numero = self.get_numero_pagina()
+
+        resultado = buscar_pagina(offset=(numero - 1) * page_size, limite=page_size)
+
+        if resultado:
+            pagina = resultado.value
+        else:
+            messages.error(self.request, resultado.mensagem)
+            pagina = Pagina(itens=[], total=0, offset=0, limite=page_size)
+            numero = 1
+
+        paginator = self.get_paginator(
+            _PaginaComoLista(pagina),
+            page_size,
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+
+        try:
+            page = paginator.page(numero)
+        except InvalidPage as e:
+            raise Http404(f"Página inválida ({numero}): {e}")
+
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class PaginacaoCursorMixin:
+    """
+    Paginação por cursor (keyset) para listagens grandes: a página é
+    identificada pelo parâmetro `cursor` em vez de um número, então páginas
+    profundas custam o mesmo que a primeira.
+
+    `get_queryset` deve retornar um callable `(cursor=..., limite=...)` que
+    devolve um `Result` com uma `PaginaCursor`. No contexto, `page_obj` é a
+    própria `PaginaCursor` e `paginator` é `None`.
+    """
+
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, buscar_pagina, page_size):
+        cursor = self.request.GET.get(self.cursor_kwarg) or None
+
+        resultado = buscar_pagina(cursor=cursor, limite=page_size)
+
+        if resultado:
+            pagina = resultado.value
+        else:
+            messages.error(self.request, resultado.mensagem)
+            pagina = PaginaCursor(itens=[], limite=page_size)
+
+        return (None, pagina, pagina.itens, pagina.tem_anterior or pagina.tem_proxima)
@@ -8,15 +8,14 @@ from django.contrib.auth.decorators import login_not_required
 from django.urls import reverse
 from django.utils import timezone
 
+from core.infrastructure.dashboard import obter_estatisticas
 from core.presentation.forms import LoginForm
 from core.repositories.django import DjUserRepository
 from core.usecases import login_usecase
 
 from emprestimo.domain.types import EmprestimoEstadoEnum
-from emprestimo.models import Emprestimo, Ocorrencia
+from emprestimo.models import Emprestimo
 from emprestimo.policies.django import DjangoEmprestimoPolicy
-from ensino.models import Aluno
-from patrimonio.models import Bem, EstadoConservacao
 
 
 # Create your views here.
@@ -45,55 +44,30 @@ def login_view(request: HttpRequest):
 
 
 def home_view(request: HttpRequest):
-    count_emprestimos_ativos: int = Emprestimo.objects.filter(
-        estado=EmprestimoEstadoEnum.ATIVO
-    ).count()
+    estatisticas = obter_estatisticas()
 
-    count_emprestimos_vencendo: int = Emprestimo.objects.filter(
-        data_devolucao_prevista=timezone.now()
-    ).count()
-
-    emprestimos_recentes = Emprestimo.objects.filter(
-        data_emprestimo__gt=timezone.now() - timedelta(days=14),
-        estado=EmprestimoEstadoEnum.ATIVO,
-    ).order_by("-data_emprestimo")[:3]
-
-    count_alunos = Aluno.objects.all().count()
-
-    count_novos_alunos = Aluno.objects.filter(
-        criado_em__gt=timezone.now() - timedelta(days=30)
-    ).count()
-
-    count_bens_disponiveis = (
-        Bem.objects.exclude(emprestimo__estado=EmprestimoEstadoEnum.ATIVO)
-        .distinct()
-        .count()
-    )
-
-    count_bens_com_ocorrencias = (
-        Bem.objects.filter(
-            emprestimo__ocorrencia__isnull=False,
-            emprestimo__estado=EmprestimoEstadoEnum.ATIVO,
+    emprestimos_recentes = (
+        Emprestimo.objects.filter(
+            data_emprestimo__gt=timezone.now() - timedelta(days=14),
+            estado=EmprestimoEstadoEnum.ATIVO,
         )
-        .distinct()
-        .count()
+        .select_related("aluno", "bem")
+        .order_by("-data_emprestimo")[:3]
     )
 
-    count_ocorrencias = Ocorrencia.objects.filter(cancelado_em__isnull=True).count()
-
     emprestimo_policy = DjangoEmprestimoPolicy(request.user)
 
     pode_criar_emprestimo = emprestimo_policy.pode_criar()
 
     context = {
-        "count_emprestimos_ativos": count_emprestimos_ativos,
-        "count_emprestimos_vencendo": count_emprestimos_vencendo,
+        "count_emprestimos_ativos": estatisticas.emprestimos_ativos,
+        "count_emprestimos_vencendo": estatisticas.emprestimos_vencendo,
         "emprestimos_recentes": emprestimos_recentes,
-        "count_alunos": count_alunos,
-        "count_novos_alunos": count_novos_alunos,
-        "count_bens_disponiveis": count_bens_disponiveis,
-        "count_bens_com_ocorrencias": count_bens_com_ocorrencias,
-        "count_ocorrencias": count_ocorrencias,
+        "count_alunos": estatisticas.alunos,
+        "count_novos_alunos": estatisticas.novos_alunos,
+        "count_bens_disponiveis": estatisticas.bens_disponiveis,
+        "count_bens_com_ocorrencias": estatisticas.bens_com_ocorrencias,
+        "count_ocorrencias": estatisticas.ocorrencias,
         "pode_criar_emprestimo": pode_criar_emprestimo,
     }
 
@@ -2,9 +2,41 @@ from typing import override
 
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.db.models import Manager, QuerySet
 from core.repositories.contracts import UserRepository
 
 
+def com_relacionamentos(consulta: Manager | QuerySet, mapper: type) -> QuerySet:
+    """
+    Aplica `select_related` com os relacionamentos declarados em
+    `mapper.relacionamentos`, para que o `from_model` não dispare uma consulta
+    por linha.
+    """
+    relacionamentos = getattr(mapper, "relacionamentos", ())
+
+    # select_related() sem argumentos seguiria todas as chaves estrangeiras.
+    if not relacionamentos:
+        return consulta.all()
+
+    return consulta.select_related(*relacionamentos)
+
+
+def projetar(consulta: QuerySet, mapper: type) -> list:
+    """
+    Caminho rápido para listagens somente leitura: busca apenas as colunas de
+    `mapper.projecao` (campo da entidade -> lookup) com `values_list` e monta as
+    entidades direto das tuplas, sem instanciar models nem passar por
+    `model_to_dict`.
+    """
+    campos = tuple(mapper.projecao)
+    montar = getattr(mapper, "from_values", mapper.from_dict)
+
+    return [
+        montar(dict(zip(campos, linha)))
+        for linha in consulta.values_list(*mapper.projecao.values())
+    ]
+
+
 class DjUserRepository(UserRepository):
     @override
     def authenticate(self, username: str, password: str) -> User:
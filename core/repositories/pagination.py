@@ -0,0 +1,122 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from typing import Callable, Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q, QuerySet
+
+from core.types import Pagina, PaginaCursor
+
+PROXIMA = "p"
+ANTERIOR = "a"
+
+
+def paginar[T](
+    queryset: QuerySet,
+    offset: int,
+    limite: int,
+    mapear: Callable[[Model], T],
+) -> Pagina[T]:
+    """
+    Busca e mapeia apenas a fatia `offset:offset + limite` do queryset.
+    O total é obtido com um COUNT separado.
+    """
+    total = queryset.count()
+
+    itens = []
+    if offset < total:
+        itens = [mapear(model) for model in queryset[offset : offset + limite]]
+
+    return Pagina(itens=itens, total=total, offset=offset, limite=limite)
+
+
+def _codificar_cursor(direcao: str, model: Model, ordenacao: Sequence[str]) -> str:
+    valores = [getattr(model, campo.lstrip("-")) for campo in ordenacao]
+    dados = json.dumps([direcao, valores], cls=DjangoJSONEncoder)
+    return urlsafe_b64encode(dados.encode()).decode()
+
+
+def _decodificar_cursor(
+    cursor: str, queryset: QuerySet, ordenacao: Sequence[str]
+) -> tuple[str, list]:
+    try:
+        direcao, valores = json.loads(urlsafe_b64decode(cursor.encode()))
+        if direcao not in (PROXIMA, ANTERIOR) or len(valores) != len(ordenacao):
+            raise ValueError
+
+        campos = [
+            queryset.model._meta.get_field(campo.lstrip("-")) for campo in ordenacao
+        ]
+        return direcao, [c.to_python(v) for c, v in zip(campos, valores)]
+    except (Base64Error, ValidationError, ValueError, TypeError) as e:
+        raise ValueError(f"Cursor de paginação inválido: '{cursor}'") from e
+
+
+def _filtro_apos(ordenacao: Sequence[str], valores: list, para_frente: bool) -> Q:
+    """
+    Monta `(a, b, id) > (va, vb, vid)` respeitando a direção de cada campo:
+    a < va OR (a = va AND b > vb) OR (a = va AND b = vb AND id < vid) ...
+    """
+    filtro = Q()
+    anteriores = {}
+
+    for campo, valor in zip(ordenacao, valores):
+        nome = campo.lstrip("-")
+        decrescente = campo.startswith("-")
+        lookup = "lt" if decrescente == para_frente else "gt"
+
+        filtro |= Q(**anteriores, **{f"{nome}__{lookup}": valor})
+        anteriores[nome] = valor
+
+    return filtro
+
+
+def _inverter(ordenacao: Sequence[str]) -> list[str]:
+    return [c[1:] if c.startswith("-") else f"-{c}" for c in ordenacao]
+
+
+def paginar_por_cursor[T](
+    queryset: QuerySet,
+    ordenacao: Sequence[str],
+    cursor: Optional[str],
+    limite: int,
+    mapear: Callable[[Model], T],
+) -> PaginaCursor[T]:
+    """
+    Paginação por chave (keyset): em vez de OFFSET, filtra as linhas
+    posteriores à última linha da página anterior, então qualquer página custa
+    o mesmo que a primeira.
+
+    `ordenacao` deve terminar em uma chave única (normalmente `id`) e usar
+    apenas campos não nulos. O cursor é opaco e carrega os valores dessa chave.
+    """
+    para_frente = True
+    if cursor:
+        direcao, valores = _decodificar_cursor(cursor, queryset, ordenacao)
+        para_frente = direcao == PROXIMA
+        queryset = queryset.filter(_filtro_apos(ordenacao, valores, para_frente))
+
+    ordem = ordenacao if para_frente else _inverter(ordenacao)
+    modelos = list(queryset.order_by(*ordem)[: limite + 1])
+
+    tem_mais = len(modelos) > limite
+    modelos = modelos[:limite]
+
+    if para_frente:
+        tem_proxima, tem_anterior = tem_mais, bool(cursor and modelos)
+    else:
+        modelos.reverse()
+        tem_proxima, tem_anterior = bool(modelos), tem_mais
+
+    return PaginaCursor(
+        itens=[mapear(m) for m in modelos],
+        limite=limite,
+        proximo_cursor=(
+            _codificar_cursor(PROXIMA, modelos[-1], ordenacao) if tem_proxima else None
+        ),
+        anterior_cursor=(
+            _codificar_cursor(ANTERIOR, modelos[0], ordenacao) if tem_anterior else None
+        ),
+    )
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
 
 
 class Result(ABC):
@@ -26,3 +27,31 @@ class ResultError(Result):
 
     def __bool__(self):
         return False
+
+
+@dataclass(frozen=True)
+class Pagina[T]:
+    itens: Sequence[T]
+    total: int
+    offset: int
+    limite: int
+
+    @property
+    def tem_proxima(self) -> bool:
+        return self.offset + len(self.itens) < self.total
+
+
+@dataclass(frozen=True)
+class PaginaCursor[T]:
+    itens: Sequence[T]
+    limite: int
+    proximo_cursor: Optional[str] = None
+    anterior_cursor: Optional[str] = None
+
+    @property
+    def tem_proxima(self) -> bool:
+        return self.proximo_cursor is not None
+
+    @property
+    def tem_anterior(self) -> bool:
+        return self.anterior_cursor is not None
@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Optional, Sequence
 
 
+@dataclass(frozen=True, slots=True)
+class Email:
+    mensagem: str
+    destinatarios: Sequence[str]
+    assunto: str = "SIGEMP - Aviso"
+    mensagem_html: Optional[str] = None
+
+
 class MailService(ABC):
     @abstractmethod
     def enviar_email(
@@ -12,3 +21,11 @@ class MailService(ABC):
         mensagem_html: Optional[str] = None,
     ) -> Sequence[str]:
         pass
+
+    @abstractmethod
+    def enviar_emails(self, emails: Sequence[Email]) -> list[int]:
+        """
+        Envia todos os e-mails por uma única conexão. Retorna, para cada
+        e-mail, quantos foram enviados (0 ou 1), na mesma ordem de `emails`.
+        """
+        pass
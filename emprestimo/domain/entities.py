@@ -1,18 +1,22 @@
 from dataclasses import dataclass
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import ClassVar, Optional
 
-from core.domain.entities import TimeStampableEntity
-from emprestimo.domain.types import EmprestimoEstadoEnum
+from core.domain.entities import BaseEntity, TimeStampableEntity
+from emprestimo.domain.types import (
+    EmprestimoEstadoEnum,
+    NotificacaoEstadoEnum,
+    NotificacaoTipoEnum,
+)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class TipoOcorrenciaEntity(TimeStampableEntity):
     descricao: str
     id: int = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class EmprestimoEntity(TimeStampableEntity):
     data_emprestimo: date
     data_devolucao_prevista: date
@@ -27,21 +31,21 @@ class EmprestimoEntity(TimeStampableEntity):
     estado: EmprestimoEstadoEnum
     id: Optional[int] = None
     observacoes: str = ""
+    # data de início da última etapa de lembrete enviada; só o repositório
+    # de lembretes grava
+    ultimo_lembrete_em: Optional[date] = None
 
-    def to_dict(
-        self,
-        exclude=[
-            "bem_patrimonio",
-            "bem_descricao",
-            "aluno_nome",
-            "aluno_matricula",
-            "timestamps",
-        ],
-    ):
-        return super().to_dict(exclude)
+    campos_derivados: ClassVar[tuple[str, ...]] = ("ultimo_lembrete_em",)
+    exclude_padrao: ClassVar[tuple[str, ...]] = (
+        "bem_patrimonio",
+        "bem_descricao",
+        "aluno_nome",
+        "aluno_matricula",
+        "timestamps",
+    )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class OcorrenciaEntity(TimeStampableEntity):
     data_ocorrencia: date
     emprestimo_id: int
@@ -56,3 +60,22 @@ class OcorrenciaEntity(TimeStampableEntity):
     aluno_nome: Optional[str] = None
     aluno_matricula: Optional[str] = None
     descricao: Optional[str] = None
+
+
+@dataclass(kw_only=True, slots=True)
+class NotificacaoEntity(BaseEntity):
+    tipo: NotificacaoTipoEnum
+    data_referencia: date
+    destinatario: str
+    assunto: str
+    mensagem: str
+    mensagem_html: Optional[str] = None
+    # resumos por aluno não têm empréstimo
+    emprestimo_id: Optional[int] = None
+    aluno_id: Optional[int] = None
+    estado: NotificacaoEstadoEnum = NotificacaoEstadoEnum.PENDENTE
+    tentativas: int = 0
+    proxima_tentativa_em: Optional[datetime] = None
+    ultimo_erro: Optional[str] = None
+    enviada_em: Optional[datetime] = None
+    id: Optional[int] = None
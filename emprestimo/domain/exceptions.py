@@ -0,0 +1,18 @@
+class EmprestimoConflitanteError(Exception):
+    """O empréstimo violaria a regra de um empréstimo ativo por bem/aluno."""
+
+    def __init__(self, mensagem: str, emprestimo_id: int) -> None:
+        super().__init__(mensagem)
+        self.emprestimo_id = emprestimo_id
+
+
+class BemComEmprestimoAtivoError(EmprestimoConflitanteError):
+    def __init__(self, emprestimo_id: int) -> None:
+        super().__init__(f"Bem possui empréstimo ativo: {emprestimo_id}", emprestimo_id)
+
+
+class AlunoComEmprestimoAtivoError(EmprestimoConflitanteError):
+    def __init__(self, emprestimo_id: int) -> None:
+        super().__init__(
+            f"Aluno possui empréstimo ativo: {emprestimo_id}", emprestimo_id
+        )
@@ -1,6 +1,7 @@
-from datetime import date
-from enum import IntEnum
-from typing import TypedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from enum import IntEnum, StrEnum
+from typing import Optional, TypedDict
 
 
 class EmprestimoEstadoEnum(IntEnum):
@@ -25,10 +26,76 @@ class EmprestimoEstadoEnum(IntEnum):
         return self.label
 
 
+class NotificacaoEstadoEnum(IntEnum):
+    PENDENTE = 1
+    ENVIADA = 2
+    DESCARTADA = 3
+
+    @property
+    def label(self):
+        labels = {
+            NotificacaoEstadoEnum.PENDENTE: "Pendente",
+            NotificacaoEstadoEnum.ENVIADA: "Enviada",
+            NotificacaoEstadoEnum.DESCARTADA: "Descartada",
+        }
+        return labels[self]
+
+    @classmethod
+    def choices(cls):
+        return [(member.value, member.label) for member in cls]
+
+    def __str__(self):
+        return self.label
+
+
+class NotificacaoTipoEnum(StrEnum):
+    LEMBRETE_DEVOLUCAO = "lembrete_devolucao"
+    RESUMO_DEVOLUCAO = "resumo_devolucao"
+
+    @property
+    def label(self):
+        labels = {
+            NotificacaoTipoEnum.LEMBRETE_DEVOLUCAO: "Lembrete de devolução",
+            NotificacaoTipoEnum.RESUMO_DEVOLUCAO: "Resumo de devoluções do aluno",
+        }
+        return labels[self]
+
+    @classmethod
+    def choices(cls):
+        return [(member.value, member.label) for member in cls]
+
+
+class TermoTipoEnum(StrEnum):
+    RESPONSABILIDADE = "responsabilidade"
+    DEVOLUCAO = "devolucao"
+
+    @property
+    def label(self):
+        labels = {
+            TermoTipoEnum.RESPONSABILIDADE: "Termo de responsabilidade",
+            TermoTipoEnum.DEVOLUCAO: "Termo de devolução",
+        }
+        return labels[self]
+
+    @property
+    def estado(self) -> EmprestimoEstadoEnum:
+        """Estado que o empréstimo precisa ter para receber o termo."""
+        if self is TermoTipoEnum.RESPONSABILIDADE:
+            return EmprestimoEstadoEnum.ATIVO
+        return EmprestimoEstadoEnum.FINALIZADO
+
+    @classmethod
+    def choices(cls):
+        return [(member.value, member.label) for member in cls]
+
+
 class EmprestimoFiltro(TypedDict, total=False):
     texto: str
     estado: EmprestimoEstadoEnum
     tem_ocorrencia: str
+    curso: int
+    data_emprestimo_inicio: date
+    data_emprestimo_fim: date
 
 
 class OcorrenciaFiltro(TypedDict, total=False):
@@ -37,3 +104,54 @@ class OcorrenciaFiltro(TypedDict, total=False):
     tipo: int
     data_ocorrencia: date
     eh_cancelado: str
+    aluno_id: int
+    bem_id: int
+    emprestimo_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class CronogramaLembretes:
+    """
+    Etapas de lembrete de devolução: `dias_antes` do prazo (ex.: D-7, D-3,
+    D-1) e, depois do prazo, a cada `atraso_a_cada` dias (None desliga a
+    cobrança de atrasos).
+
+    Cada etapa é identificada pela data em que começa. Um empréstimo está na
+    etapa mais recente já iniciada, então um dia sem execução do cron não
+    perde o lembrete: ele sai no dia seguinte, se a etapa ainda for a vigente.
+    """
+
+    dias_antes: tuple[int, ...] = (7, 3, 1)
+    atraso_a_cada: Optional[int] = 3
+
+    @property
+    def antecedencia_maxima(self) -> int:
+        return max(self.dias_antes, default=0)
+
+    def etapa(self, data_devolucao_prevista: date, hoje: date) -> Optional[date]:
+        restantes = (data_devolucao_prevista - hoje).days
+
+        if restantes >= 0:
+            iniciadas = [d for d in self.dias_antes if d >= restantes]
+            if not iniciadas:
+                return None
+            return data_devolucao_prevista - timedelta(days=min(iniciadas))
+
+        if not self.atraso_a_cada:
+            return None
+
+        ciclos = (-restantes - 1) // self.atraso_a_cada
+        return data_devolucao_prevista + timedelta(days=1 + ciclos * self.atraso_a_cada)
+
+    def etapa_pendente(
+        self,
+        data_devolucao_prevista: date,
+        ultimo_lembrete_em: Optional[date],
+        hoje: date,
+    ) -> Optional[date]:
+        """Etapa vigente, se ela ainda não foi notificada."""
+        etapa = self.etapa(data_devolucao_prevista, hoje)
+        if etapa is None or (ultimo_lembrete_em and ultimo_lembrete_em >= etapa):
+            return None
+
+        return etapa
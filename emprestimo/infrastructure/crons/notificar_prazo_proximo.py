@@ -1,27 +1,70 @@
-from datetime import timedelta
 from django.utils import timezone
-from emprestimo.infrastructure.services.mail_django import DjangoMailService
-from emprestimo.repositories.django import DjangoEmprestimoRepository
-from emprestimo.usecases.emprestimo_usecases import NotificarDevolucaoUsecase
+from emprestimo.domain.types import CronogramaLembretes
+from emprestimo.infrastructure.services.django import DjangoTemplateService
+from emprestimo.infrastructure.services.mail_django import (
+    DjangoMailServiceConcorrente,
+)
+from emprestimo.repositories.django import (
+    DjangoEmprestimoRepository,
+    DjangoNotificacaoRepository,
+)
+from emprestimo.usecases import (
+    EntregarNotificacoesUsecase,
+    NotificarDevolucaoPorAlunoUsecase,
+    NotificarDevolucaoUsecase,
+)
 from ensino.repositories.django import DjangoAlunoRepository
+from sigemp import settings
 
 
 def cron_notificar_prazo_proximo():
     repo = DjangoEmprestimoRepository()
     aluno_repo = DjangoAlunoRepository()
-    service = DjangoMailService()
-
-    usecase = NotificarDevolucaoUsecase(
-        repo,
-        aluno_repo,
-        service,
+    notificacao_repo = DjangoNotificacaoRepository()
+    cronograma = CronogramaLembretes(
+        settings.LEMBRETES_DIAS_ANTES,
+        settings.LEMBRETES_ATRASO_A_CADA,
     )
 
-    resultado = usecase.execute(
-        timezone.now() + timedelta(days=7),
+    if settings.EMAIL_RESUMO_POR_ALUNO:
+        usecase = NotificarDevolucaoPorAlunoUsecase(
+            repo,
+            aluno_repo,
+            notificacao_repo,
+            DjangoTemplateService(),
+            cronograma,
+        )
+    else:
+        usecase = NotificarDevolucaoUsecase(
+            repo,
+            aluno_repo,
+            notificacao_repo,
+            cronograma,
+        )
+
+    resultado = usecase.execute(timezone.localdate())
+
+    if not resultado:
+        print(f"[CRON] Erro ao enfileirar lembretes: {resultado.mensagem}")
+    else:
+        print(f"[CRON] Lembretes de devolução enfileirados: {resultado.value}")
+
+    cron_entregar_notificacoes()
+
+
+def cron_entregar_notificacoes():
+    usecase = EntregarNotificacoesUsecase(
+        DjangoNotificacaoRepository(),
+        DjangoMailServiceConcorrente(
+            settings.EMAIL_CONEXOES,
+            settings.EMAIL_TAXA_MAXIMA,
+            settings.EMAIL_RAJADA,
+        ),
     )
 
+    resultado = usecase.execute(timezone.now)
+
     if not resultado:
-        print(f"[CRON] Erro ao notificar prazos: {resultado.mensagem}")
+        print(f"[CRON] Erro ao entregar notificações: {resultado.mensagem}")
     else:
-        print(f"[CRON] Notificações de devolução enviadas: {resultado.value}")
+        print(f"[CRON] Notificações entregues: {resultado.value}")
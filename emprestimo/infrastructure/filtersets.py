@@ -1,20 +1,30 @@
 from django.db.models import Q, QuerySet
-from django_filters.filters import CharFilter
+from django_filters.filters import (
+    CharFilter,
+    DateFilter,
+    ModelChoiceFilter,
+    NumberFilter,
+)
 from django_filters.filterset import FilterSet
 
+from core.infrastructure.search import buscar
 from emprestimo.models import Emprestimo, Ocorrencia
+from ensino.infrastructure.search import TIPO_ALUNO
+from ensino.models import Curso
+from patrimonio.infrastructure.search import TIPO_BEM
 
 
 class EmprestimoFilterSet(FilterSet):
     texto = CharFilter(method="filtrar_texto")
     tem_ocorrencia = CharFilter(method="filtrar_tem_ocorrencia")
+    curso = ModelChoiceFilter(field_name="aluno__curso", queryset=Curso.objects)
+    data_emprestimo_inicio = DateFilter(field_name="data_emprestimo", lookup_expr="gte")
+    data_emprestimo_fim = DateFilter(field_name="data_emprestimo", lookup_expr="lte")
 
     def filtrar_texto(self, queryset: QuerySet[Emprestimo], _name, value):
         return queryset.filter(
-            Q(aluno__nome__icontains=value)
-            | Q(aluno__matricula__icontains=value)
-            | Q(bem__descricao__icontains=value)
-            | Q(bem__patrimonio__icontains=value)
+            Q(aluno_id__in=buscar(TIPO_ALUNO, value))
+            | Q(bem_id__in=buscar(TIPO_BEM, value))
         )
 
     def filtrar_tem_ocorrencia(self, queryset: QuerySet[Emprestimo], _name, value):
@@ -34,18 +44,15 @@ class OcorrenciaFilterSet(FilterSet):
     aluno = CharFilter(method="filtrar_aluno")
     bem = CharFilter(method="filtrar_bem")
     eh_cancelado = CharFilter(method="filtrar_eh_cancelado")
+    aluno_id = NumberFilter(field_name="emprestimo__aluno_id")
+    bem_id = NumberFilter(field_name="emprestimo__bem_id")
+    emprestimo_id = NumberFilter(field_name="emprestimo_id")
 
     def filtrar_aluno(self, queryset: QuerySet[Emprestimo], _name, value):
-        return queryset.filter(
-            Q(emprestimo__aluno__nome__icontains=value)
-            | Q(emprestimo__aluno__matricula__icontains=value)
-        )
+        return queryset.filter(emprestimo__aluno_id__in=buscar(TIPO_ALUNO, value))
 
     def filtrar_bem(self, queryset: QuerySet[Emprestimo], _name, value):
-        return queryset.filter(
-            Q(emprestimo__bem__descricao__icontains=value)
-            | Q(emprestimo__bem__patrimonio__icontains=value)
-        )
+        return queryset.filter(emprestimo__bem_id__in=buscar(TIPO_BEM, value))
 
     def filtrar_eh_cancelado(self, queryset: QuerySet[Emprestimo], _name, value):
         if value == "s":
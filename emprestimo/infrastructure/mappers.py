@@ -1,11 +1,16 @@
 from django.forms import model_to_dict
 from emprestimo.domain.entities import (
     EmprestimoEntity,
+    NotificacaoEntity,
     OcorrenciaEntity,
     TipoOcorrenciaEntity,
 )
-from emprestimo.domain.types import EmprestimoEstadoEnum
-from emprestimo.models import Emprestimo, Ocorrencia, TipoOcorrencia
+from emprestimo.domain.types import (
+    EmprestimoEstadoEnum,
+    NotificacaoEstadoEnum,
+    NotificacaoTipoEnum,
+)
+from emprestimo.models import Emprestimo, Notificacao, Ocorrencia, TipoOcorrencia
 
 
 class TipoOcorrenciaMapper:
@@ -19,10 +24,36 @@ class TipoOcorrenciaMapper:
 
 
 class EmprestimoMapper:
+    relacionamentos = ("bem", "aluno")
+    projecao = {
+        "id": "id",
+        "criado_por": "criado_por_id",
+        "alterado_por": "alterado_por_id",
+        "removido_em": "removido_em",
+        "data_emprestimo": "data_emprestimo",
+        "data_devolucao_prevista": "data_devolucao_prevista",
+        "data_devolucao": "data_devolucao",
+        "devolucao_ciente_por_id": "devolucao_ciente_por_id",
+        "bem_id": "bem_id",
+        "bem_descricao": "bem__descricao",
+        "bem_patrimonio": "bem__patrimonio",
+        "aluno_id": "aluno_id",
+        "aluno_nome": "aluno__nome",
+        "aluno_matricula": "aluno__matricula",
+        "estado": "estado",
+        "observacoes": "observacoes",
+        "ultimo_lembrete_em": "ultimo_lembrete_em",
+    }
+
     @staticmethod
     def from_dict(data: dict):
         return EmprestimoEntity(**data)
 
+    @staticmethod
+    def from_values(data: dict):
+        data["estado"] = EmprestimoEstadoEnum(data["estado"])
+        return EmprestimoEntity(**data)
+
     @staticmethod
     def from_model(model: Emprestimo):
         model_dict = model_to_dict(model)
@@ -42,6 +73,8 @@ class EmprestimoMapper:
         model_dict["aluno_id"] = model_dict.pop("aluno")
         model_dict["aluno_nome"] = model.aluno.nome
         model_dict["aluno_matricula"] = model.aluno.matricula
+        # não editável, então fora do model_to_dict
+        model_dict["ultimo_lembrete_em"] = model.ultimo_lembrete_em
 
         # NOTE: hacky solution
         estado_value = model_dict.get("estado")
@@ -52,6 +85,8 @@ class EmprestimoMapper:
 
 
 class OcorrenciaMapper:
+    relacionamentos = ("tipo", "emprestimo__bem", "emprestimo__aluno")
+
     @staticmethod
     def from_dict(data: dict):
         return OcorrenciaEntity(**data)
@@ -75,3 +110,20 @@ class OcorrenciaMapper:
         model_dict["aluno_matricula"] = model.emprestimo.aluno.matricula
 
         return OcorrenciaEntity(**model_dict)
+
+
+class NotificacaoMapper:
+    @staticmethod
+    def from_model(model: Notificacao):
+        model_dict = model_to_dict(model)
+
+        model_dict["emprestimo_id"] = model_dict.pop("emprestimo")
+        model_dict["aluno_id"] = model_dict.pop("aluno")
+        model_dict["tipo"] = NotificacaoTipoEnum(model_dict["tipo"])
+        model_dict["estado"] = NotificacaoEstadoEnum(model_dict["estado"])
+
+        return NotificacaoEntity(**model_dict)
+
+    @staticmethod
+    def from_dict(data: dict):
+        return NotificacaoEntity(**data)
@@ -0,0 +1,121 @@
+"""
+Cache em disco dos PDFs de termos.
+
+Cada PDF é gravado com o nome igual ao sha256 da sua chave (id do empréstimo,
+`alterado_em` dos registros que aparecem no termo, hash do template, dos
+que ele estende ou inclui e do CSS), então qualquer alteração gera uma
+chave nova e a entrada antiga simplesmente deixa de ser lida até ser
+despejada. O diretório é limitado em bytes: ao gravar, os arquivos menos
+usados recentemente (mtime, atualizado a cada leitura) são removidos até
+caber no limite.
+"""
+
+import hashlib
+import os
+import tempfile
+from functools import cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.template import Template
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode, IncludeNode
+
+
+class CachePDF:
+    def __init__(self, diretorio: Path, tamanho_maximo: int) -> None:
+        self.diretorio = Path(diretorio)
+        self.tamanho_maximo = tamanho_maximo
+
+    @staticmethod
+    def chave(*partes) -> str:
+        return hashlib.sha256("|".join(map(str, partes)).encode()).hexdigest()
+
+    def _caminho(self, chave: str) -> Path:
+        return self.diretorio / f"{chave}.pdf"
+
+    def buscar(self, chave: str) -> Optional[bytes]:
+        caminho = self._caminho(chave)
+        try:
+            conteudo = caminho.read_bytes()
+            # marca o acesso para o despejo LRU
+            os.utime(caminho)
+        except FileNotFoundError:
+            return None
+
+        return conteudo
+
+    def guardar(self, chave: str, conteudo: bytes) -> None:
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+
+        # grava em arquivo temporário e renomeia: leitores concorrentes nunca
+        # veem um PDF pela metade
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(conteudo)
+        os.replace(temporario, self._caminho(chave))
+
+        self._despejar()
+
+    def _despejar(self) -> None:
+        entradas = []
+        for caminho in self.diretorio.glob("*.pdf"):
+            try:
+                estado = caminho.stat()
+            except FileNotFoundError:
+                continue
+            entradas.append((estado.st_mtime, estado.st_size, caminho))
+
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, caminho in sorted(entradas):
+            if total <= self.tamanho_maximo:
+                break
+
+            caminho.unlink(missing_ok=True)
+            total -= tamanho
+
+
+def _hash_arquivo(caminho: str) -> str:
+    return hashlib.sha256(Path(caminho).read_bytes()).hexdigest()
+
+
+def _origens(template: Template, vistos: set[str]) -> Iterator[str]:
+    """Arquivo do template e, recursivamente, dos que ele estende ou inclui."""
+    if template.origin.name in vistos:
+        return
+    vistos.add(template.origin.name)
+    yield template.origin.name
+
+    for no in template.nodelist.get_nodes_by_type((ExtendsNode, IncludeNode)):
+        nome = (no.parent_name if isinstance(no, ExtendsNode) else no.template).var
+        # nomes vindos de variáveis só são conhecidos na renderização
+        if isinstance(nome, str):
+            yield from _origens(get_template(nome).template, vistos)
+
+
+@cache
+def hash_template(template_path: str) -> str:
+    """
+    Hash do código-fonte do template e dos que ele estende ou inclui por
+    nome literal (`{% include "x.html" %}`; um nome em variável não entra).
+
+    Calculado uma vez por processo, como o template compilado em
+    `services.django._template`: editar um termo exige reiniciar o processo.
+    """
+    origens = _origens(get_template(template_path).template, set())
+    return CachePDF.chave(*map(_hash_arquivo, origens))
+
+
+@cache
+def hash_estatico(caminho: str) -> str:
+    """Hash de um arquivo estático, como a folha de estilo dos termos."""
+    return _hash_arquivo(finders.find(caminho))
+
+
+def cache_pdf_padrao() -> CachePDF:
+    return CachePDF(
+        getattr(settings, "TERMOS_CACHE_DIR", settings.BASE_DIR / "cache" / "termos"),
+        getattr(settings, "TERMOS_CACHE_TAMANHO_MAXIMO", 256 * 2**20),
+    )
@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
 from io import BytesIO
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 from emprestimo.domain.entities import EmprestimoEntity
+from emprestimo.domain.types import TermoTipoEnum
 
 
 class PDFService(ABC):
     @abstractmethod
-    def gerar_pdf_de_template(self, template_path: str, context: dict) -> BytesIO:
+    def gerar_pdf_de_template(self, template_path: str, context: dict) -> bytes:
         pass
 
     @abstractmethod
@@ -19,3 +20,40 @@ class PDFService(ABC):
     @abstractmethod
     def gerar_termo_devolucao(self, emprestimo: EmprestimoEntity, user: Any) -> BytesIO:
         pass
+
+
+class TemplateService(ABC):
+    @abstractmethod
+    def renderizar(self, template_path: str, context: dict) -> str:
+        pass
+
+
+class PreRenderizacaoTermosService(ABC):
+    """
+    Gera o PDF do termo fora da requisição, para que o download já o
+    encontre pronto. Não deve lançar exceções: uma falha aqui só significa
+    que o termo será gerado na hora do download.
+    """
+
+    @abstractmethod
+    def agendar_termo_responsabilidade(self, emprestimo: EmprestimoEntity) -> None:
+        pass
+
+    @abstractmethod
+    def agendar_termo_devolucao(self, emprestimo: EmprestimoEntity) -> None:
+        pass
+
+
+class TermosEmLoteService(ABC):
+    @abstractmethod
+    def gerar_zip(
+        self,
+        emprestimos_ids: Iterable[int],
+        tipo: TermoTipoEnum,
+        progresso: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[bytes]:
+        """
+        Partes de um ZIP com um PDF por empréstimo, produzidas à medida que
+        os termos ficam prontos. `progresso` recebe quantos já foram gerados.
+        """
+        pass
@@ -1,57 +1,169 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, partial
+from typing import Callable, Optional
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import connections, transaction
 from emprestimo.domain.entities import EmprestimoEntity
-from emprestimo.infrastructure.services.contracts import PDFService
+from emprestimo.domain.types import TermoTipoEnum
+from emprestimo.infrastructure.services.cache_pdf import (
+    CachePDF,
+    cache_pdf_padrao,
+    hash_estatico,
+    hash_template,
+)
+from emprestimo.infrastructure.services.contracts import (
+    PDFService,
+    PreRenderizacaoTermosService,
+    TemplateService,
+)
+from emprestimo.infrastructure.services.renderizador_pdf import (
+    FOLHAS_DE_ESTILO_TERMOS,
+    renderizador_termos,
+)
 
+from django.http import HttpResponse
 from django.utils import timezone
-from django.template.loader import render_to_string
-from django_weasyprint import WeasyTemplateResponse
+from django.template.loader import get_template, render_to_string
 from io import BytesIO
 
+logger = logging.getLogger(__name__)
+
+TEMPLATE_TERMO_RESPONSABILIDADE = "emprestimo/emprestimo/termo_responsabilidade.html"
+TEMPLATE_TERMO_DEVOLUCAO = "emprestimo/emprestimo/termo_devolucao.html"
+TEMPLATES_TERMOS = {
+    TermoTipoEnum.RESPONSABILIDADE: TEMPLATE_TERMO_RESPONSABILIDADE,
+    TermoTipoEnum.DEVOLUCAO: TEMPLATE_TERMO_DEVOLUCAO,
+}
+
+# registros impressos no termo: o `alterado_em` de cada um entra na chave do
+# cache, então editar qualquer um deles gera o PDF de novo
+RELACIONADOS_TERMO = (
+    "aluno",
+    "aluno__curso",
+    "aluno__curso__campus",
+    "aluno__forma_selecao",
+    "bem",
+    "bem__tipo",
+    "bem__marca_modelo",
+    "bem__estado_conservacao",
+    "bem__grau_fragilidade",
+)
+
+
+def _versao(model, relacionado: str):
+    for campo in relacionado.split("__"):
+        model = getattr(model, campo)
+        if model is None:
+            return None
+    return model.alterado_em
+
 
 class DjangoWeasyPDFService(PDFService):
-    def __init__(self, request) -> None:
+    def __init__(self, request, cache_pdf: Optional[CachePDF] = None) -> None:
         self._request = request
+        self._cache_pdf = cache_pdf if cache_pdf is not None else cache_pdf_padrao()
+
+    def gerar_pdf_de_template(self, template_path: str, context: dict) -> bytes:
+        html = render_to_string(template_path, context)
+        return renderizador_termos().renderizar(html)
+
+    def pdf_do_termo(self, emprestimo_id: int, template_path: str) -> bytes:
+        """PDF do termo, do cache ou gerado (e guardado) na hora."""
+        from emprestimo.models import Emprestimo
 
-    def gerar_pdf_de_template(self, template_path: str, context: dict) -> BytesIO:
-        html_string = render_to_string(template_path, context)
+        model = Emprestimo.objects.select_related(
+            *RELACIONADOS_TERMO, "devolucao_ciente_por"
+        ).get(id=emprestimo_id)
 
-        response = WeasyTemplateResponse(
-            request=self._request,
-            template=template_path,
-            context=context,
-            content_type="application/pdf",
+        chave = self._cache_pdf.chave(
+            model.id,
+            model.alterado_em,
+            *(_versao(model, relacionado) for relacionado in RELACIONADOS_TERMO),
+            # User não tem alterado_em; o termo de devolução imprime o username
+            getattr(model.devolucao_ciente_por, "username", None),
+            hash_template(template_path),
+            *map(hash_estatico, FOLHAS_DE_ESTILO_TERMOS),
         )
 
-        return response
+        pdf = self._cache_pdf.buscar(chave)
+        if pdf is None:
+            context = {
+                "emprestimo": model,
+                "data_geracao": timezone.now().strftime("%d/%m/%Y às %H:%M"),
+            }
+            pdf = self.gerar_pdf_de_template(template_path, context)
+            self._cache_pdf.guardar(chave, pdf)
+
+        return pdf
+
+    def _gerar_termo(self, emprestimo: EmprestimoEntity, template_path: str):
+        pdf = self.pdf_do_termo(emprestimo.id, template_path)
+        return HttpResponse(pdf, content_type="application/pdf")
 
     def gerar_termo_responsabilidade(
         self, emprestimo: EmprestimoEntity, user: User
     ) -> BytesIO:
-        from emprestimo.models import Emprestimo
+        return self._gerar_termo(emprestimo, TEMPLATE_TERMO_RESPONSABILIDADE)
 
-        model = Emprestimo.objects.get(id=emprestimo.id)
+    def gerar_termo_devolucao(
+        self, emprestimo: EmprestimoEntity, user: User
+    ) -> BytesIO:
+        return self._gerar_termo(emprestimo, TEMPLATE_TERMO_DEVOLUCAO)
 
-        context = {
-            "emprestimo": model,
-            "data_geracao": timezone.now().strftime("%d/%m/%Y às %H:%M"),
-        }
 
-        return self.gerar_pdf_de_template(
-            "emprestimo/emprestimo/termo_responsabilidade.html", context
+@cache
+def _executor_termos() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=getattr(settings, "TERMOS_PRE_RENDERIZACAO_THREADS", 1),
+        thread_name_prefix="termos",
+    )
+
+
+def _pre_renderizar(emprestimo_id: int, template_path: str):
+    try:
+        DjangoWeasyPDFService(None).pdf_do_termo(emprestimo_id, template_path)
+    except Exception:
+        logger.exception(
+            "Falha ao pré-renderizar %s do empréstimo %s", template_path, emprestimo_id
         )
+    finally:
+        # a thread do executor abre a própria conexão com o banco
+        if threading.current_thread() is not threading.main_thread():
+            connections.close_all()
 
-    def gerar_termo_devolucao(
-        self, emprestimo: EmprestimoEntity, user: User
-    ) -> BytesIO:
-        from emprestimo.models import Emprestimo
 
-        model = Emprestimo.objects.get(id=emprestimo.id)
+class DjangoPreRenderizacaoTermosService(PreRenderizacaoTermosService):
+    """
+    Agenda a geração do termo em um ThreadPoolExecutor do processo, depois do
+    commit da transação (antes disso a thread não enxergaria o empréstimo).
+    """
+
+    def __init__(self, executar: Optional[Callable] = None) -> None:
+        self._executar = executar or _executor_termos().submit
 
-        context = {
-            "emprestimo": model,
-            "data_geracao": timezone.now().strftime("%d/%m/%Y às %H:%M"),
-        }
+    def _agendar(self, emprestimo: EmprestimoEntity, template_path: str):
+        if not getattr(settings, "TERMOS_PRE_RENDERIZAR", True):
+            return
 
-        return self.gerar_pdf_de_template(
-            "emprestimo/emprestimo/termo_devolucao.html", context
+        transaction.on_commit(
+            partial(self._executar, _pre_renderizar, emprestimo.id, template_path)
         )
+
+    def agendar_termo_responsabilidade(self, emprestimo: EmprestimoEntity) -> None:
+        self._agendar(emprestimo, TEMPLATE_TERMO_RESPONSABILIDADE)
+
+    def agendar_termo_devolucao(self, emprestimo: EmprestimoEntity) -> None:
+        self._agendar(emprestimo, TEMPLATE_TERMO_DEVOLUCAO)
+
+
+# com DEBUG o loader do Django recompila o template a cada render; aqui ele é
+# compilado uma vez por processo, já que o cron renderiza milhares de e-mails
+_template = cache(get_template)
+
+
+class DjangoTemplateService(TemplateService):
+    def renderizar(self, template_path: str, context: dict) -> str:
+        return _template(template_path).render(context)
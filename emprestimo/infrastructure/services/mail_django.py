@@ -1,10 +1,73 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from smtplib import SMTPException, SMTPServerDisconnected
 from typing import Optional, Sequence
-from django.core.mail import send_mail
-from emprestimo.domain.contracts.mail import MailService
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
+from emprestimo.domain.contracts.mail import Email, MailService
 from sigemp import settings
 
 
+class BaldeDeTokens:
+    """
+    Limite de taxa por balde de tokens, seguro entre threads: o balde enche a
+    `taxa` tokens por segundo até `capacidade`, e `aguardar` consome um token,
+    dormindo o necessário quando o balde está vazio.
+    """
+
+    def __init__(self, taxa: float, capacidade: int = 1) -> None:
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._atualizado_em = time.monotonic()
+        self._trava = threading.Lock()
+
+    def aguardar(self) -> None:
+        with self._trava:
+            agora = time.monotonic()
+            self._tokens = min(
+                self.capacidade,
+                self._tokens + (agora - self._atualizado_em) * self.taxa,
+            )
+            self._atualizado_em = agora
+
+            # o token é reservado já aqui (saldo negativo), assim a espera
+            # acontece fora da trava e as outras threads entram na fila certa
+            self._tokens -= 1
+            espera = -self._tokens / self.taxa if self._tokens < 0 else 0
+
+        if espera:
+            time.sleep(espera)
+
+
 class DjangoMailService(MailService):
+    def _destinatarios(self, destinatarios: Sequence[str]) -> Sequence[str]:
+        return [settings.EMAIL_RECIPIENT_DEBUG] if settings.DEBUG else destinatarios
+
+    def _mensagem(self, email: Email, conexao) -> EmailMultiAlternatives:
+        mensagem = EmailMultiAlternatives(
+            email.assunto,
+            email.mensagem,
+            settings.DEFAULT_FROM_EMAIL,
+            self._destinatarios(email.destinatarios),
+            connection=conexao,
+        )
+        if email.mensagem_html:
+            mensagem.attach_alternative(email.mensagem_html, "text/html")
+
+        return mensagem
+
+    def _enviar(self, email: Email, conexao) -> int:
+        # uma falha em um e-mail não interrompe os demais; já a queda da
+        # conexão (SMTPServerDisconnected, OSError) sobe para quem a abriu
+        try:
+            return conexao.send_messages([self._mensagem(email, conexao)])
+        except SMTPServerDisconnected:
+            raise
+        except SMTPException:
+            return 0
+
     def enviar_email(
         self,
         mensagem: str,
@@ -13,12 +76,84 @@ class DjangoMailService(MailService):
         mensagem_html: Optional[str] = None,
     ) -> Sequence[str]:
         email_de = settings.DEFAULT_FROM_EMAIL
-        email_para = (
-            [settings.EMAIL_RECIPIENT_DEBUG] if settings.DEBUG else destinatarios
-        )
+        email_para = self._destinatarios(destinatarios)
         return send_mail(
             assunto,
             mensagem,
             email_de,
             recipient_list=email_para,
         )
+
+    def enviar_emails(self, emails: Sequence[Email]) -> list[int]:
+        # a conexão é aberta uma vez no `with` e reaproveitada por todos os
+        # send_messages
+        enviados = [0] * len(emails)
+        with get_connection() as conexao:
+            for indice, email in enumerate(emails):
+                try:
+                    enviados[indice] = self._enviar(email, conexao)
+                except (SMTPServerDisconnected, OSError):
+                    # conexão perdida: os restantes ficam como não enviados
+                    break
+
+        return enviados
+
+
+class DjangoMailServiceConcorrente(DjangoMailService):
+    """
+    Envia por até `conexoes` sessões SMTP em paralelo, uma por thread. Cada
+    thread retira o próximo e-mail de uma fila comum, então uma conexão lenta
+    não segura as demais. Com `taxa` (e-mails por segundo), todas as threads
+    passam pelo mesmo `BaldeDeTokens` antes de cada envio.
+    """
+
+    def __init__(
+        self,
+        conexoes: int = 4,
+        taxa: Optional[float] = None,
+        rajada: int = 1,
+    ) -> None:
+        self.conexoes = conexoes
+        self.limite = BaldeDeTokens(taxa, rajada) if taxa else None
+
+    def _trabalhador(self, fila: SimpleQueue, enviados: list[int]) -> None:
+        try:
+            with get_connection() as conexao:
+                while True:
+                    try:
+                        indice, email = fila.get_nowait()
+                    except Empty:
+                        return
+
+                    if self.limite:
+                        self.limite.aguardar()
+                    try:
+                        enviados[indice] = self._enviar(email, conexao)
+                    except (SMTPServerDisconnected, OSError):
+                        # devolve o e-mail para uma thread com conexão viva
+                        fila.put((indice, email))
+                        raise
+        except (SMTPException, OSError):
+            # conexão recusada ou perdida: o que restar na fila fica com as
+            # outras threads; sem nenhuma, os e-mails ficam como não enviados
+            return
+
+    def enviar_emails(self, emails: Sequence[Email]) -> list[int]:
+        enviados = [0] * len(emails)
+        if not emails:
+            return enviados
+
+        fila = SimpleQueue()
+        for item in enumerate(emails):
+            fila.put(item)
+
+        threads = min(self.conexoes, len(emails))
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            trabalhadores = [
+                executor.submit(self._trabalhador, fila, enviados)
+                for _ in range(threads)
+            ]
+            for trabalhador in trabalhadores:
+                trabalhador.result()
+
+        return enviados
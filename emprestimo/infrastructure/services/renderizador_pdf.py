@@ -0,0 +1,85 @@
+"""
+Renderizador de PDF de vida longa para os termos.
+
+Cada `WeasyTemplateResponse` criava um `FontConfiguration` novo (o
+fontconfig varre as fontes do sistema) e reprocessava todo o CSS a cada
+termo. Aqui as fontes e as folhas de estilo são carregadas uma vez por
+thread e reaproveitadas. Os arquivos estáticos são lidos do disco, sem
+requisições HTTP para o próprio servidor.
+"""
+
+import mimetypes
+import threading
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import unquote, urljoin, urlparse
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from weasyprint import CSS, HTML, default_url_fetcher
+from weasyprint.text.fonts import FontConfiguration
+
+FOLHAS_DE_ESTILO_TERMOS = ("emprestimo/css/termo.css",)
+
+# os caminhos do HTML são resolvidos contra esta origem, que nunca é acessada
+BASE_URL = "http://sigemp.local/"
+
+
+def buscar_arquivo_local(url: str) -> dict:
+    """
+    url_fetcher do WeasyPrint: arquivos estáticos (logo, CSS...) são lidos
+    dos diretórios do `staticfiles`; qualquer outro endereço HTTP é
+    recusado, e o WeasyPrint só registra um aviso e segue sem o recurso.
+    """
+    if not url.startswith(("http:", "https:")):
+        # data: e file: já são locais
+        return default_url_fetcher(url)
+
+    caminho = unquote(urlparse(url).path)
+    prefixo = static("")
+    if not caminho.startswith(prefixo):
+        raise ValueError(f"Recurso externo não permitido no PDF: {url}")
+
+    arquivo = finders.find(caminho.removeprefix(prefixo))
+    if arquivo is None:
+        raise FileNotFoundError(f"Arquivo estático não encontrado: {url}")
+
+    return {
+        "string": Path(arquivo).read_bytes(),
+        "mime_type": mimetypes.guess_type(arquivo)[0],
+        "redirected_url": url,
+    }
+
+
+class RenderizadorPDF:
+    def __init__(self, folhas_de_estilo: Iterable[str] = ()) -> None:
+        self.fontes = FontConfiguration()
+        self.folhas_de_estilo = [
+            CSS(
+                url=urljoin(BASE_URL, static(folha)),
+                url_fetcher=buscar_arquivo_local,
+                font_config=self.fontes,
+            )
+            for folha in folhas_de_estilo
+        ]
+
+    def renderizar(self, html: str) -> bytes:
+        documento = HTML(
+            string=html, base_url=BASE_URL, url_fetcher=buscar_arquivo_local
+        )
+        return documento.write_pdf(
+            stylesheets=self.folhas_de_estilo, font_config=self.fontes
+        )
+
+
+_renderizadores = threading.local()
+
+
+def renderizador_termos() -> RenderizadorPDF:
+    """
+    Renderizador dos termos da thread atual. O FontConfiguration guarda
+    estado do Pango/fontconfig e não é compartilhado entre threads.
+    """
+    if not hasattr(_renderizadores, "termos"):
+        _renderizadores.termos = RenderizadorPDF(FOLHAS_DE_ESTILO_TERMOS)
+    return _renderizadores.termos
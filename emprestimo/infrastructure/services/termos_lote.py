@@ -0,0 +1,153 @@
+"""
+Geração de termos em lote (início de semestre: centenas de empréstimos em
+poucos dias).
+
+O WeasyPrint ocupa um núcleo inteiro por documento, então os termos são
+renderizados em processos. Os processos são iniciados com `spawn`: o
+processo web tem threads e conexões com o banco que um `fork` herdaria.
+Por isso este módulo não importa models no topo, já que o processo filho o
+importa antes de `django.setup()`.
+
+Cada PDF passa pelo cache de termos: o lote aproveita o que já foi
+pré-renderizado e o download individual depois aproveita o lote.
+"""
+
+import logging
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+from django.conf import settings
+
+from emprestimo.domain.types import TermoTipoEnum
+from emprestimo.infrastructure.services.contracts import TermosEmLoteService
+
+logger = logging.getLogger(__name__)
+
+
+def _inicializar_processo():
+    import django
+
+    django.setup()
+
+
+def _renderizar(emprestimo_id: int, tipo: TermoTipoEnum) -> Optional[bytes]:
+    from emprestimo.infrastructure.services.django import (
+        TEMPLATES_TERMOS,
+        DjangoWeasyPDFService,
+    )
+
+    try:
+        return DjangoWeasyPDFService(None).pdf_do_termo(
+            emprestimo_id, TEMPLATES_TERMOS[tipo]
+        )
+    except Exception:
+        # um termo com problema não derruba o lote inteiro
+        logger.exception("Falha ao gerar %s do empréstimo %s", tipo, emprestimo_id)
+        return None
+
+
+class _NoProcesso(Executor):
+    """Executa na hora, no próprio processo (TERMOS_LOTE_PROCESSOS = 0)."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        futuro = Future()
+        futuro.set_result(fn(*args, **kwargs))
+        return futuro
+
+
+def _em_ordem(executor: Executor, funcao: Callable, argumentos: Iterable, janela: int):
+    """
+    Como `executor.map`, mas com no máximo `janela` tarefas em andamento: o
+    `map` submete tudo de uma vez e guardaria todos os PDFs em memória.
+    """
+    pendentes = deque()
+
+    for args in argumentos:
+        pendentes.append((args, executor.submit(funcao, *args)))
+        if len(pendentes) >= janela:
+            args, futuro = pendentes.popleft()
+            yield args, futuro.result()
+
+    while pendentes:
+        args, futuro = pendentes.popleft()
+        yield args, futuro.result()
+
+
+class _Saida:
+    """Destino do ZipFile que entrega os bytes escritos a cada termo."""
+
+    def __init__(self) -> None:
+        self._partes = []
+
+    def write(self, dados) -> int:
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def esvaziar(self) -> bytes:
+        dados = b"".join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+class DjangoTermosEmLoteService(TermosEmLoteService):
+    def __init__(self, processos: Optional[int] = None) -> None:
+        if processos is None:
+            processos = getattr(
+                settings, "TERMOS_LOTE_PROCESSOS", os.process_cpu_count() or 1
+            )
+        self._processos = processos
+
+    def _executor(self) -> Executor:
+        if not self._processos:
+            return _NoProcesso()
+
+        return ProcessPoolExecutor(
+            max_workers=self._processos,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_inicializar_processo,
+        )
+
+    def gerar_zip(
+        self,
+        emprestimos_ids: Iterable[int],
+        tipo: TermoTipoEnum,
+        progresso: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[bytes]:
+        saida = _Saida()
+        falhas = []
+        # PDFs já são comprimidos; ZIP_STORED só os empacota
+        arquivo = zipfile.ZipFile(saida, "w", zipfile.ZIP_STORED)
+
+        with self._executor() as executor:
+            termos = _em_ordem(
+                executor,
+                _renderizar,
+                ((emprestimo_id, tipo) for emprestimo_id in emprestimos_ids),
+                janela=2 * max(self._processos, 1),
+            )
+            for feitos, ((emprestimo_id, _), pdf) in enumerate(termos, start=1):
+                if pdf is None:
+                    falhas.append(emprestimo_id)
+                else:
+                    arquivo.writestr(f"termo-{tipo}-{emprestimo_id}.pdf", pdf)
+
+                if progresso:
+                    progresso(feitos)
+                if dados := saida.esvaziar():
+                    yield dados
+
+        if falhas:
+            arquivo.writestr(
+                "falhas.txt",
+                "Termos não gerados (ids dos empréstimos):\n"
+                + "\n".join(map(str, falhas)),
+            )
+        arquivo.close()
+        yield saida.esvaziar()
@@ -0,0 +1,82 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from emprestimo.domain.types import TermoTipoEnum
+from emprestimo.infrastructure.services.termos_lote import DjangoTermosEmLoteService
+from emprestimo.policies.django import DjangoEmprestimoPolicy
+from emprestimo.repositories.django import DjangoEmprestimoRepository
+from emprestimo.usecases import GerarTermosEmLoteUsecase
+
+FILTROS = ("texto", "curso", "data_emprestimo_inicio", "data_emprestimo_fim")
+
+
+class Command(BaseCommand):
+    help = "Gera em um arquivo ZIP os termos dos empréstimos filtrados"
+
+    def add_arguments(self, parser):
+        parser.add_argument("saida", help="caminho do arquivo .zip")
+        parser.add_argument(
+            "--usuario", required=True, help="username de quem gera os termos"
+        )
+        parser.add_argument(
+            "--tipo",
+            choices=[tipo.value for tipo in TermoTipoEnum],
+            default=TermoTipoEnum.RESPONSABILIDADE.value,
+        )
+        parser.add_argument("--texto", help="busca por aluno ou bem")
+        parser.add_argument("--curso", type=int, help="id do curso do aluno")
+        parser.add_argument(
+            "--de",
+            dest="data_emprestimo_inicio",
+            type=date.fromisoformat,
+            help="retirados a partir de (AAAA-MM-DD)",
+        )
+        parser.add_argument(
+            "--ate",
+            dest="data_emprestimo_fim",
+            type=date.fromisoformat,
+            help="retirados até (AAAA-MM-DD)",
+        )
+        parser.add_argument(
+            "--processos",
+            type=int,
+            help="processos de renderização (padrão: TERMOS_LOTE_PROCESSOS)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["usuario"])
+        except User.DoesNotExist:
+            raise CommandError(f"Usuário '{options['usuario']}' não encontrado.")
+
+        filtros = {
+            campo: options[campo] for campo in FILTROS if options[campo] is not None
+        }
+        usecase = GerarTermosEmLoteUsecase(
+            DjangoEmprestimoRepository(),
+            DjangoEmprestimoPolicy(user),
+            DjangoTermosEmLoteService(options["processos"]),
+        )
+
+        result = usecase.execute(
+            TermoTipoEnum(options["tipo"]), filtros, self.exibir_progresso
+        )
+        if not result:
+            raise CommandError(result.mensagem)
+
+        with open(options["saida"], "wb") as arquivo:
+            for parte in result.value:
+                arquivo.write(parte)
+
+        if self.stdout.isatty():
+            self.stdout.write("")  # encerra a linha do progresso
+        self.stdout.write(self.style.SUCCESS(f"Termos salvos em {options['saida']}."))
+
+    def exibir_progresso(self, feitos: int, total: int):
+        if self.stdout.isatty():
+            self.stdout.write(f"\r{feitos}/{total} termos", ending="")
+            self.stdout.flush()
+        elif feitos % 50 == 0 or feitos == total:
+            self.stdout.write(f"{feitos}/{total} termos")
@@ -0,0 +1,63 @@
+import logging
+
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+ATIVO = 1
+
+
+def resolver_ativos_duplicados(apps, schema_editor):
+    """
+    A verificação antiga (consulta antes do INSERT) deixava passar dois
+    empréstimos ativos para o mesmo bem ou aluno. Antes das constraints da
+    0009, mantém o empréstimo ativo mais recente de cada bem e de cada aluno
+    e remove (soft delete) os que conflitam com ele.
+    """
+    Emprestimo = apps.get_model("emprestimo", "Emprestimo")
+    Bem = apps.get_model("patrimonio", "Bem")
+
+    ativos = Emprestimo.objects.filter(estado=ATIVO, removido_em__isnull=True)
+
+    bens, alunos, removidos = set(), set(), []
+    for emprestimo in ativos.order_by("-data_emprestimo", "-id").values(
+        "id", "bem_id", "aluno_id"
+    ):
+        if emprestimo["bem_id"] in bens or emprestimo["aluno_id"] in alunos:
+            removidos.append(emprestimo)
+            continue
+
+        bens.add(emprestimo["bem_id"])
+        alunos.add(emprestimo["aluno_id"])
+
+    if not removidos:
+        return
+
+    logger.warning(
+        "Empréstimos ativos duplicados removidos: %s",
+        ", ".join(str(e["id"]) for e in removidos),
+    )
+    Emprestimo.objects.filter(id__in=[e["id"] for e in removidos]).update(
+        removido_em=timezone.now()
+    )
+
+    # o bem de um empréstimo removido por conflito de aluno fica livre
+    Bem.objects.filter(id__in={e["bem_id"] for e in removidos}).update(
+        disponivel=~Exists(ativos.filter(bem_id=OuterRef("pk")))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emprestimo", "0007_ocorrencia_descricao"),
+        ("patrimonio", "0008_bem_disponivel"),
+    ]
+
+    operations = [
+        # só dados, como em ativos.0002: as constraints vêm na 0009, em outra
+        # transação
+        migrations.RunPython(resolver_ativos_duplicados, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 6.1.2 on 2026-10-18 17:19
+
+import emprestimo.domain.types
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emprestimo", "0008_resolver_ativos_duplicados"),
+        ("ensino", "0006_indexar_busca_alunos"),
+        ("patrimonio", "0008_bem_disponivel"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="emprestimo",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("estado", emprestimo.domain.types.EmprestimoEstadoEnum["ATIVO"]),
+                    ("removido_em__isnull", True),
+                ),
+                fields=("bem",),
+                name="emprestimo_ativo_unico_por_bem",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="emprestimo",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("estado", emprestimo.domain.types.EmprestimoEstadoEnum["ATIVO"]),
+                    ("removido_em__isnull", True),
+                ),
+                fields=("aluno",),
+                name="emprestimo_ativo_unico_por_aluno",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.1.2 on 2026-10-18 17:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emprestimo", "0009_emprestimo_ativo_unico"),
+        ("ensino", "0007_indices_consultas"),
+        ("patrimonio", "0009_indices_consultas"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="emprestimo",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=["estado", "data_devolucao_prevista"],
+                name="emprestimo_estado_devol_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emprestimo",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=["bem", "estado"],
+                name="emprestimo_bem_estado_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emprestimo",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=["aluno", "estado"],
+                name="emprestimo_aluno_estado_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emprestimo",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=["-data_emprestimo", "-id"],
+                name="emprestimo_listagem_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ocorrencia",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=["emprestimo", "-data_ocorrencia"],
+                name="ocorrencia_emprestimo_data_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ocorrencia",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=["-data_ocorrencia", "-id"],
+                name="ocorrencia_listagem_idx",
+            ),
+        ),
+    ]
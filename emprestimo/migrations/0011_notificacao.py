@@ -0,0 +1,87 @@
+# Generated by Django 6.1.2 on 2026-10-18 17:49
+
+import django.db.models.deletion
+import django.utils.timezone
+import emprestimo.domain.types
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emprestimo", "0010_indices_consultas"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Notificacao",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tipo",
+                    models.CharField(
+                        choices=[("lembrete_devolucao", "Lembrete de devolução")],
+                        max_length=32,
+                    ),
+                ),
+                ("data_referencia", models.DateField()),
+                ("destinatario", models.CharField(max_length=255)),
+                ("assunto", models.TextField()),
+                ("mensagem", models.TextField()),
+                (
+                    "estado",
+                    models.IntegerField(
+                        choices=[(1, "Pendente"), (2, "Enviada"), (3, "Descartada")],
+                        default=emprestimo.domain.types.NotificacaoEstadoEnum[
+                            "PENDENTE"
+                        ],
+                    ),
+                ),
+                ("tentativas", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "proxima_tentativa_em",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("ultimo_erro", models.TextField(blank=True, null=True)),
+                ("criado_em", models.DateTimeField(auto_now_add=True)),
+                ("enviada_em", models.DateTimeField(blank=True, null=True)),
+                (
+                    "emprestimo",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="emprestimo.emprestimo",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(
+                            (
+                                "estado",
+                                emprestimo.domain.types.NotificacaoEstadoEnum[
+                                    "PENDENTE"
+                                ],
+                            )
+                        ),
+                        fields=["proxima_tentativa_em", "id"],
+                        name="notificacao_pendente_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("emprestimo", "tipo", "data_referencia"),
+                        name="notificacao_unica",
+                    )
+                ],
+            },
+        ),
+    ]
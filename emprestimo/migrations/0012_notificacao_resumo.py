@@ -0,0 +1,59 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emprestimo", "0011_notificacao"),
+        ("ensino", "0007_indices_consultas"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificacao",
+            name="aluno",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="ensino.aluno",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificacao",
+            name="mensagem_html",
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="notificacao",
+            name="emprestimo",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="emprestimo.emprestimo",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notificacao",
+            name="tipo",
+            field=models.CharField(
+                choices=[
+                    ("lembrete_devolucao", "Lembrete de devolução"),
+                    ("resumo_devolucao", "Resumo de devoluções do aluno"),
+                ],
+                max_length=32,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="notificacao",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("emprestimo__isnull", True)),
+                fields=("aluno", "tipo", "data_referencia"),
+                name="notificacao_resumo_unica",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emprestimo", "0012_notificacao_resumo"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emprestimo",
+            name="ultimo_lembrete_em",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+    ]
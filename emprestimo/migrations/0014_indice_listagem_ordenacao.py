@@ -0,0 +1,30 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emprestimo", "0013_emprestimo_ultimo_lembrete"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="emprestimo",
+            name="emprestimo_listagem_idx",
+        ),
+        migrations.AddIndex(
+            model_name="emprestimo",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=[
+                    "-data_emprestimo",
+                    "estado",
+                    "-data_devolucao_prevista",
+                    "-id",
+                ],
+                name="emprestimo_listagem_idx",
+            ),
+        ),
+    ]
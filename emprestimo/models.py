@@ -1,8 +1,13 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
 
-from core.models import Timestampable
-from emprestimo.domain.types import EmprestimoEstadoEnum
+from core.models import NAO_REMOVIDO, Timestampable
+from emprestimo.domain.types import (
+    EmprestimoEstadoEnum,
+    NotificacaoEstadoEnum,
+    NotificacaoTipoEnum,
+)
 from ensino.models import Aluno
 from patrimonio.models import Bem
 
@@ -37,6 +42,55 @@ class Emprestimo(Timestampable, models.Model):
         choices=EmprestimoEstadoEnum.choices(),
     )
     observacoes = models.TextField(null=True, blank=True)
+    ultimo_lembrete_em = models.DateField(null=True, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bem"],
+                condition=models.Q(
+                    estado=EmprestimoEstadoEnum.ATIVO, removido_em__isnull=True
+                ),
+                name="emprestimo_ativo_unico_por_bem",
+            ),
+            models.UniqueConstraint(
+                fields=["aluno"],
+                condition=models.Q(
+                    estado=EmprestimoEstadoEnum.ATIVO, removido_em__isnull=True
+                ),
+                name="emprestimo_ativo_unico_por_aluno",
+            ),
+        ]
+        indexes = [
+            # lembretes de devolução
+            models.Index(
+                fields=["estado", "data_devolucao_prevista"],
+                condition=NAO_REMOVIDO,
+                name="emprestimo_estado_devol_idx",
+            ),
+            models.Index(
+                fields=["bem", "estado"],
+                condition=NAO_REMOVIDO,
+                name="emprestimo_bem_estado_idx",
+            ),
+            models.Index(
+                fields=["aluno", "estado"],
+                condition=NAO_REMOVIDO,
+                name="emprestimo_aluno_estado_idx",
+            ),
+            # listagem paginada: mesmas colunas e direções de
+            # ORDENACAO_EMPRESTIMOS, para servir o ORDER BY e o cursor
+            models.Index(
+                fields=[
+                    "-data_emprestimo",
+                    "estado",
+                    "-data_devolucao_prevista",
+                    "-id",
+                ],
+                condition=NAO_REMOVIDO,
+                name="emprestimo_listagem_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"#{self.id} ({self.get_estado_display()}): {self.aluno.nome} ({self.aluno.matricula}) - {self.bem.descricao} ({self.bem.patrimonio})"
@@ -56,3 +110,72 @@ class Ocorrencia(Timestampable, models.Model):
         related_name="ocorrencias_canceladas",
     )
     motivo_cancelamento = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["emprestimo", "-data_ocorrencia"],
+                condition=NAO_REMOVIDO,
+                name="ocorrencia_emprestimo_data_idx",
+            ),
+            # listagem paginada (ORDENACAO_OCORRENCIAS)
+            models.Index(
+                fields=["-data_ocorrencia", "-id"],
+                condition=NAO_REMOVIDO,
+                name="ocorrencia_listagem_idx",
+            ),
+        ]
+
+
+class Notificacao(models.Model):
+    """
+    Caixa de saída de notificações. Cada linha é um e-mail a entregar, único
+    por (empréstimo, tipo, data de referência) ou, nos resumos que agrupam os
+    empréstimos de um aluno, por (aluno, tipo, data de referência); então
+    enfileirar de novo não duplica envios.
+    """
+
+    emprestimo = models.ForeignKey(
+        Emprestimo, on_delete=models.CASCADE, null=True, blank=True
+    )
+    aluno = models.ForeignKey(Aluno, on_delete=models.CASCADE, null=True, blank=True)
+    tipo = models.CharField(max_length=32, choices=NotificacaoTipoEnum.choices())
+    data_referencia = models.DateField()
+    destinatario = models.CharField(max_length=255)
+    assunto = models.TextField()
+    mensagem = models.TextField()
+    mensagem_html = models.TextField(null=True, blank=True)
+    estado = models.IntegerField(
+        choices=NotificacaoEstadoEnum.choices(),
+        default=NotificacaoEstadoEnum.PENDENTE,
+    )
+    tentativas = models.PositiveSmallIntegerField(default=0)
+    proxima_tentativa_em = models.DateTimeField(default=timezone.now)
+    ultimo_erro = models.TextField(null=True, blank=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    enviada_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["emprestimo", "tipo", "data_referencia"],
+                name="notificacao_unica",
+            ),
+            models.UniqueConstraint(
+                fields=["aluno", "tipo", "data_referencia"],
+                condition=models.Q(emprestimo__isnull=True),
+                name="notificacao_resumo_unica",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["proxima_tentativa_em", "id"],
+                condition=models.Q(estado=NotificacaoEstadoEnum.PENDENTE),
+                name="notificacao_pendente_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"#{self.id} {self.tipo} ({self.get_estado_display()}): {self.destinatario}"
+        )
@@ -2,8 +2,9 @@ from typing import Optional
 from django import forms
 from django.forms.widgets import DateInput
 
-from emprestimo.domain.types import EmprestimoEstadoEnum
+from emprestimo.domain.types import EmprestimoEstadoEnum, TermoTipoEnum
 from emprestimo.models import Emprestimo, Ocorrencia, TipoOcorrencia
+from ensino.models import Curso
 
 
 class TipoOcorrenciaForm(forms.ModelForm):
@@ -77,6 +78,24 @@ class EmprestimoFilterForm(forms.Form):
         required=False,
         choices=[("", "---------"), ("s", "Sim"), ("n", "Não")],
     )
+    curso = forms.ModelChoiceField(queryset=Curso.objects, required=False)
+    data_emprestimo_inicio = forms.DateField(
+        label="Retirada a partir de",
+        required=False,
+        widget=DateInput(attrs={"type": "date"}),
+    )
+    data_emprestimo_fim = forms.DateField(
+        label="Retirada até",
+        required=False,
+        widget=DateInput(attrs={"type": "date"}),
+    )
+
+
+class TermosEmLoteForm(EmprestimoFilterForm):
+    estado = None  # vem do tipo do termo
+    tipo = forms.ChoiceField(
+        choices=TermoTipoEnum.choices(), initial=TermoTipoEnum.RESPONSABILIDADE
+    )
 
 
 class OcorrenciaFilterForm(forms.Form):
@@ -65,6 +65,11 @@ urlpatterns = [
         views.gerar_termo_devolucao_view,
         name="gerar_termo_devolucao",
     ),
+    path(
+        "emprestimo/gerar_termos/",
+        views.gerar_termos_em_lote_view,
+        name="gerar_termos_em_lote",
+    ),
     path(
         "ocorrencias/", views.ListarOcorrenciasView.as_view(), name="listar_ocorrencias"
     ),
@@ -1,19 +1,26 @@
+from functools import partial
 from typing import Any
 
+from django.conf import settings
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
-from django.http import Http404, HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DetailView, ListView, UpdateView
 
+from core.presentation.mixins import PaginacaoCursorMixin, PaginacaoRepositorioMixin
 from emprestimo.domain.entities import (
     OcorrenciaEntity,
     TipoOcorrenciaEntity,
     EmprestimoEntity,
 )
-from emprestimo.domain.types import EmprestimoEstadoEnum
-from emprestimo.infrastructure.services.django import DjangoWeasyPDFService
+from emprestimo.domain.types import EmprestimoEstadoEnum, TermoTipoEnum
+from emprestimo.infrastructure.services.django import (
+    DjangoPreRenderizacaoTermosService,
+    DjangoWeasyPDFService,
+)
+from emprestimo.infrastructure.services.termos_lote import DjangoTermosEmLoteService
 from emprestimo.models import Ocorrencia, TipoOcorrencia, Emprestimo
 from emprestimo.policies.django import (
     DjangoOcorrenciaPolicy,
@@ -27,6 +34,7 @@ from emprestimo.presentation.forms import (
     OcorrenciaForm,
     TipoOcorrenciaForm,
     CriarEmprestimoForm,
+    TermosEmLoteForm,
 )
 from emprestimo.repositories.django import (
     DjangoTipoOcorrenciaRepository,
@@ -38,7 +46,7 @@ from emprestimo.usecases import (
     EditarTipoOcorrenciaUsecase,
     ListarTiposOcorrenciaUsecase,
     RemoverTipoOcorrenciaUsecase,
-    ListarEmprestimosUsecase,
+    ListarEmprestimosPorCursorUsecase,
     CadastrarEmprestimoUsecase,
     EditarEmprestimoUsecase,
     RemoverEmprestimoUsecase,
@@ -46,6 +54,7 @@ from emprestimo.usecases import (
 from emprestimo.usecases.emprestimo_usecases import (
     GerarTermoDevolucaoUsecase,
     GerarTermoResponsabilidadeUsecase,
+    GerarTermosEmLoteUsecase,
     RegistrarDevolucaoEmprestimoUsecase,
 )
 from emprestimo.usecases.ocorrencia_usecases import (
@@ -53,7 +62,7 @@ from emprestimo.usecases.ocorrencia_usecases import (
     ListarOcorrenciasAlunoUsecase,
     ListarOcorrenciasBemUsecase,
     ListarOcorrenciasEmprestimoUsecase,
-    ListarOcorrenciasUsecase,
+    ListarOcorrenciasPorCursorUsecase,
     RegistrarOcorrenciaUsecase,
 )
 
@@ -196,7 +205,7 @@ def remover_tipo_ocorrencia(request, pk):
     return redirect(reverse_lazy("emprestimo:listar_tipos_ocorrencia"))
 
 
-class ListarEmprestimoView(ListView):
+class ListarEmprestimoView(PaginacaoCursorMixin, ListView):
     model = Emprestimo
     paginate_by = 10
     template_name = "emprestimo/emprestimo/emprestimo_list.html"
@@ -205,7 +214,7 @@ class ListarEmprestimoView(ListView):
     def get_queryset(self):
         policy = DjangoEmprestimoPolicy(self.request.user)
         repo = DjangoEmprestimoRepository()
-        usecase = ListarEmprestimosUsecase(repo, policy)
+        usecase = ListarEmprestimosPorCursorUsecase(repo, policy)
 
         if not usecase.pode_listar():
             raise PermissionDenied("Voce nao tem permissao para visualizar empréstimo.")
@@ -213,15 +222,9 @@ class ListarEmprestimoView(ListView):
         self.filter = EmprestimoFilterForm(self.request.GET or None)
 
         if self.filter.is_valid():
-            result = usecase.execute(self.filter.cleaned_data)
-        else:
-            result = usecase.execute()
-
-        if not result:
-            messages.error(self.request, result.mensagem)
-            return []
+            return partial(usecase.execute, self.filter.cleaned_data)
 
-        return result.value
+        return usecase.execute
 
     def get_context_data(self, **kwargs: Any):
         context = super().get_context_data(**kwargs)
@@ -254,7 +257,9 @@ class CriarEmprestimoView(CreateView):
     def form_valid(self, form):
         repo = DjangoEmprestimoRepository()
         policy = DjangoEmprestimoPolicy(self.request.user)
-        usecase = CadastrarEmprestimoUsecase(repo, policy)
+        usecase = CadastrarEmprestimoUsecase(
+            repo, policy, DjangoPreRenderizacaoTermosService()
+        )
 
         if not usecase.pode_criar():
             raise PermissionDenied("Voce nao tem permissao para criar emprestimo.")
@@ -372,7 +377,9 @@ def registrar_devolucao_view(request, pk):
 
     emprestimo = repo.buscar_por_id(pk)
 
-    usecase = RegistrarDevolucaoEmprestimoUsecase(repo, policy)
+    usecase = RegistrarDevolucaoEmprestimoUsecase(
+        repo, policy, DjangoPreRenderizacaoTermosService()
+    )
     resultado = usecase.execute(emprestimo)
 
     if not resultado:
@@ -442,7 +449,38 @@ def gerar_termo_devolucao_view(request, pk):
     return response
 
 
-class ListarOcorrenciasView(ListView):
+def gerar_termos_em_lote_view(request):
+    repo = DjangoEmprestimoRepository()
+    policy = DjangoEmprestimoPolicy(request.user)
+    service = DjangoTermosEmLoteService(settings.TERMOS_LOTE_PROCESSOS_WEB)
+
+    if not policy.pode_listar():
+        raise PermissionDenied(
+            "Voce nao tem permissao para gerar termos de emprestimo."
+        )
+
+    form = TermosEmLoteForm(request.GET)
+    if not form.is_valid():
+        messages.error(request, "Filtros inválidos para gerar os termos.")
+        return redirect(reverse_lazy("emprestimo:listar_emprestimos"))
+
+    filtros = dict(form.cleaned_data)
+    tipo = TermoTipoEnum(filtros.pop("tipo"))
+
+    usecase = GerarTermosEmLoteUsecase(repo, policy, service)
+    result = usecase.execute(tipo, filtros)
+
+    if not result:
+        messages.error(request, result.mensagem)
+        return redirect(reverse_lazy("emprestimo:listar_emprestimos"))
+
+    # o ZIP é enviado à medida que os termos ficam prontos
+    response = StreamingHttpResponse(result.value, content_type="application/zip")
+    response["Content-Disposition"] = f'attachment; filename="termos-{tipo}.zip"'
+    return response
+
+
+class ListarOcorrenciasView(PaginacaoCursorMixin, ListView):
     model = Ocorrencia
     paginate_by = 10
     template_name = "emprestimo/ocorrencia/ocorrencia_list.html"
@@ -451,7 +489,7 @@ class ListarOcorrenciasView(ListView):
     def get_queryset(self):
         policy = DjangoOcorrenciaPolicy(self.request.user)
         repo = DjangoOcorrenciaRepository()
-        usecase = ListarOcorrenciasUsecase(repo, policy)
+        usecase = ListarOcorrenciasPorCursorUsecase(repo, policy)
 
         if not usecase.pode_listar():
             raise PermissionDenied(
@@ -460,15 +498,9 @@ class ListarOcorrenciasView(ListView):
 
         self.filter = OcorrenciaFilterForm(self.request.GET or None)
         if self.filter.is_valid():
-            result = usecase.execute(self.filter.cleaned_data)
-        else:
-            result = usecase.execute()
-
-        if not result:
-            messages.error(self.request, result.mensagem)
-            return []
+            return partial(usecase.execute, self.filter.cleaned_data)
 
-        return result.value
+        return usecase.execute
 
     def get_context_data(self, **kwargs: Any):
         context = super().get_context_data(**kwargs)
@@ -489,7 +521,7 @@ class VisualizarOcorrenciaView(DetailView):
     context_object_name = "ocorrencia"
 
 
-class ListarOcorrenciasAlunoView(ListView):
+class ListarOcorrenciasAlunoView(PaginacaoRepositorioMixin, ListView):
     model = Ocorrencia
     paginate_by = 10
     template_name = "emprestimo/ocorrencia/ocorrencia_list.html"
@@ -506,13 +538,7 @@ class ListarOcorrenciasAlunoView(ListView):
                 "Você não tem permissão para visualizar ocorrências."
             )
 
-        result = usecase.execute(aluno_id)
-
-        if not result:
-            messages.error(self.request, result.mensagem)
-            return []
-
-        return result.value
+        return partial(usecase.execute, aluno_id)
 
     def get_context_data(self, **kwargs: Any):
         context = super().get_context_data(**kwargs)
@@ -520,7 +546,7 @@ class ListarOcorrenciasAlunoView(ListView):
         return context
 
 
-class ListarOcorrenciasBemView(ListView):
+class ListarOcorrenciasBemView(PaginacaoRepositorioMixin, ListView):
     model = Ocorrencia
     paginate_by = 10
     template_name = "emprestimo/ocorrencia/ocorrencia_list.html"
@@ -537,13 +563,7 @@ class ListarOcorrenciasBemView(ListView):
                 "Você não tem permissão para visualizar ocorrências."
             )
 
-        result = usecase.execute(bem_id)
-
-        if not result:
-            messages.error(self.request, result.mensagem)
-            return []
-
-        return result.value
+        return partial(usecase.execute, bem_id)
 
     def get_context_data(self, **kwargs: Any):
         context = super().get_context_data(**kwargs)
@@ -551,7 +571,7 @@ class ListarOcorrenciasBemView(ListView):
         return context
 
 
-class ListarOcorrenciasEmprestimoView(ListView):
+class ListarOcorrenciasEmprestimoView(PaginacaoRepositorioMixin, ListView):
     model = Ocorrencia
     paginate_by = 10
     template_name = "emprestimo/ocorrencia/ocorrencia_list.html"
@@ -568,13 +588,7 @@ class ListarOcorrenciasEmprestimoView(ListView):
                 "Você não tem permissão para visualizar ocorrências."
             )
 
-        result = usecase.execute(emprestimo_id)
-
-        if not result:
-            messages.error(self.request, result.mensagem)
-            return []
-
-        return result.value
+        return partial(usecase.execute, emprestimo_id)
 
     def get_context_data(self, **kwargs: Any):
         context = super().get_context_data(**kwargs)
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from datetime import date
-from typing import Any, Optional, Sequence, Unpack
+from datetime import date, datetime
+from typing import Any, Iterable, Optional, Unpack
 
+from core.types import Pagina, PaginaCursor
 from emprestimo.domain.entities import (
+    NotificacaoEntity,
     OcorrenciaEntity,
     TipoOcorrenciaEntity,
     EmprestimoEntity,
@@ -44,9 +46,47 @@ class EmprestimoRepository(ABC):
         pass
 
     @abstractmethod
-    def listar_emprestimos_devolucao_proxima(
-        self, data_devolucao: date
-    ) -> Sequence[EmprestimoEntity]:
+    def listar_pagina(
+        self, offset: int, limite: int, **filtros: Unpack[EmprestimoFiltro]
+    ) -> Pagina[EmprestimoEntity]:
+        pass
+
+    @abstractmethod
+    def contar(self, **filtros: Unpack[EmprestimoFiltro]) -> int:
+        pass
+
+    @abstractmethod
+    def listar_por_cursor(
+        self, cursor: Optional[str], limite: int, **filtros: Unpack[EmprestimoFiltro]
+    ) -> PaginaCursor[EmprestimoEntity]:
+        pass
+
+    @abstractmethod
+    def iterar(self, **filtros: Unpack[EmprestimoFiltro]) -> Iterable[EmprestimoEntity]:
+        """Mesmo resultado de `listar`, lido do banco aos poucos."""
+        pass
+
+    @abstractmethod
+    def listar_devolucoes_ate(self, data_limite: date) -> Iterable[EmprestimoEntity]:
+        """
+        Empréstimos ativos com devolução prevista até `data_limite`,
+        inclusive os atrasados.
+        """
+        pass
+
+    @abstractmethod
+    def agrupar_devolucoes_ate_por_aluno(
+        self, data_limite: date
+    ) -> Iterable[tuple[int, list[EmprestimoEntity]]]:
+        """
+        Mesmos empréstimos de `listar_devolucoes_ate`, agrupados por aluno:
+        (aluno_id, empréstimos do aluno).
+        """
+        pass
+
+    @abstractmethod
+    def registrar_lembretes(self, etapas: dict[int, date]) -> None:
+        """Grava a etapa de lembrete enviada (id do empréstimo -> etapa)."""
         pass
 
     @abstractmethod
@@ -93,6 +133,22 @@ class OcorrenciaRepository(ABC):
     def listar_ocorrencias(self):
         pass
 
+    @abstractmethod
+    def listar_pagina(
+        self, offset: int, limite: int, **filtros: Unpack[OcorrenciaFiltro]
+    ) -> Pagina[OcorrenciaEntity]:
+        pass
+
+    @abstractmethod
+    def contar(self, **filtros: Unpack[OcorrenciaFiltro]) -> int:
+        pass
+
+    @abstractmethod
+    def listar_por_cursor(
+        self, cursor: Optional[str], limite: int, **filtros: Unpack[OcorrenciaFiltro]
+    ) -> PaginaCursor[OcorrenciaEntity]:
+        pass
+
     @abstractmethod
     def listar_ocorrencias_do_aluno(self, aluno_id: int):
         pass
@@ -120,3 +176,33 @@ class OcorrenciaRepository(ABC):
     @abstractmethod
     def remover_ocorrencia(self, id: int, user: Any):
         pass
+
+
+class NotificacaoRepository(ABC):
+    @abstractmethod
+    def enfileirar(self, notificacoes: Iterable[NotificacaoEntity]) -> None:
+        """Ignora notificações já enfileiradas (mesmo empréstimo, tipo e data)."""
+        pass
+
+    @abstractmethod
+    def reservar_pendentes(
+        self, agora: datetime, limite: int, reservar_ate: datetime
+    ) -> list[NotificacaoEntity]:
+        """
+        Retorna até `limite` notificações pendentes vencidas e adia a próxima
+        tentativa delas para `reservar_ate`, para que não sejam entregues duas
+        vezes nem se percam caso o processo seja interrompido.
+        """
+        pass
+
+    @abstractmethod
+    def marcar_enviadas(self, ids: Iterable[int], agora: datetime) -> None:
+        pass
+
+    @abstractmethod
+    def reagendar(self, id: int, proxima_tentativa_em: datetime, erro: str) -> None:
+        pass
+
+    @abstractmethod
+    def descartar(self, id: int, erro: str) -> None:
+        pass
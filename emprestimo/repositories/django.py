@@ -1,17 +1,30 @@
-from datetime import date
+from datetime import date, datetime
+from itertools import groupby
+from operator import attrgetter
 from django.contrib.auth.models import User
-from django.db.models import QuerySet
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, QuerySet
 from django.utils import timezone
 
-from typing import Any, Optional, Unpack
+from typing import Any, Iterable, Optional, Unpack
+from core.infrastructure.dashboard import invalidar_estatisticas
+from core.repositories.django import com_relacionamentos, projetar
+from core.repositories.pagination import paginar, paginar_por_cursor
+from core.types import Pagina, PaginaCursor
 from emprestimo.domain.entities import (
+    NotificacaoEntity,
     OcorrenciaEntity,
     TipoOcorrenciaEntity,
     EmprestimoEntity,
 )
+from emprestimo.domain.exceptions import (
+    AlunoComEmprestimoAtivoError,
+    BemComEmprestimoAtivoError,
+)
 from emprestimo.domain.types import (
     EmprestimoEstadoEnum,
     EmprestimoFiltro,
+    NotificacaoEstadoEnum,
     OcorrenciaFiltro,
 )
 from emprestimo.infrastructure.filtersets import (
@@ -19,16 +32,59 @@ from emprestimo.infrastructure.filtersets import (
     OcorrenciaFilterSet,
 )
 from emprestimo.infrastructure.mappers import (
+    NotificacaoMapper,
     OcorrenciaMapper,
     TipoOcorrenciaMapper,
     EmprestimoMapper,
 )
 from emprestimo.repositories.contracts import (
+    NotificacaoRepository,
     OcorrenciaRepository,
     TipoOcorrenciaRepository,
     EmprestimoRepository,
 )
-from emprestimo.models import Ocorrencia, TipoOcorrencia, Emprestimo
+from emprestimo.models import Notificacao, Ocorrencia, TipoOcorrencia, Emprestimo
+from patrimonio.models import Bem
+
+ORDENACAO_EMPRESTIMOS = (
+    "-data_emprestimo",
+    "estado",
+    "-data_devolucao_prevista",
+    "-id",
+)
+ORDENACAO_OCORRENCIAS = ("-data_ocorrencia", "-id")
+TAMANHO_LOTE = 500
+
+
+def atualizar_disponibilidade(*bem_ids: int) -> None:
+    """
+    Recalcula `Bem.disponivel` dos bens informados em um único UPDATE. Deve
+    ser chamada na mesma transação da escrita no empréstimo.
+    """
+    ativos = Emprestimo.objects.filter(
+        bem_id=OuterRef("pk"), estado=EmprestimoEstadoEnum.ATIVO
+    )
+    Bem.objects.filter(pk__in=bem_ids).update(disponivel=~Exists(ativos))
+
+
+def _erro_de_conflito(emprestimo: EmprestimoEntity, erro: IntegrityError):
+    """
+    Traduz a violação das constraints de empréstimo ativo único no erro de
+    domínio correspondente. Só é chamada no caminho de falha.
+    """
+    ativos = Emprestimo.objects.filter(estado=EmprestimoEstadoEnum.ATIVO).exclude(
+        pk=emprestimo.id
+    )
+
+    por_bem = ativos.filter(bem_id=emprestimo.bem_id)
+    if conflito := por_bem.values_list("id", flat=True).first():
+        return BemComEmprestimoAtivoError(conflito)
+
+    por_aluno = ativos.filter(aluno_id=emprestimo.aluno_id)
+    if conflito := por_aluno.values_list("id", flat=True).first():
+        return AlunoComEmprestimoAtivoError(conflito)
+
+    return erro
 
 
 class DjangoTipoOcorrenciaRepository(TipoOcorrenciaRepository):
@@ -87,31 +143,91 @@ class DjangoTipoOcorrenciaRepository(TipoOcorrenciaRepository):
 
 
 class DjangoEmprestimoRepository(EmprestimoRepository):
-    def listar(self, **filtros: Unpack[EmprestimoFiltro]) -> list[EmprestimoEntity]:
-        lista_emprestimos: QuerySet[Emprestimo] = EmprestimoFilterSet(
-            filtros, Emprestimo.objects.all()
-        ).qs.distinct()
+    def _objetos(self) -> QuerySet[Emprestimo]:
+        return com_relacionamentos(Emprestimo.objects, EmprestimoMapper)
 
-        return [EmprestimoMapper.from_model(e) for e in lista_emprestimos]
+    def _consultar(self, **filtros: Unpack[EmprestimoFiltro]) -> QuerySet[Emprestimo]:
+        if not filtros:
+            return self._objetos().order_by(*ORDENACAO_EMPRESTIMOS)
+
+        return (
+            EmprestimoFilterSet(filtros, self._objetos())
+            .qs.distinct()
+            .order_by(*ORDENACAO_EMPRESTIMOS)
+        )
+
+    def listar(self, **filtros: Unpack[EmprestimoFiltro]) -> list[EmprestimoEntity]:
+        return projetar(self._consultar(**filtros), EmprestimoMapper)
 
     def listar_emprestimos(self):
-        return [
-            EmprestimoMapper.from_model(emprestimo)
-            for emprestimo in Emprestimo.objects.order_by(
-                "-data_emprestimo", "estado", "-data_devolucao_prevista"
-            )
-        ]
+        return projetar(self._consultar(), EmprestimoMapper)
+
+    def listar_pagina(
+        self, offset: int, limite: int, **filtros: Unpack[EmprestimoFiltro]
+    ) -> Pagina[EmprestimoEntity]:
+        return paginar(
+            self._consultar(**filtros), offset, limite, EmprestimoMapper.from_model
+        )
 
-    def listar_emprestimos_devolucao_proxima(self, data_devolucao: date):
-        emprestimos = Emprestimo.objects.filter(
-            estado=EmprestimoEstadoEnum.ATIVO, data_devolucao_prevista=data_devolucao
+    def contar(self, **filtros: Unpack[EmprestimoFiltro]) -> int:
+        return self._consultar(**filtros).count()
+
+    def listar_por_cursor(
+        self, cursor: Optional[str], limite: int, **filtros: Unpack[EmprestimoFiltro]
+    ) -> PaginaCursor[EmprestimoEntity]:
+        return paginar_por_cursor(
+            self._consultar(**filtros),
+            ORDENACAO_EMPRESTIMOS,
+            cursor,
+            limite,
+            EmprestimoMapper.from_model,
         )
 
-        return [EmprestimoMapper.from_model(e) for e in emprestimos]
+    def iterar(self, **filtros: Unpack[EmprestimoFiltro]):
+        return (
+            EmprestimoMapper.from_model(e)
+            for e in self._consultar(**filtros).iterator(chunk_size=TAMANHO_LOTE)
+        )
+
+    def _devolucoes_ate(self, data_limite: date) -> QuerySet:
+        # faixa sobre (estado, data_devolucao_prevista): uma consulta cobre
+        # todas as etapas do cronograma, inclusive os atrasos
+        return self._objetos().filter(
+            estado=EmprestimoEstadoEnum.ATIVO,
+            data_devolucao_prevista__lte=data_limite,
+        )
+
+    def listar_devolucoes_ate(self, data_limite: date):
+        emprestimos = self._devolucoes_ate(data_limite).order_by("id")
+
+        # iterator(): dias com muitos vencimentos não são carregados de uma vez.
+        return (
+            EmprestimoMapper.from_model(e)
+            for e in emprestimos.iterator(chunk_size=TAMANHO_LOTE)
+        )
+
+    def agrupar_devolucoes_ate_por_aluno(self, data_limite: date):
+        emprestimos = self._devolucoes_ate(data_limite).order_by("aluno_id", "id")
+
+        # a ordenação por aluno deixa os empréstimos de cada um contíguos, então
+        # o agrupamento é feito no fluxo, sem carregar o dia inteiro
+        for aluno_id, grupo in groupby(
+            emprestimos.iterator(chunk_size=TAMANHO_LOTE), key=attrgetter("aluno_id")
+        ):
+            yield aluno_id, [EmprestimoMapper.from_model(e) for e in grupo]
+
+    def registrar_lembretes(self, etapas: dict[int, date]) -> None:
+        por_etapa: dict[date, list[int]] = {}
+        for emprestimo_id, etapa in etapas.items():
+            por_etapa.setdefault(etapa, []).append(emprestimo_id)
+
+        # um UPDATE por etapa, não por empréstimo
+        for etapa, ids in por_etapa.items():
+            Emprestimo.objects.filter(id__in=ids).update(ultimo_lembrete_em=etapa)
 
     def buscar_por_id(self, id: int):
         try:
-            emprestimo = Emprestimo.objects.get(pk=id, removido_em__isnull=True)
+            emprestimo = self._objetos().get(pk=id, removido_em__isnull=True)
         except Emprestimo.DoesNotExist as e:
             e.add_note(f"Emprestimo com id '{id}' não encontrado.")
             raise e
@@ -121,7 +237,7 @@ class DjangoEmprestimoRepository(EmprestimoRepository):
     def buscar_ativo_por_bem(self, bem_id: int) -> Optional[EmprestimoEntity]:
         try:
             emprestimo = EmprestimoMapper.from_model(
-                Emprestimo.objects.get(bem_id=bem_id, estado=EmprestimoEstadoEnum.ATIVO)
+                self._objetos().get(bem_id=bem_id, estado=EmprestimoEstadoEnum.ATIVO)
             )
         except Emprestimo.DoesNotExist:
             return None
@@ -133,52 +249,83 @@ class DjangoEmprestimoRepository(EmprestimoRepository):
     ) -> Optional[list[EmprestimoEntity]]:
         return [
             EmprestimoMapper.from_model(e)
-            for e in Emprestimo.objects.filter(
+            for e in self._objetos().filter(
                 aluno_id=aluno_id, estado=EmprestimoEstadoEnum.ATIVO
             )
         ]
 
+    @transaction.atomic
     def cadastrar_emprestimo(self, emprestimo: EmprestimoEntity, user: User):
-        return EmprestimoMapper.from_model(
-            Emprestimo.objects.create(
-                **emprestimo.to_dict(
-                    [
-                        "bem_patrimonio",
-                        "bem_descricao",
-                        "aluno_nome",
-                        "aluno_matricula",
-                        "timestamps",
-                        "id",
-                    ]
-                ),
-                criado_por=user,
-            )
-        )
+        try:
+            with transaction.atomic():
+                model = Emprestimo.objects.create(
+                    **emprestimo.to_dict(
+                        [
+                            "bem_patrimonio",
+                            "bem_descricao",
+                            "aluno_nome",
+                            "aluno_matricula",
+                            "timestamps",
+                            "id",
+                        ]
+                    ),
+                    criado_por=user,
+                )
+        except IntegrityError as e:
+            raise _erro_de_conflito(emprestimo, e) from e
+
+        atualizar_disponibilidade(model.bem_id)
 
+        return EmprestimoMapper.from_model(model)
+
+    @transaction.atomic
     def editar_emprestimo(self, emprestimo: EmprestimoEntity, user: Any):
+        bem_anterior, devolucao_anterior = (
+            Emprestimo.objects.filter(pk=emprestimo.id)
+            .values_list("bem_id", "data_devolucao_prevista")
+            .first()
+        ) or (None, None)
+
+        # prazo alterado: as etapas de lembrete recomeçam a partir do novo prazo
+        lembrete = {}
+        if devolucao_anterior != emprestimo.data_devolucao_prevista:
+            lembrete["ultimo_lembrete_em"] = None
+
         try:
-            Emprestimo.objects.filter(pk=emprestimo.id).update(
-                **emprestimo.to_dict(
-                    [
-                        "bem_patrimonio",
-                        "bem_descricao",
-                        "aluno_nome",
-                        "aluno_matricula",
-                        "timestamps",
-                        "id",
-                    ]
-                ),
-                alterado_por=user,
-            )
+            with transaction.atomic():
+                Emprestimo.objects.filter(pk=emprestimo.id).update(
+                    **emprestimo.to_dict(
+                        [
+                            "bem_patrimonio",
+                            "bem_descricao",
+                            "aluno_nome",
+                            "aluno_matricula",
+                            "timestamps",
+                            "id",
+                        ]
+                    ),
+                    **lembrete,
+                    # update() não aplica o auto_now
+                    alterado_em=timezone.now(),
+                    alterado_por=user,
+                )
         except Emprestimo.DoesNotExist as e:
             e.add_note(f"Emprestimo com id '{emprestimo.id}' não encontrado.")
             raise e
+        except IntegrityError as e:
+            raise _erro_de_conflito(emprestimo, e) from e
+
+        atualizar_disponibilidade(emprestimo.bem_id, bem_anterior)
 
-        return EmprestimoMapper.from_model(Emprestimo.objects.get(pk=emprestimo.id))
+        # update() não dispara post_save.
+        invalidar_estatisticas()
 
+        return EmprestimoMapper.from_model(self._objetos().get(pk=emprestimo.id))
+
+    @transaction.atomic
     def remover_emprestimo(self, id: int, user: Any):
         try:
-            emprestimo = Emprestimo.objects.get(pk=id)
+            emprestimo = self._objetos().get(pk=id)
         except Emprestimo.DoesNotExist as e:
             e.add_note(f"Emprestimo com id '{id}' não encontrado.")
             raise e
@@ -186,11 +333,13 @@ class DjangoEmprestimoRepository(EmprestimoRepository):
         emprestimo.soft_delete()
         emprestimo.alterado_por = user
         emprestimo.save()
+        atualizar_disponibilidade(emprestimo.bem_id)
         return EmprestimoMapper.from_model(emprestimo)
 
+    @transaction.atomic
     def registrar_devolucao(self, emprestimo: EmprestimoEntity, user: Any):
         try:
-            model = Emprestimo.objects.get(pk=emprestimo.id)
+            model = self._objetos().get(pk=emprestimo.id)
         except Emprestimo.DoesNotExist as e:
             e.add_note(f"Emprestimo com id '{id}' não encontrado.")
             raise e
@@ -200,28 +349,54 @@ class DjangoEmprestimoRepository(EmprestimoRepository):
         model.alterado_por = user
         model.devolucao_ciente_por = user
         model.save()
+        atualizar_disponibilidade(model.bem_id)
 
         return EmprestimoMapper.from_model(model)
 
 
 class DjangoOcorrenciaRepository(OcorrenciaRepository):
+    def _objetos(self) -> QuerySet[Ocorrencia]:
+        return com_relacionamentos(Ocorrencia.objects, OcorrenciaMapper)
+
+    def _consultar(self, **filtros: Unpack[OcorrenciaFiltro]) -> QuerySet[Ocorrencia]:
+        return OcorrenciaFilterSet(filtros, self._objetos()).qs.order_by(
+            *ORDENACAO_OCORRENCIAS
+        )
+
     def listar(self, **filtros: Unpack[OcorrenciaFiltro]) -> list[OcorrenciaEntity]:
-        lista_ocorrencias: QuerySet[Ocorrencia] = OcorrenciaFilterSet(
-            filtros, Ocorrencia.objects.all()
-        ).qs
+        return [OcorrenciaMapper.from_model(o) for o in self._consultar(**filtros)]
 
-        return [OcorrenciaMapper.from_model(o) for o in lista_ocorrencias]
+    def listar_pagina(
+        self, offset: int, limite: int, **filtros: Unpack[OcorrenciaFiltro]
+    ) -> Pagina[OcorrenciaEntity]:
+        return paginar(
+            self._consultar(**filtros), offset, limite, OcorrenciaMapper.from_model
+        )
+
+    def contar(self, **filtros: Unpack[OcorrenciaFiltro]) -> int:
+        return self._consultar(**filtros).count()
+
+    def listar_por_cursor(
+        self, cursor: Optional[str], limite: int, **filtros: Unpack[OcorrenciaFiltro]
+    ) -> PaginaCursor[OcorrenciaEntity]:
+        return paginar_por_cursor(
+            self._consultar(**filtros),
+            ORDENACAO_OCORRENCIAS,
+            cursor,
+            limite,
+            OcorrenciaMapper.from_model,
+        )
 
     def listar_ocorrencias(self):
         return [
             OcorrenciaMapper.from_model(o)
-            for o in Ocorrencia.objects.all().order_by("-data_ocorrencia")
+            for o in self._objetos().order_by("-data_ocorrencia")
         ]
 
     def listar_ocorrencias_do_aluno(self, aluno_id: int):
         return [
             OcorrenciaMapper.from_model(o)
-            for o in Ocorrencia.objects.all()
+            for o in self._objetos()
             .filter(emprestimo__aluno__id=aluno_id)
             .order_by("-data_ocorrencia")
         ]
@@ -229,7 +404,7 @@ class DjangoOcorrenciaRepository(OcorrenciaRepository):
     def listar_ocorrencias_do_emprestimo(self, emprestimo_id: int):
         return [
             OcorrenciaMapper.from_model(o)
-            for o in Ocorrencia.objects.all()
+            for o in self._objetos()
             .filter(emprestimo_id=emprestimo_id)
             .order_by("-data_ocorrencia")
         ]
@@ -237,14 +412,14 @@ class DjangoOcorrenciaRepository(OcorrenciaRepository):
     def listar_ocorrencias_do_bem(self, bem_id: int):
         return [
             OcorrenciaMapper.from_model(o)
-            for o in Ocorrencia.objects.all()
+            for o in self._objetos()
             .filter(emprestimo__bem_id=bem_id)
             .order_by("-data_ocorrencia")
         ]
 
     def buscar_por_id(self, id: int):
         try:
-            ocorrencia = Ocorrencia.objects.get(pk=id)
+            ocorrencia = self._objetos().get(pk=id)
         except Ocorrencia.DoesNotExist:
             return None
         else:
@@ -287,12 +462,70 @@ class DjangoOcorrenciaRepository(OcorrenciaRepository):
             e.add_note(f"Ocorrencia com id '{ocorrencia.id}' não encontrado.")
             raise e
 
-        return OcorrenciaMapper.from_model(Ocorrencia.objects.get(pk=ocorrencia.id))
+        # update() não dispara post_save.
+        invalidar_estatisticas()
+
+        return OcorrenciaMapper.from_model(self._objetos().get(pk=ocorrencia.id))
 
     def remover_ocorrencia(self, id: int, user: Any):
         try:
-            ocorrencia = Ocorrencia.objects.get(pk=id)
+            ocorrencia = self._objetos().get(pk=id)
         except Ocorrencia.DoesNotExist:
             return None
 
         return OcorrenciaMapper.from_model(ocorrencia.soft_delete())
+
+
+class DjangoNotificacaoRepository(NotificacaoRepository):
+    def enfileirar(self, notificacoes: Iterable[NotificacaoEntity]) -> None:
+        novas = []
+        for notificacao in notificacoes:
+            dados = notificacao.to_dict(["id", "enviada_em", "ultimo_erro"])
+            if dados["proxima_tentativa_em"] is None:
+                del dados["proxima_tentativa_em"]
+            novas.append(Notificacao(**dados))
+
+        Notificacao.objects.bulk_create(
+            novas, batch_size=TAMANHO_LOTE, ignore_conflicts=True
+        )
+
+    @transaction.atomic
+    def reservar_pendentes(
+        self, agora: datetime, limite: int, reservar_ate: datetime
+    ) -> list[NotificacaoEntity]:
+        # skip_locked permite vários workers; é ignorado em bancos sem
+        # SELECT ... FOR UPDATE (SQLite).
+        ids = list(
+            Notificacao.objects.select_for_update(skip_locked=True)
+            .filter(
+                estado=NotificacaoEstadoEnum.PENDENTE,
+                proxima_tentativa_em__lte=agora,
+            )
+            .order_by("proxima_tentativa_em", "id")
+            .values_list("id", flat=True)[:limite]
+        )
+        if not ids:
+            return []
+
+        reservadas = Notificacao.objects.filter(id__in=ids)
+        reservadas.update(proxima_tentativa_em=reservar_ate)
+        return [NotificacaoMapper.from_model(n) for n in reservadas.order_by("id")]
+
+    def marcar_enviadas(self, ids: Iterable[int], agora: datetime) -> None:
+        Notificacao.objects.filter(id__in=list(ids)).update(
+            estado=NotificacaoEstadoEnum.ENVIADA, enviada_em=agora, ultimo_erro=None
+        )
+
+    def reagendar(self, id: int, proxima_tentativa_em: datetime, erro: str) -> None:
+        Notificacao.objects.filter(pk=id).update(
+            tentativas=F("tentativas") + 1,
+            proxima_tentativa_em=proxima_tentativa_em,
+            ultimo_erro=erro,
+        )
+
+    def descartar(self, id: int, erro: str) -> None:
+        Notificacao.objects.filter(pk=id).update(
+            estado=NotificacaoEstadoEnum.DESCARTADA,
+            tentativas=F("tentativas") + 1,
+            ultimo_erro=erro,
+        )
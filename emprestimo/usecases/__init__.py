@@ -7,17 +7,23 @@ from .tipoocorrencia_usecases import (
 
 from .emprestimo_usecases import (
     ListarEmprestimosUsecase,
+    ListarEmprestimosPorCursorUsecase,
     CadastrarEmprestimoUsecase,
     EditarEmprestimoUsecase,
     RemoverEmprestimoUsecase,
     RegistrarDevolucaoEmprestimoUsecase,
     GerarTermoResponsabilidadeUsecase,
     GerarTermoDevolucaoUsecase,
+    GerarTermosEmLoteUsecase,
     NotificarDevolucaoUsecase,
+    NotificarDevolucaoPorAlunoUsecase,
 )
 
+from .notificacao_usecases import EntregarNotificacoesUsecase
+
 from .ocorrencia_usecases import (
     ListarOcorrenciasUsecase,
+    ListarOcorrenciasPorCursorUsecase,
     RegistrarOcorrenciaUsecase,
     CancelarOcorrenciaUsecase,
     ListarOcorrenciasBemUsecase,
@@ -31,14 +37,19 @@ __all__ = [
     "EditarTipoOcorrenciaUsecase",
     "RemoverTipoOcorrenciaUsecase",
     "ListarEmprestimosUsecase",
+    "ListarEmprestimosPorCursorUsecase",
     "CadastrarEmprestimoUsecase",
     "EditarEmprestimoUsecase",
     "RemoverEmprestimoUsecase",
     "NotificarDevolucaoUsecase",
+    "NotificarDevolucaoPorAlunoUsecase",
+    "EntregarNotificacoesUsecase",
     "RegistrarDevolucaoEmprestimoUsecase",
     "GerarTermoResponsabilidadeUsecase",
     "GerarTermoDevolucaoUsecase",
+    "GerarTermosEmLoteUsecase",
     "ListarOcorrenciasUsecase",
+    "ListarOcorrenciasPorCursorUsecase",
     "RegistrarOcorrenciaUsecase",
     "CancelarOcorrenciaUsecase",
     "ListarOcorrenciasBemUsecase",
@@ -1,12 +1,27 @@
-from datetime import date
-from typing import Optional
+from datetime import date, timedelta
+from itertools import batched
+from typing import Callable, Iterable, Optional
 from core.types import ResultError, ResultSuccess
-from emprestimo.domain.contracts.mail import MailService
-from emprestimo.domain.entities import EmprestimoEntity
-from emprestimo.domain.types import EmprestimoEstadoEnum, EmprestimoFiltro
+from emprestimo.domain.entities import EmprestimoEntity, NotificacaoEntity
+from emprestimo.domain.exceptions import EmprestimoConflitanteError
+from emprestimo.domain.types import (
+    CronogramaLembretes,
+    EmprestimoEstadoEnum,
+    EmprestimoFiltro,
+    NotificacaoTipoEnum,
+    TermoTipoEnum,
+)
 from emprestimo.policies.contracts import EmprestimoPolicy
-from emprestimo.repositories.contracts import EmprestimoRepository
-from emprestimo.infrastructure.services.contracts import PDFService
+from emprestimo.repositories.contracts import (
+    EmprestimoRepository,
+    NotificacaoRepository,
+)
+from emprestimo.infrastructure.services.contracts import (
+    PDFService,
+    PreRenderizacaoTermosService,
+    TemplateService,
+    TermosEmLoteService,
+)
 from ensino.repositories.contracts import AlunoRepository
 from sigemp import settings
 
@@ -19,26 +34,62 @@ class ListarEmprestimosUsecase:
     def pode_listar(self):
         return self.policy.pode_listar()
 
-    def execute(self, filtros: Optional[EmprestimoFiltro] = None):
+    def execute(
+        self,
+        filtros: Optional[EmprestimoFiltro] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+    ):
         if not self.policy.pode_listar():
             return ResultError("Você não tem permissão para listar empréstimo.")
 
         try:
-            resposta = (
-                self.repo.listar_emprestimos()
-                if not filtros
-                else self.repo.listar(**filtros)
-            )
+            if limite is not None:
+                resposta = self.repo.listar_pagina(offset, limite, **(filtros or {}))
+            elif not filtros:
+                resposta = self.repo.listar_emprestimos()
+            else:
+                resposta = self.repo.listar(**filtros)
             return ResultSuccess(resposta)
         except Exception as e:
             return ResultError(f"Erro ao listar empréstimo: {e}")
 
 
-class CadastrarEmprestimoUsecase:
+class ListarEmprestimosPorCursorUsecase:
     def __init__(self, repo: EmprestimoRepository, policy: EmprestimoPolicy) -> None:
         self.repo = repo
         self.policy = policy
 
+    def pode_listar(self):
+        return self.policy.pode_listar()
+
+    def execute(
+        self,
+        filtros: Optional[EmprestimoFiltro] = None,
+        cursor: Optional[str] = None,
+        limite: int = 10,
+    ):
+        if not self.policy.pode_listar():
+            return ResultError("Você não tem permissão para listar empréstimo.")
+
+        try:
+            resposta = self.repo.listar_por_cursor(cursor, limite, **(filtros or {}))
+            return ResultSuccess(resposta)
+        except Exception as e:
+            return ResultError(f"Erro ao listar empréstimo: {e}")
+
+
+class CadastrarEmprestimoUsecase:
+    def __init__(
+        self,
+        repo: EmprestimoRepository,
+        policy: EmprestimoPolicy,
+        termos: Optional[PreRenderizacaoTermosService] = None,
+    ) -> None:
+        self.repo = repo
+        self.policy = policy
+        self.termos = termos
+
     def pode_criar(self):
         return self.policy.pode_criar()
 
@@ -46,36 +97,34 @@ class CadastrarEmprestimoUsecase:
         if not self.policy.pode_criar():
             return ResultError("Você não tem permissão para cadastrar empréstimo")
 
-        try:
-            existente: Optional[EmprestimoEntity] = self.repo.buscar_ativo_por_bem(
-                novo_emprestimo.bem_id
-            )
-            if existente:
-                return ResultError(f"Bem Possui empréstimo ativo: {existente.id}")
-        except Exception as e:
-            return ResultError(f"Erro ao cadastrar empréstimo: {e}")
-
-        try:
-            existentes = self.repo.buscar_ativos_por_aluno(novo_emprestimo.aluno_id)
-            if existentes:
-                return ResultError(f"Aluno Possui empréstimos ativos: {existente.id}")
-        except Exception as e:
-            return ResultError(f"Erro ao cadastrar empréstimo: {e}")
-
+        # A unicidade do empréstimo ativo por bem e por aluno é garantida pelo
+        # banco; o repositório converte a violação em EmprestimoConflitanteError.
         try:
             resposta = self.repo.cadastrar_emprestimo(
                 novo_emprestimo,
                 self.policy.user,
             )
-            return ResultSuccess(resposta)
+        except EmprestimoConflitanteError as e:
+            return ResultError(str(e))
         except Exception as e:
             return ResultError(f"Erro ao cadastrar empréstimo: {e}")
 
+        if self.termos:
+            self.termos.agendar_termo_responsabilidade(resposta)
+
+        return ResultSuccess(resposta)
+
 
 class RegistrarDevolucaoEmprestimoUsecase:
-    def __init__(self, repo: EmprestimoRepository, policy: EmprestimoPolicy) -> None:
+    def __init__(
+        self,
+        repo: EmprestimoRepository,
+        policy: EmprestimoPolicy,
+        termos: Optional[PreRenderizacaoTermosService] = None,
+    ) -> None:
         self.repo = repo
         self.policy = policy
+        self.termos = termos
 
     def pode_editar(self):
         return self.policy.pode_editar()
@@ -100,10 +149,14 @@ class RegistrarDevolucaoEmprestimoUsecase:
                 emprestimo,
                 self.policy.user,
             )
-            return ResultSuccess(resposta)
         except Exception as e:
             return ResultError(f"Erro ao registrar devolução de empréstimo: {e}")
 
+        if self.termos:
+            self.termos.agendar_termo_devolucao(resposta)
+
+        return ResultSuccess(resposta)
+
 
 class EditarEmprestimoUsecase:
     def __init__(self, repo: EmprestimoRepository, policy: EmprestimoPolicy) -> None:
@@ -225,47 +278,238 @@ class GerarTermoDevolucaoUsecase:
         return ResultSuccess(resposta)
 
 
+class GerarTermosEmLoteUsecase:
+    """
+    Um ZIP com o termo de cada empréstimo que atende aos filtros. O tipo do
+    termo define o estado: responsabilidade para ativos, devolução para
+    finalizados. Os empréstimos são lidos e os termos gerados sob demanda,
+    enquanto o ZIP é consumido.
+    """
+
+    def __init__(
+        self,
+        repo: EmprestimoRepository,
+        policy: EmprestimoPolicy,
+        service: TermosEmLoteService,
+    ) -> None:
+        self.repo = repo
+        self.policy = policy
+        self.service = service
+
+    def execute(
+        self,
+        tipo: TermoTipoEnum,
+        filtros: Optional[EmprestimoFiltro] = None,
+        progresso: Optional[Callable[[int, int], None]] = None,
+    ):
+        if not self.policy.pode_listar():
+            return ResultError("Você não tem permissão para gerar termos.")
+
+        # o FilterSet valida o estado como valor da querystring, não como enum
+        filtros = {**(filtros or {}), "estado": tipo.estado.value}
+        total = self.repo.contar(**filtros)
+        if not total:
+            return ResultError("Nenhum empréstimo encontrado para gerar termos.")
+
+        ids = (
+            emprestimo.id
+            for emprestimo in self.repo.iterar(**filtros)
+            if self.policy.pode_gerar_termos(emprestimo)
+        )
+
+        return ResultSuccess(
+            self.service.gerar_zip(
+                ids, tipo, progresso and (lambda feitos: progresso(feitos, total))
+            )
+        )
+
+
 class NotificarDevolucaoUsecase:
+    """
+    Enfileira um lembrete por empréstimo ativo cuja etapa do `cronograma`
+    (D-7, D-3, D-1, atrasos...) ainda não foi notificada. Todos os
+    candidatos vêm de uma única consulta por faixa de datas; a etapa enviada
+    fica registrada no empréstimo, então cada etapa sai uma única vez. A
+    entrega é feita por `EntregarNotificacoesUsecase`.
+    """
+
     def __init__(
         self,
         emprestimo_repo: EmprestimoRepository,
         aluno_repo: AlunoRepository,
-        service: MailService,
+        notificacao_repo: NotificacaoRepository,
+        cronograma: CronogramaLembretes = CronogramaLembretes(),
+        tamanho_lote: int = 500,
     ):
         self.emprestimo_repo = emprestimo_repo
         self.aluno_repo = aluno_repo
-        self.service = service
+        self.notificacao_repo = notificacao_repo
+        self.cronograma = cronograma
+        self.tamanho_lote = tamanho_lote
+
+    def _pendentes(self, emprestimos: Iterable[EmprestimoEntity], hoje: date):
+        for e in emprestimos:
+            etapa = self.cronograma.etapa_pendente(
+                e.data_devolucao_prevista, e.ultimo_lembrete_em, hoje
+            )
+            if etapa:
+                yield e, etapa
+
+    def _lembrete(
+        self, e: EmprestimoEntity, destinatario: str, etapa: date, hoje: date
+    ):
+        prazo = e.data_devolucao_prevista.strftime("%d/%m/%Y")
+        if e.data_devolucao_prevista < hoje:
+            assunto = f"[SIGEMP] - Devolução em atraso: bem '{e.bem_descricao} ({e.bem_patrimonio})'"
+            aviso = f"está em atraso desde o dia {prazo}. Procure a comissão para regularizar a devolução."
+        else:
+            assunto = f"[SIGEMP] - Lembrete: prazo de devolução do bem '{e.bem_descricao} ({e.bem_patrimonio})'"
+            aviso = f"deve ser feita no dia {prazo}."
+
+        mensagem = (
+            f"Prezado {e.aluno_nome},\n\n"
+            f"A devolução do bem ''{e.bem_descricao} ({e.bem_patrimonio})'' {aviso} "
+            f"Não esqueça de assinar o termo de devolução ao realizar a entrega.\n\n"
+            f"Atenciosamente,\n Comissão de Empréstimo de Bens Móveis."
+        )
 
-    def execute(self, data_devolucao: date):
-        emprestimos = self.emprestimo_repo.listar_emprestimos_devolucao_proxima(
-            data_devolucao
+        return NotificacaoEntity(
+            emprestimo_id=e.id,
+            aluno_id=e.aluno_id,
+            tipo=NotificacaoTipoEnum.LEMBRETE_DEVOLUCAO,
+            data_referencia=etapa,
+            destinatario=destinatario,
+            assunto=assunto,
+            mensagem=mensagem,
         )
 
-        map_sucesso: dict[str, int] = {}
+    def execute(self, hoje: date):
+        emprestimos = self.emprestimo_repo.listar_devolucoes_ate(
+            hoje + timedelta(days=self.cronograma.antecedencia_maxima)
+        )
+
+        enfileirados = 0
+        try:
+            for lote in batched(self._pendentes(emprestimos, hoje), self.tamanho_lote):
+                emails = self.aluno_repo.buscar_emails({e.aluno_id for e, _ in lote})
+                lembretes = [
+                    self._lembrete(e, emails[e.aluno_id], etapa, hoje)
+                    for e, etapa in lote
+                    if emails.get(e.aluno_id)
+                ]
+
+                self.notificacao_repo.enfileirar(lembretes)
+                self.emprestimo_repo.registrar_lembretes(
+                    {n.emprestimo_id: n.data_referencia for n in lembretes}
+                )
+                enfileirados += len(lembretes)
+        except Exception as e:
+            return ResultError(f"Erro ao enfileirar lembretes de devolução: {e}")
+
+        return ResultSuccess(enfileirados)
 
-        for e in emprestimos:
-            destinatario = self.aluno_repo.buscar_por_id(e.aluno_id).email
 
-            if destinatario not in map_sucesso.keys():
-                map_sucesso[destinatario] = 0
+class NotificarDevolucaoPorAlunoUsecase:
+    """
+    Como `NotificarDevolucaoUsecase`, mas enfileira um único resumo por aluno
+    listando todos os bens com etapa de lembrete pendente.
+    """
 
+    template_texto = "emprestimo/notificacao/resumo_devolucao.txt"
+    template_html = "emprestimo/notificacao/resumo_devolucao.html"
+
+    def __init__(
+        self,
+        emprestimo_repo: EmprestimoRepository,
+        aluno_repo: AlunoRepository,
+        notificacao_repo: NotificacaoRepository,
+        template_service: TemplateService,
+        cronograma: CronogramaLembretes = CronogramaLembretes(),
+        tamanho_lote: int = 500,
+    ):
+        self.emprestimo_repo = emprestimo_repo
+        self.aluno_repo = aluno_repo
+        self.notificacao_repo = notificacao_repo
+        self.template_service = template_service
+        self.cronograma = cronograma
+        self.tamanho_lote = tamanho_lote
+
+    def _pendentes(
+        self, grupos: Iterable[tuple[int, list[EmprestimoEntity]]], hoje: date
+    ):
+        for aluno_id, emprestimos in grupos:
+            etapas = {}
+            for e in emprestimos:
+                etapa = self.cronograma.etapa_pendente(
+                    e.data_devolucao_prevista, e.ultimo_lembrete_em, hoje
+                )
+                if etapa:
+                    etapas[e.id] = etapa
+
+            if etapas:
+                yield aluno_id, [e for e in emprestimos if e.id in etapas], etapas
+
+    def _resumo(
+        self,
+        aluno_id: int,
+        emprestimos: list[EmprestimoEntity],
+        etapas: dict[int, date],
+        destinatario: str,
+        hoje: date,
+    ):
+        context = {
+            "aluno_nome": emprestimos[0].aluno_nome,
+            "emprestimos": emprestimos,
+            "hoje": hoje,
+        }
+
+        if len(emprestimos) == 1:
+            e = emprestimos[0]
             assunto = f"[SIGEMP] - Lembrete: prazo de devolução do bem '{e.bem_descricao} ({e.bem_patrimonio})'"
-            mensagem = (
-                f"Prezado {e.aluno_nome},\n\n"
-                f"A devolução do bem ''{e.bem_descricao} ({e.bem_patrimonio})'' "
-                f"deve ser feita no dia {e.data_devolucao_prevista.strftime('%d/%m/%Y')}. "
-                f"Não esqueça de assinar o termo de devolução ao realizar a entrega.\n\n"
-                f"Atenciosamente,\n Comissão de Empréstimo de Bens Móveis."
+        else:
+            assunto = (
+                f"[SIGEMP] - Lembrete: prazo de devolução de {len(emprestimos)} bens"
             )
 
-            retorno = self.service.enviar_email(
-                mensagem, [destinatario], assunto=assunto
-            )
+        return NotificacaoEntity(
+            aluno_id=aluno_id,
+            tipo=NotificacaoTipoEnum.RESUMO_DEVOLUCAO,
+            # etapa mais recente: reenfileirar a mesma etapa não duplica o resumo
+            data_referencia=max(etapas.values()),
+            destinatario=destinatario,
+            assunto=assunto,
+            mensagem=self.template_service.renderizar(self.template_texto, context),
+            mensagem_html=self.template_service.renderizar(self.template_html, context),
+        )
 
-            map_sucesso[destinatario] += retorno
+    def execute(self, hoje: date):
+        grupos = self.emprestimo_repo.agrupar_devolucoes_ate_por_aluno(
+            hoje + timedelta(days=self.cronograma.antecedencia_maxima)
+        )
 
-        if sum(map_sucesso.values()) == 0:
-            return ResultError(
-                f"Erro ao notificar: Nenhum e-mail notificado: {map_sucesso.keys()}"
-            )
-        return ResultSuccess(map_sucesso)
+        enfileirados = 0
+        try:
+            for lote in batched(self._pendentes(grupos, hoje), self.tamanho_lote):
+                emails = self.aluno_repo.buscar_emails(
+                    {aluno_id for aluno_id, _, _ in lote}
+                )
+                resumos = []
+                etapas_enviadas = {}
+                for aluno_id, emprestimos, etapas in lote:
+                    if not emails.get(aluno_id):
+                        continue
+
+                    resumos.append(
+                        self._resumo(
+                            aluno_id, emprestimos, etapas, emails[aluno_id], hoje
+                        )
+                    )
+                    etapas_enviadas.update(etapas)
+
+                self.notificacao_repo.enfileirar(resumos)
+                self.emprestimo_repo.registrar_lembretes(etapas_enviadas)
+                enfileirados += len(resumos)
+        except Exception as e:
+            return ResultError(f"Erro ao enfileirar lembretes de devolução: {e}")
+
+        return ResultSuccess(enfileirados)
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from typing import Callable
+
+from core.types import ResultError, ResultSuccess
+from emprestimo.domain.contracts.mail import Email, MailService
+from emprestimo.repositories.contracts import NotificacaoRepository
+
+
+class EntregarNotificacoesUsecase:
+    """
+    Entrega as notificações pendentes da caixa de saída em lotes.
+
+    Cada lote é reservado antes do envio: se o processo cair no meio, as
+    notificações reservadas voltam a ficar disponíveis após `reserva`, contada
+    a partir da hora em que o lote foi reservado (`relogio`). Falhas
+    são reagendadas com espera exponencial (`espera_base`, depois o dobro)
+    e, ao atingir `max_tentativas`, a notificação é descartada.
+    """
+
+    def __init__(
+        self,
+        repo: NotificacaoRepository,
+        service: MailService,
+        tamanho_lote: int = 100,
+        max_tentativas: int = 5,
+        espera_base: timedelta = timedelta(minutes=5),
+        reserva: timedelta = timedelta(minutes=15),
+    ) -> None:
+        self.repo = repo
+        self.service = service
+        self.tamanho_lote = tamanho_lote
+        self.max_tentativas = max_tentativas
+        self.espera_base = espera_base
+        self.reserva = reserva
+
+    def _registrar_falha(self, notificacao, agora: datetime, erro: str):
+        tentativas = notificacao.tentativas + 1
+
+        if tentativas >= self.max_tentativas:
+            self.repo.descartar(notificacao.id, erro)
+            return "descartadas"
+
+        espera = self.espera_base * 2 ** (tentativas - 1)
+        self.repo.reagendar(notificacao.id, agora + espera, erro)
+        return "reagendadas"
+
+    def execute(self, relogio: Callable[[], datetime]):
+        resumo = {"enviadas": 0, "reagendadas": 0, "descartadas": 0}
+
+        try:
+            while True:
+                # a hora é lida a cada lote: com a do início da execução, uma
+                # entrega mais longa que `reserva` reservaria lotes já
+                # vencidos e a execução seguinte os enviaria de novo
+                agora = relogio()
+                lote = self.repo.reservar_pendentes(
+                    agora, self.tamanho_lote, agora + self.reserva
+                )
+                if not lote:
+                    break
+
+                emails = [
+                    Email(
+                        n.mensagem,
+                        [n.destinatario],
+                        assunto=n.assunto,
+                        mensagem_html=n.mensagem_html,
+                    )
+                    for n in lote
+                ]
+
+                try:
+                    retornos = self.service.enviar_emails(emails)
+                    erro = "E-mail não aceito pelo servidor."
+                except Exception as e:
+                    retornos = [0] * len(lote)
+                    erro = str(e)
+
+                enviadas = [n.id for n, enviado in zip(lote, retornos) if enviado]
+                self.repo.marcar_enviadas(enviadas, agora)
+                resumo["enviadas"] += len(enviadas)
+
+                for notificacao, enviado in zip(lote, retornos):
+                    if not enviado:
+                        resumo[self._registrar_falha(notificacao, agora, erro)] += 1
+        except Exception as e:
+            return ResultError(f"Erro ao entregar notificações: {e}")
+
+        if resumo["enviadas"] == 0 and (resumo["reagendadas"] or resumo["descartadas"]):
+            return ResultError(f"Erro ao notificar: Nenhum e-mail enviado: {resumo}")
+
+        return ResultSuccess(resumo)
@@ -15,16 +15,46 @@ class ListarOcorrenciasUsecase:
     def pode_listar(self):
         return self.policy.pode_listar()
 
-    def execute(self, filtro: Optional[OcorrenciaFiltro] = None):
+    def execute(
+        self,
+        filtro: Optional[OcorrenciaFiltro] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+    ):
         if not self.policy.pode_listar():
             return ResultError("Sem permissão para listar ocorrências")
 
         try:
-            ocorrencias = (
-                self.repo.listar_ocorrencias()
-                if not filtro
-                else self.repo.listar(**filtro)
-            )
+            if limite is not None:
+                ocorrencias = self.repo.listar_pagina(offset, limite, **(filtro or {}))
+            elif not filtro:
+                ocorrencias = self.repo.listar_ocorrencias()
+            else:
+                ocorrencias = self.repo.listar(**filtro)
+            return ResultSuccess(ocorrencias)
+        except Exception as e:
+            return ResultError(f"Erro ao listar ocorrências: {str(e)}")
+
+
+class ListarOcorrenciasPorCursorUsecase:
+    def __init__(self, repo: OcorrenciaRepository, policy: OcorrenciaPolicy):
+        self.repo = repo
+        self.policy = policy
+
+    def pode_listar(self):
+        return self.policy.pode_listar()
+
+    def execute(
+        self,
+        filtro: Optional[OcorrenciaFiltro] = None,
+        cursor: Optional[str] = None,
+        limite: int = 10,
+    ):
+        if not self.policy.pode_listar():
+            return ResultError("Sem permissão para listar ocorrências")
+
+        try:
+            ocorrencias = self.repo.listar_por_cursor(cursor, limite, **(filtro or {}))
             return ResultSuccess(ocorrencias)
         except Exception as e:
             return ResultError(f"Erro ao listar ocorrências: {str(e)}")
@@ -38,12 +68,15 @@ class ListarOcorrenciasBemUsecase:
     def pode_listar(self):
         return self.policy.pode_listar()
 
-    def execute(self, id: int):
+    def execute(self, id: int, offset: int = 0, limite: Optional[int] = None):
         if not self.policy.pode_listar():
             return ResultError("Sem permissão para listar ocorrências")
 
         try:
-            ocorrencias = self.repo.listar_ocorrencias_do_bem(id)
+            if limite is not None:
+                ocorrencias = self.repo.listar_pagina(offset, limite, bem_id=id)
+            else:
+                ocorrencias = self.repo.listar_ocorrencias_do_bem(id)
             return ResultSuccess(ocorrencias)
         except Exception as e:
             return ResultError(f"Erro ao listar ocorrências: {str(e)}")
@@ -57,12 +90,15 @@ class ListarOcorrenciasAlunoUsecase:
     def pode_listar(self):
         return self.policy.pode_listar()
 
-    def execute(self, id: int):
+    def execute(self, id: int, offset: int = 0, limite: Optional[int] = None):
         if not self.policy.pode_listar():
             return ResultError("Sem permissão para listar ocorrências")
 
         try:
-            ocorrencias = self.repo.listar_ocorrencias_do_aluno(id)
+            if limite is not None:
+                ocorrencias = self.repo.listar_pagina(offset, limite, aluno_id=id)
+            else:
+                ocorrencias = self.repo.listar_ocorrencias_do_aluno(id)
             return ResultSuccess(ocorrencias)
         except Exception as e:
             return ResultError(f"Erro ao listar ocorrências: {str(e)}")
@@ -76,12 +112,15 @@ class ListarOcorrenciasEmprestimoUsecase:
     def pode_listar(self):
         return self.policy.pode_listar()
 
-    def execute(self, id: int):
+    def execute(self, id: int, offset: int = 0, limite: Optional[int] = None):
         if not self.policy.pode_listar():
             return ResultError("Sem permissão para listar ocorrências")
 
         try:
-            ocorrencias = self.repo.listar_ocorrencias_do_emprestimo(id)
+            if limite is not None:
+                ocorrencias = self.repo.listar_pagina(offset, limite, emprestimo_id=id)
+            else:
+                ocorrencias = self.repo.listar_ocorrencias_do_emprestimo(id)
             return ResultSuccess(ocorrencias)
         except Exception as e:
             return ResultError(f"Erro ao listar ocorrências: {str(e)}")
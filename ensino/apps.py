@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EnsinoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ensino'
+
+    def ready(self):
+        # conecta os signals que mantêm o índice de busca
+        import ensino.infrastructure.search  # noqa: F401
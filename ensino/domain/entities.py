@@ -1,18 +1,18 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional
 from datetime import datetime
 
 from core.domain.entities import TimeStampableEntity
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class CampusEntity(TimeStampableEntity):
     sigla: str
     nome: str
     id: int = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class CursoEntity(TimeStampableEntity):
     sigla: str
     nome: str
@@ -24,7 +24,7 @@ class CursoEntity(TimeStampableEntity):
         return f"{self.nome} ({self.campus_sigla})"
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class FormaSelecaoEntity(TimeStampableEntity):
     descricao: str
     periodo_inicio: datetime
@@ -32,7 +32,7 @@ class FormaSelecaoEntity(TimeStampableEntity):
     id: Optional[int] = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class AlunoEntity(TimeStampableEntity):
     nome: str
     nome_responsavel: Optional[str] = None
@@ -47,12 +47,8 @@ class AlunoEntity(TimeStampableEntity):
     forma_selecao_descricao: Optional[str] = None
     id: Optional[int] = None
 
-    def to_dict(self, exclude: list[str] = None):
-        if exclude is not None:
-            exclude.append("curso_nome")
-            exclude.append("campus_sigla")
-            exclude.append("forma_selecao_descricao")
-        else:
-            exclude = ["curso_nome", "forma_selecao_descricao", "campus_sigla"]
-
-        return super().to_dict(exclude)
+    campos_derivados: ClassVar[tuple[str, ...]] = (
+        "curso_nome",
+        "campus_sigla",
+        "forma_selecao_descricao",
+    )
@@ -1,11 +1,17 @@
+from django.db.models import QuerySet
 from django_filters.filters import CharFilter
 from django_filters.filterset import FilterSet
 
+from core.infrastructure.search import buscar
+from ensino.infrastructure.search import TIPO_ALUNO
 from ensino.models import Aluno
 
 
 class AlunoFilterSet(FilterSet):
-    nome = CharFilter(lookup_expr="icontains")
+    nome = CharFilter(method="filtrar_nome")
+
+    def filtrar_nome(self, queryset: QuerySet[Aluno], name, value):
+        return queryset.filter(id__in=buscar(TIPO_ALUNO, value))
 
     class Meta:
         model = Aluno
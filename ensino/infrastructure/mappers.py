@@ -19,6 +19,8 @@ class CampusMapper:
 
 
 class CursoMapper:
+    relacionamentos = ("campus",)
+
     @staticmethod
     def from_model(instance: Curso):
         model_dict = model_to_dict(instance)
@@ -42,6 +44,25 @@ class FormaSelecaoMapper:
 
 
 class AlunoMapper:
+    relacionamentos = ("curso__campus", "forma_selecao")
+    projecao = {
+        "id": "id",
+        "criado_por": "criado_por_id",
+        "alterado_por": "alterado_por_id",
+        "removido_em": "removido_em",
+        "nome": "nome",
+        "nome_responsavel": "nome_responsavel",
+        "cpf": "cpf",
+        "email": "email",
+        "matricula": "matricula",
+        "telefone": "telefone",
+        "forma_selecao_id": "forma_selecao_id",
+        "curso_id": "curso_id",
+        "curso_nome": "curso__nome",
+        "campus_sigla": "curso__campus__sigla",
+        "forma_selecao_descricao": "forma_selecao__descricao",
+    }
+
     @staticmethod
     def from_model(model: Aluno):
         model_dict = model_to_dict(model)
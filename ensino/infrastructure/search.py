@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.infrastructure.search import desindexar, indexar, indexar_em_lote
+from ensino.models import Aluno
+
+TIPO_ALUNO = "aluno"
+
+
+def indexar_aluno(aluno: Aluno) -> None:
+    indexar(TIPO_ALUNO, aluno.pk, aluno.nome, aluno.matricula)
+
+
+def reindexar_alunos() -> None:
+    indexar_em_lote(
+        TIPO_ALUNO,
+        (
+            (id, partes)
+            for id, *partes in Aluno.all_objects.values_list(
+                "id", "nome", "matricula"
+            ).iterator()
+        ),
+    )
+
+
+@receiver(post_save, sender=Aluno)
+def _aluno_salvo(sender, instance: Aluno, **kwargs):
+    indexar_aluno(instance)
+
+
+@receiver(post_delete, sender=Aluno)
+def _aluno_removido(sender, instance: Aluno, **kwargs):
+    desindexar(TIPO_ALUNO, instance.pk)
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+from core.infrastructure.search import montar_texto
+
+
+def indexar_alunos(apps, schema_editor):
+    Aluno = apps.get_model("ensino", "Aluno")
+    IndiceBusca = apps.get_model("core", "IndiceBusca")
+
+    IndiceBusca.objects.bulk_create(
+        (
+            IndiceBusca(tipo="aluno", objeto_id=id, texto=montar_texto(nome, matricula))
+            for id, nome, matricula in Aluno.objects.values_list(
+                "id", "nome", "matricula"
+            ).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+def desindexar_alunos(apps, schema_editor):
+    apps.get_model("core", "IndiceBusca").objects.filter(tipo="aluno").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+        ("ensino", "0005_aluno"),
+    ]
+
+    operations = [
+        migrations.RunPython(indexar_alunos, desindexar_alunos),
+    ]
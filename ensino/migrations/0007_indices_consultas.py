@@ -0,0 +1,31 @@
+# Generated by Django 6.1.2 on 2026-10-18 17:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ensino", "0006_indexar_busca_alunos"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="aluno",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=["matricula"],
+                name="aluno_matricula_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="aluno",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=["cpf"],
+                name="aluno_cpf_idx",
+            ),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 
-from core.models import Timestampable
+from core.models import NAO_REMOVIDO, Timestampable
 
 
 # Create your models here.
@@ -53,5 +53,15 @@ class Aluno(Timestampable, models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["matricula"],
+                condition=NAO_REMOVIDO,
+                name="aluno_matricula_idx",
+            ),
+            models.Index(fields=["cpf"], condition=NAO_REMOVIDO, name="aluno_cpf_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.nome} ({self.matricula})"
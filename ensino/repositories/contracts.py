@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 
-from typing import Any, Optional, Unpack
+from typing import Any, Iterable, Optional, Unpack
 
 from ensino.domain.entities import (
     CampusEntity,
@@ -94,6 +94,10 @@ class AlunoRepository(ABC):
     def buscar(self, **filtros: Unpack[AlunoFiltro]) -> Optional[AlunoEntity]:
         pass
 
+    @abstractmethod
+    def buscar_emails(self, ids: Iterable[int]) -> dict[int, str]:
+        pass
+
     @abstractmethod
     def cadastrar_aluno(self, aluno: AlunoEntity, user: Any):
         pass
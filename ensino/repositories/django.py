@@ -1,6 +1,8 @@
-from typing import Optional, Unpack
+from typing import Iterable, Optional, Unpack
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from django.utils import timezone
+from core.repositories.django import com_relacionamentos, projetar
 from ensino.infrastructure.mappers import (
     AlunoMapper,
     CampusMapper,
@@ -9,6 +11,7 @@ from ensino.infrastructure.mappers import (
 )
 from ensino.models import Aluno, Campus, Curso, FormaSelecao
 from ensino.infrastructure.filtersets import AlunoFilterSet
+from ensino.infrastructure.search import indexar_aluno
 from ensino.repositories.contracts import (
     AlunoRepository,
     CampusRepository,
@@ -75,15 +78,20 @@ class DjangoCampusRepository(CampusRepository):
 
 
 class DjangoCursoRepository(CursoRepository):
+    def _objetos(self) -> QuerySet[Curso]:
+        return com_relacionamentos(Curso.objects, CursoMapper)
+
     def listar_cursos(self):
         return [
             CursoMapper.from_model(curso)
-            for curso in Curso.objects.filter(removido_em__isnull=True).order_by("nome")
+            for curso in self._objetos()
+            .filter(removido_em__isnull=True)
+            .order_by("nome")
         ]
 
     def buscar_por_id(self, id: int):
         try:
-            curso = Curso.objects.get(pk=id, removido_em__isnull=True)
+            curso = self._objetos().get(pk=id, removido_em__isnull=True)
         except Curso.DoesNotExist as e:
             e.add_note(f"Curso com id '{id}' não encontrado.")
             raise e
@@ -107,11 +115,11 @@ class DjangoCursoRepository(CursoRepository):
             e.add_note(f"Curso com id '{curso.id}' não encontrado.")
             raise e
 
-        return CursoMapper.from_model(Curso.objects.get(pk=curso.id))
+        return CursoMapper.from_model(self._objetos().get(pk=curso.id))
 
     def remover_curso(self, id: int, user: User):
         try:
-            curso = Curso.objects.get(pk=id)
+            curso = self._objetos().get(pk=id)
         except Curso.DoesNotExist as e:
             e.add_note(f"Curso com id '{id}' não encontrado.")
             raise e
@@ -176,20 +184,25 @@ class DjangoFormaSelecaoRepository(FormaSelecaoRepository):
 
 
 class DjangoAlunoRepository(AlunoRepository):
+    def _objetos(self) -> QuerySet[Aluno]:
+        return com_relacionamentos(Aluno.objects, AlunoMapper)
+
     def listar(self, **filtros: Unpack[AlunoFiltro]):
-        lista_alunos = AlunoFilterSet(filtros, Aluno.objects.all()).qs
-        return [AlunoMapper.from_model(aluno) for aluno in lista_alunos]
+        lista_alunos = AlunoFilterSet(filtros, self._objetos()).qs
+        return projetar(lista_alunos, AlunoMapper)
 
     def listar_alunos(self):
-        lista_alunos = Aluno.objects.filter(removido_em__isnull=True).order_by(
-            "curso__nome", "nome"
+        lista_alunos = (
+            self._objetos()
+            .filter(removido_em__isnull=True)
+            .order_by("curso__nome", "nome")
         )
 
-        return [AlunoMapper.from_model(aluno) for aluno in lista_alunos]
+        return projetar(lista_alunos, AlunoMapper)
 
     def buscar_por_id(self, id: int):
         try:
-            aluno = Aluno.objects.get(id=id)
+            aluno = self._objetos().get(id=id)
         except Aluno.DoesNotExist as e:
             e.add_nome(f"Aluno com o id '{id} não encontrado.'")
             raise e
@@ -197,9 +210,12 @@ class DjangoAlunoRepository(AlunoRepository):
         return AlunoMapper.from_model(aluno)
 
     def buscar(self, **filtros: Unpack[AlunoFiltro]) -> Optional[AlunoEntity]:
-        lista_alunos = Aluno.objects.filter(**filtros).order_by("curso__nome", "nome")
+        lista_alunos = self._objetos().filter(**filtros).order_by("curso__nome", "nome")
         return [AlunoMapper.from_model(aluno) for aluno in lista_alunos]
 
+    def buscar_emails(self, ids: Iterable[int]) -> dict[int, str]:
+        return dict(Aluno.objects.filter(id__in=ids).values_list("id", "email"))
+
     def cadastrar_aluno(self, aluno: AlunoEntity, user: User):
         return AlunoMapper.from_model(
             Aluno.objects.create(
@@ -214,17 +230,23 @@ class DjangoAlunoRepository(AlunoRepository):
         try:
             Aluno.objects.filter(pk=aluno.id).update(
                 **aluno.to_dict(["timestamps", "id"]),
+                # update() não aplica o auto_now
+                alterado_em=timezone.now(),
                 alterado_por=user,
             )
         except Aluno.DoesNotExist as e:
             e.add_note(f"Aluno com id '{aluno.id}' não encontrado.")
             raise e
 
-        return AlunoMapper.from_model(Aluno.objects.get(pk=aluno.id))
+        # update() não dispara post_save, então o índice de busca é atualizado aqui.
+        model = self._objetos().get(pk=aluno.id)
+        indexar_aluno(model)
+
+        return AlunoMapper.from_model(model)
 
     def remover_aluno(self, id: int, user: User):
         try:
-            aluno = Aluno.objects.get(pk=id)
+            aluno = self._objetos().get(pk=id)
         except Aluno.DoesNotExist as e:
             e.add_nome(f"Aluno com o id '{id} não encontrado.'")
             raise e
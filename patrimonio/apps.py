@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PatrimonioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'patrimonio'
+
+    def ready(self):
+        # conecta os signals que mantêm o índice de busca
+        import patrimonio.infrastructure.search  # noqa: F401
@@ -1,37 +1,37 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional
 
 from core.domain.entities import TimeStampableEntity
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class TipoBemEntity(TimeStampableEntity):
     descricao: str
     id: int = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class EstadoConservacaoEntity(TimeStampableEntity):
     descricao: str
     nivel: int
     id: int = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class GrauFragilidadeEntity(TimeStampableEntity):
     descricao: str
     nivel: int
     id: int = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class MarcaModeloEntity(TimeStampableEntity):
     marca: str
     modelo: str
     id: int = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class BemEntity(TimeStampableEntity):
     descricao: str
     patrimonio: str
@@ -43,11 +43,7 @@ class BemEntity(TimeStampableEntity):
     estado_conservacao_descricao: Optional[str] = None
     tipo_descricao: Optional[str] = None
 
-    def to_dict(self, exclude: list[str] = None):
-        if exclude is not None:
-            exclude.append("estado_conservacao_descricao")
-            exclude.append("tipo_descricao")
-        else:
-            exclude = ["estado_conservacao_descricao", "tipo_descricao"]
-
-        return super().to_dict(exclude)
+    campos_derivados: ClassVar[tuple[str, ...]] = (
+        "estado_conservacao_descricao",
+        "tipo_descricao",
+    )
@@ -1,8 +1,9 @@
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
 from django_filters.filters import BooleanFilter, CharFilter
 from django_filters.filterset import FilterSet
 
-from emprestimo.domain.types import EmprestimoEstadoEnum
+from core.infrastructure.search import buscar
+from patrimonio.infrastructure.search import TIPO_BEM
 from patrimonio.models import Bem
 
 
@@ -11,20 +12,14 @@ class BemFilterSet(FilterSet):
     eh_disponivel = CharFilter(method="filtrar_disponivel")
 
     def filtrar_texto(self, queryset: QuerySet[Bem], name, value):
-        return queryset.filter(
-            Q(descricao__icontains=value)
-            | Q(patrimonio__icontains=value)
-            | Q(tipo__descricao__icontains=value)
-            | Q(marca_modelo__marca__icontains=value)
-            | Q(marca_modelo__modelo__icontains=value)
-        )
+        return queryset.filter(id__in=buscar(TIPO_BEM, value))
 
     def filtrar_disponivel(self, queryset: QuerySet[Bem], name, value):
         if value == "s":
-            return queryset.exclude(emprestimo__estado=EmprestimoEstadoEnum.ATIVO)
+            return queryset.filter(disponivel=True)
 
         elif value == "n":
-            return queryset.filter(emprestimo__estado=EmprestimoEstadoEnum.ATIVO)
+            return queryset.filter(disponivel=False)
 
         return queryset
 
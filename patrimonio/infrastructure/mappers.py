@@ -56,6 +56,22 @@ class MarcaModeloMapper:
 
 
 class BemMapper:
+    relacionamentos = ("tipo", "estado_conservacao")
+    projecao = {
+        "id": "id",
+        "criado_por": "criado_por_id",
+        "alterado_por": "alterado_por_id",
+        "removido_em": "removido_em",
+        "descricao": "descricao",
+        "patrimonio": "patrimonio",
+        "tipo_id": "tipo_id",
+        "grau_fragilidade_id": "grau_fragilidade_id",
+        "estado_conservacao_id": "estado_conservacao_id",
+        "marca_modelo_id": "marca_modelo_id",
+        "estado_conservacao_descricao": "estado_conservacao__descricao",
+        "tipo_descricao": "tipo__descricao",
+    }
+
     @staticmethod
     def from_model(model: Bem):
         model_dict = model_to_dict(
@@ -0,0 +1,73 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.infrastructure.search import desindexar, indexar, indexar_em_lote
+from patrimonio.models import Bem, MarcaModelo, TipoBem
+
+TIPO_BEM = "bem"
+
+_CAMPOS_TEXTO_BEM = (
+    "descricao",
+    "patrimonio",
+    "tipo__descricao",
+    "marca_modelo__marca",
+    "marca_modelo__modelo",
+)
+
+
+def indexar_bem(bem: Bem) -> None:
+    tipo = TipoBem.all_objects.filter(pk=bem.tipo_id).values_list(
+        "descricao", flat=True
+    )
+    marca_modelo = MarcaModelo.all_objects.filter(pk=bem.marca_modelo_id).values_list(
+        "marca", "modelo"
+    )
+
+    indexar(
+        TIPO_BEM,
+        bem.pk,
+        bem.descricao,
+        bem.patrimonio,
+        tipo.first(),
+        *(marca_modelo.first() or ()),
+    )
+
+
+def reindexar_bens(**filtros) -> None:
+    """
+    Reindexa todos os bens, ou apenas os que atendem a `filtros` (usado quando
+    o tipo ou a marca/modelo de vários bens muda de uma vez).
+    """
+    linhas = Bem.all_objects.filter(**filtros).values_list("id", *_CAMPOS_TEXTO_BEM)
+
+    if not filtros:
+        indexar_em_lote(
+            TIPO_BEM,
+            ((id, partes) for id, *partes in linhas.iterator()),
+        )
+        return
+
+    for id, *partes in linhas.iterator():
+        indexar(TIPO_BEM, id, *partes)
+
+
+@receiver(post_save, sender=Bem)
+def _bem_salvo(sender, instance: Bem, **kwargs):
+    indexar_bem(instance)
+
+
+@receiver(post_delete, sender=Bem)
+def _bem_removido(sender, instance: Bem, **kwargs):
+    desindexar(TIPO_BEM, instance.pk)
+
+
+@receiver(post_save, sender=TipoBem)
+def _tipo_bem_salvo(sender, instance: TipoBem, created: bool, **kwargs):
+    if not created:
+        reindexar_bens(tipo_id=instance.pk)
+
+
+@receiver(post_save, sender=MarcaModelo)
+def _marca_modelo_salva(sender, instance: MarcaModelo, created: bool, **kwargs):
+    if not created:
+        reindexar_bens(marca_modelo_id=instance.pk)
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+from core.infrastructure.search import montar_texto
+
+
+def indexar_bens(apps, schema_editor):
+    Bem = apps.get_model("patrimonio", "Bem")
+    IndiceBusca = apps.get_model("core", "IndiceBusca")
+
+    linhas = Bem.objects.values_list(
+        "id",
+        "descricao",
+        "patrimonio",
+        "tipo__descricao",
+        "marca_modelo__marca",
+        "marca_modelo__modelo",
+    )
+    IndiceBusca.objects.bulk_create(
+        (
+            IndiceBusca(tipo="bem", objeto_id=id, texto=montar_texto(*partes))
+            for id, *partes in linhas.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+def desindexar_bens(apps, schema_editor):
+    apps.get_model("core", "IndiceBusca").objects.filter(tipo="bem").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+        ("patrimonio", "0006_bem"),
+    ]
+
+    operations = [
+        migrations.RunPython(indexar_bens, desindexar_bens),
+    ]
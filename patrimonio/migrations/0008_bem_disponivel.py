@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+from emprestimo.domain.types import EmprestimoEstadoEnum
+
+
+def calcular_disponibilidade(apps, schema_editor):
+    Bem = apps.get_model("patrimonio", "Bem")
+    Emprestimo = apps.get_model("emprestimo", "Emprestimo")
+
+    ativos = Emprestimo.objects.filter(
+        bem_id=OuterRef("pk"),
+        estado=EmprestimoEstadoEnum.ATIVO,
+        removido_em__isnull=True,
+    )
+    Bem.objects.update(disponivel=~Exists(ativos))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emprestimo", "0007_ocorrencia_descricao"),
+        ("patrimonio", "0007_indexar_busca_bens"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bem",
+            name="disponivel",
+            field=models.BooleanField(db_index=True, default=True, editable=False),
+        ),
+        migrations.RunPython(calcular_disponibilidade, migrations.RunPython.noop),
+    ]
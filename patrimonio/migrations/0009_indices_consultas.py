@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-18 17:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patrimonio", "0008_bem_disponivel"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bem",
+            index=models.Index(
+                condition=models.Q(("removido_em__isnull", True)),
+                fields=["patrimonio"],
+                name="bem_patrimonio_idx",
+            ),
+        ),
+    ]
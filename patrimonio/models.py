@@ -1,6 +1,6 @@
 from django.db import models
 
-from core.models import Timestampable
+from core.models import NAO_REMOVIDO, Timestampable
 
 
 # Create your models here.
@@ -42,6 +42,18 @@ class Bem(Timestampable, models.Model):
     grau_fragilidade = models.ForeignKey(GrauFragilidade, on_delete=models.CASCADE)
     estado_conservacao = models.ForeignKey(EstadoConservacao, on_delete=models.CASCADE)
     marca_modelo = models.ForeignKey(MarcaModelo, on_delete=models.CASCADE)
+    # Mantido pelo repositório de empréstimos: falso enquanto houver um
+    # empréstimo ativo do bem.
+    disponivel = models.BooleanField(default=True, db_index=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["patrimonio"],
+                condition=NAO_REMOVIDO,
+                name="bem_patrimonio_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.descricao} ({self.patrimonio})"
@@ -1,8 +1,10 @@
 from typing import Unpack, override
 
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from django.utils import timezone
 
+from core.repositories.django import com_relacionamentos, projetar
 from patrimonio.domain.entities import BemEntity
 from patrimonio.domain.filters import BemFiltro
 from patrimonio.infrastructure.filtersets import BemFilterSet
@@ -13,6 +15,7 @@ from patrimonio.infrastructure.mappers import (
     MarcaModeloMapper,
     TipoBemMapper,
 )
+from patrimonio.infrastructure.search import indexar_bem
 from patrimonio.models import (
     Bem,
     EstadoConservacao,
@@ -247,23 +250,24 @@ class DjangoMarcaModeloRepository(MarcaModeloRepository):
 
 
 class DjangoBemRepository(BemRepository):
+    def _objetos(self) -> QuerySet[Bem]:
+        return com_relacionamentos(Bem.objects, BemMapper)
+
     def listar(self, **filtro: Unpack[BemFiltro]):
-        lista_bens = BemFilterSet(filtro, Bem.objects.all()).qs
-        return [BemMapper.from_model(b) for b in lista_bens]
+        lista_bens = BemFilterSet(filtro, self._objetos()).qs
+        return projetar(lista_bens, BemMapper)
 
     @override
     def listar_bens(self):
-        return [
-            BemMapper.from_model(model)
-            for model in Bem.objects.filter(removido_em__isnull=True).order_by(
-                "patrimonio"
-            )
-        ]
+        return projetar(
+            self._objetos().filter(removido_em__isnull=True).order_by("patrimonio"),
+            BemMapper,
+        )
 
     @override
     def buscar_por_id(self, id: int):
         try:
-            bem = Bem.objects.get(pk=id, removido_em__isnull=True)
+            bem = self._objetos().get(pk=id, removido_em__isnull=True)
         except Bem.DoesNotExist as e:
             e.add_note(f"Bem com id {id} não encontrado.")
             raise e
@@ -273,7 +277,7 @@ class DjangoBemRepository(BemRepository):
     @override
     def buscar_por_patrimonio(self, patrimonio: str):
         try:
-            bem = Bem.objects.get(patrimonio=patrimonio, removido_em__isnull=True)
+            bem = self._objetos().get(patrimonio=patrimonio, removido_em__isnull=True)
         except Bem.DoesNotExist as e:
             e.add_note(f"Bem com patrimonio {patrimonio} não encontrado.")
             raise e
@@ -291,7 +295,10 @@ class DjangoBemRepository(BemRepository):
     def editar_bem(self, entity: BemEntity, user: User):
         try:
             Bem.objects.filter(pk=entity.id).update(
-                **entity.to_dict(["timestamps", "id"]), alterado_por=user
+                **entity.to_dict(["timestamps", "id"]),
+                # update() não aplica o auto_now
+                alterado_em=timezone.now(),
+                alterado_por=user,
             )
 
         except Bem.DoesNotExist as e:
@@ -300,12 +307,16 @@ class DjangoBemRepository(BemRepository):
 
         # bem.alterado_por = user
         # bem.save()
-        bem = Bem.objects.get(pk=entity.id)
+        bem = self._objetos().get(pk=entity.id)
+
+        # update() não dispara post_save, então o índice de busca é atualizado aqui.
+        indexar_bem(bem)
+
         return BemMapper.from_model(bem)
 
     def remover_bem(self, id: int, user: User):
         try:
-            bem = Bem.objects.get(pk=id)
+            bem = self._objetos().get(pk=id)
         except Bem.DoesNotExist as e:
             e.add_note(f"Bem com id {id} não encontrado.")
             raise e
@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
-from os import getenv
+from os import getenv, process_cpu_count
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "ensino.apps.EnsinoConfig",
     "emprestimo.apps.EmprestimoConfig",
     "core.apps.CoreConfig",
+    "ativos.apps.AtivosConfig",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -172,11 +173,64 @@ EMAIL_HOST_PASSWORD = getenv("EMAIL_HOST_PASSWORD")
 EMAIL_USE_TLS = getenv("EMAIL_USE_TLS", True)
 DEFAULT_FROM_EMAIL = getenv("DEFAULT_FROM_EMAIL", "sigemp@teste.com")
 EMAIL_RECIPIENT_DEBUG = getenv("EMAIL_RECIPIENT_DEBUG", "sigemp@teste.com")
+# envio concorrente: conexões SMTP simultâneas e limite de e-mails por segundo
+# (0 = sem limite); EMAIL_RAJADA é quantos podem sair de uma vez sem espera
+EMAIL_CONEXOES = int(getenv("EMAIL_CONEXOES", 4))
+EMAIL_TAXA_MAXIMA = float(getenv("EMAIL_TAXA_MAXIMA", 0))
+EMAIL_RAJADA = int(getenv("EMAIL_RAJADA", 1))
+# opcional: um único lembrete por aluno listando todos os bens que vencem no
+# dia. Muda o assunto, o corpo e a chave da fila (aluno em vez de
+# empréstimo); enquanto a constraint emprestimo_ativo_unico_por_aluno valer,
+# cada resumo terá um único empréstimo.
+EMAIL_RESUMO_POR_ALUNO = getenv("EMAIL_RESUMO_POR_ALUNO", "0") == "1"
+# etapas dos lembretes de devolução: dias antes do prazo e, depois dele, a
+# cada quantos dias o atraso é cobrado (0 = não cobra)
+LEMBRETES_DIAS_ANTES = tuple(
+    int(dias) for dias in getenv("LEMBRETES_DIAS_ANTES", "7,3,1").split(",")
+)
+LEMBRETES_ATRASO_A_CADA = int(getenv("LEMBRETES_ATRASO_A_CADA", 3)) or None
+
+# NOTE: cache dos PDFs de termos (LRU limitado em bytes)
+TERMOS_CACHE_DIR = Path(getenv("TERMOS_CACHE_DIR", BASE_DIR / "cache" / "termos"))
+TERMOS_CACHE_TAMANHO_MAXIMO = int(getenv("TERMOS_CACHE_TAMANHO_MAXIMO", 256 * 2**20))
+# gera o termo em segundo plano ao cadastrar o empréstimo e ao devolver
+TERMOS_PRE_RENDERIZAR = getenv("TERMOS_PRE_RENDERIZAR", "1") != "0"
+TERMOS_PRE_RENDERIZACAO_THREADS = int(getenv("TERMOS_PRE_RENDERIZACAO_THREADS", 1))
+# processos que renderizam os termos em lote (0 = no próprio processo).
+# process_cpu_count conta só as CPUs da afinidade do processo e pode
+# devolver None.
+TERMOS_LOTE_PROCESSOS = int(getenv("TERMOS_LOTE_PROCESSOS", process_cpu_count() or 1))
+# no download pela web cada requisição inicia os seus processos (e cada um
+# faz django.setup()), então o padrão é bem menor que o do gerar_termos
+TERMOS_LOTE_PROCESSOS_WEB = int(
+    getenv("TERMOS_LOTE_PROCESSOS_WEB", min(2, TERMOS_LOTE_PROCESSOS))
+)
+
+# NOTE: Cache settings
+# O LocMemCache padrão é por processo: as invalidações (por exemplo
+# `invalidar_estatisticas` do painel) só limpam o cache do worker que fez a
+# escrita, e os outros mostram dados antigos por até o TIMEOUT de cada chave
+# (5 minutos no painel). Com mais de um worker, aponte CACHE_BACKEND e
+# CACHE_LOCATION para um cache compartilhado (Redis, Memcached ou
+# django.core.cache.backends.db.DatabaseCache).
+CACHES = {
+    "default": {
+        "BACKEND": getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": getenv("CACHE_LOCATION", ""),
+    }
+}
 
 # NOTE: Cron settings
 CRONJOBS = [
     (
         "0 8 * * *",
         "emprestimo.infrastructure.crons.notificar_prazo_proximo.cron_notificar_prazo_proximo",
-    )
+    ),
+    # reenvia as notificações que falharam (espera exponencial)
+    (
+        "*/15 * * * *",
+        "emprestimo.infrastructure.crons.notificar_prazo_proximo.cron_entregar_notificacoes",
+    ),
 ]
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import tempfile
 from pathlib import Path
 from os import getenv
 
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
     "ensino.apps.EnsinoConfig",
     "emprestimo.apps.EmprestimoConfig",
     "core.apps.CoreConfig",
+    "ativos.apps.AtivosConfig",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -159,3 +161,9 @@ SESSION_COOKIE_AGE = 172800
 
 # On Browser close, expire
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
+
+# PDFs de termos gerados nos testes ficam fora do projeto
+TERMOS_CACHE_DIR = Path(tempfile.gettempdir()) / "sigemp-testes" / "termos"
+# processos novos não enxergariam a transação de cada teste
+TERMOS_LOTE_PROCESSOS = 0
+TERMOS_LOTE_PROCESSOS_WEB = 0
@@ -24,6 +24,7 @@ urlpatterns = [
     path("patrimonio/", include("patrimonio.presentation.urls")),
     path("ensino/", include("ensino.presentation.urls")),
     path("emprestimo/", include("emprestimo.presentation.urls")),
+    path("ativos/", include("ativos.urls")),
     path("admin/", admin.site.urls),
     path("__reload__/", include("django_browser_reload.urls")),
     path(
@@ -0,0 +1,325 @@
+import io
+import zlib
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from ativos.fila import MAXIMO_TENTATIVAS, processar_fila
+from ativos.inventario import digest_softwares, normalizar_softwares
+from ativos.models import (
+    AlteracaoSoftware,
+    Computer,
+    Instalacao,
+    InventarioPendente,
+    Software,
+)
+from ativos.parsers import ZlibStream, _defused_parser, iter_convert, xml_convert
+from defusedxml import ElementTree
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, Client
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.conf import settings
+
+INVENTARIO = settings.BASE_DIR / "ativos" / "fixtures" / "inventory.xml"
+
+
+def ler_inventario(remover_softwares: int = 0) -> str:
+    with open(INVENTARIO, "r") as inventory_xml:
+        xml = inventory_xml.read()
+
+    # tira os primeiros <SOFTWARES> para simular pacotes desinstalados
+    for _ in range(remover_softwares):
+        inicio = xml.index("<SOFTWARES>")
+        fim = xml.index("</SOFTWARES>", inicio) + len("</SOFTWARES>")
+        xml = xml[:inicio] + xml[fim:]
+
+    return xml
+
+
+def com_data_de_instalacao(xml: str, data: str) -> str:
+    return xml.replace(
+        "<SOFTWARES>", f"<SOFTWARES>\n      <INSTALLDATE>{data}</INSTALLDATE>"
+    )
+
+
+def postar_inventario(xml: str):
+    return Client().post(
+        "/ativos/inventory/",
+        zlib.compress(bytes(xml, encoding=settings.DEFAULT_CHARSET)),
+        content_type="application/x-compress-zlib",
+    )
+
+
+def enviar_inventario(xml: str):
+    """Envia o inventário e já grava a fila, como o worker faria."""
+    response = postar_inventario(xml)
+    processar_fila()
+    return response
+
+
+class AtivosTestCase(TestCase):
+    def test_deve_cadastrar_um_ativo(self):
+        with open(INVENTARIO, "r") as inventory_xml:
+            c = Client()
+            c.post(
+                "/ativos/inventory/",
+                zlib.compress(
+                    bytes(inventory_xml.read(), encoding=settings.DEFAULT_CHARSET)
+                ),
+                content_type="application/x-compress-zlib",
+            )
+        call_command("processar_inventarios", stdout=io.StringIO())
+
+        computador = Computer.objects.get(hostname="docker-desktop")
+        self.assertTrue(computador)
+
+    def test_inventario_grava_softwares_em_lote(self):
+        xml = ler_inventario()
+        total = xml.count("<SOFTWARES>")
+
+        postar_inventario(xml)
+        with CaptureQueriesContext(connection) as consultas:
+            processar_fila()
+
+        computador = Computer.objects.get(hostname="docker-desktop")
+        self.assertEqual(computador.softwares.count(), Software.objects.count())
+        self.assertLessEqual(Software.objects.count(), total)
+        # o custo não depende do número de pacotes (savepoints à parte)
+        consultas = [c for c in consultas if "SAVEPOINT" not in c["sql"]]
+        self.assertLess(len(consultas), 15)
+
+        # o mesmo inventário de novo não cadastra nem altera nada
+        with CaptureQueriesContext(connection) as consultas:
+            enviar_inventario(xml)
+
+        self.assertEqual(computador.softwares.count(), Software.objects.count())
+        self.assertFalse(
+            [c for c in consultas if c["sql"].startswith(("INSERT", "DELETE"))]
+        )
+
+    def test_inventario_remove_softwares_desinstalados(self):
+        enviar_inventario(ler_inventario())
+        computador = Computer.objects.get(hostname="docker-desktop")
+        antes = computador.softwares.count()
+
+        enviar_inventario(ler_inventario(remover_softwares=2))
+
+        self.assertEqual(computador.softwares.count(), antes - 2)
+        # o catálogo de softwares continua com os desinstalados
+        self.assertEqual(Software.objects.count(), antes)
+
+    def test_historico_guarda_so_as_alteracoes(self):
+        xml = ler_inventario()
+        enviar_inventario(xml)
+        # o primeiro inventário é a linha de base
+        self.assertFalse(AlteracaoSoftware.objects.exists())
+
+        enviar_inventario(ler_inventario(remover_softwares=2))
+        enviar_inventario(xml)
+        enviar_inventario(xml)
+
+        removidos = AlteracaoSoftware.objects.filter(instalado=False)
+        reinstalados = AlteracaoSoftware.objects.filter(instalado=True)
+        self.assertEqual(AlteracaoSoftware.objects.count(), 4)
+        self.assertEqual(
+            set(removidos.values_list("software", flat=True)),
+            set(reinstalados.values_list("software", flat=True)),
+        )
+        self.assertLess(
+            removidos.first().registrado_em, reinstalados.first().registrado_em
+        )
+
+        alteracao = AlteracaoSoftware.objects.first()
+        alteracao.instalado = True
+        with self.assertRaises(ValueError):
+            alteracao.save()
+
+    def test_catalogo_de_softwares_compartilhado(self):
+        xml = ler_inventario()
+        enviar_inventario(xml)
+        pacotes = Software.objects.count()
+
+        # outra máquina com os mesmos pacotes, instalados em outra data
+        enviar_inventario(
+            com_data_de_instalacao(
+                xml.replace("docker-desktop", "lab-01"), "01/03/2025"
+            )
+        )
+
+        self.assertEqual(Software.objects.count(), pacotes)
+        self.assertEqual(Instalacao.objects.count(), 2 * pacotes)
+        self.assertEqual(
+            set(
+                Instalacao.objects.filter(computer__hostname="lab-01").values_list(
+                    "install_date", flat=True
+                )
+            ),
+            {date(2025, 3, 1)},
+        )
+        self.assertEqual(
+            set(
+                Instalacao.objects.filter(
+                    computer__hostname="docker-desktop"
+                ).values_list("install_date", flat=True)
+            ),
+            {None},
+        )
+
+    def test_inventario_atualiza_data_de_instalacao(self):
+        enviar_inventario(com_data_de_instalacao(ler_inventario(), "01/03/2025"))
+        enviar_inventario(com_data_de_instalacao(ler_inventario(), "02/03/2025"))
+
+        self.assertEqual(
+            set(Instalacao.objects.values_list("install_date", flat=True)),
+            {date(2025, 3, 2)},
+        )
+        self.assertEqual(Software.objects.count(), Instalacao.objects.count())
+
+    def test_inventario_repetido_so_atualiza_last_seen(self):
+        xml = ler_inventario()
+        enviar_inventario(xml)
+        computador = Computer.objects.get(hostname="docker-desktop")
+        self.assertEqual(len(computador.softwares_digest), 64)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = enviar_inventario(xml)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(consultas), 2)
+        ultimo = Computer.objects.get(pk=computador.pk).last_seen
+        self.assertGreater(ultimo, computador.last_seen)
+
+        # com a lista alterada o inventário volta a ser processado
+        enviar_inventario(ler_inventario(remover_softwares=1))
+        computador.refresh_from_db()
+        self.assertNotEqual(computador.softwares_digest, "")
+        self.assertEqual(computador.softwares.count(), Software.objects.count() - 1)
+
+    def test_inventario_fica_na_fila_ate_o_worker(self):
+        response = postar_inventario(ler_inventario())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Computer.objects.exists())
+        pendente = InventarioPendente.objects.get()
+        self.assertEqual(pendente.hostname, "docker-desktop")
+
+        saida = io.StringIO()
+        call_command("processar_inventarios", stdout=saida)
+
+        self.assertIn("1 inventários gravados", saida.getvalue())
+        self.assertFalse(InventarioPendente.objects.exists())
+        computador = Computer.objects.get(hostname="docker-desktop")
+        self.assertEqual(computador.last_seen, pendente.recebido_em)
+
+    def test_fila_grava_cada_computador_na_ordem(self):
+        postar_inventario(ler_inventario())
+        postar_inventario(ler_inventario(remover_softwares=2))
+
+        # só o mais antigo do computador entra no lote
+        self.assertEqual(processar_fila(), (1, 0))
+        self.assertEqual(InventarioPendente.objects.count(), 1)
+        self.assertEqual(processar_fila(), (1, 0))
+
+        computador = Computer.objects.get(hostname="docker-desktop")
+        self.assertEqual(computador.softwares.count(), Software.objects.count() - 2)
+
+    def test_fila_tenta_de_novo_o_que_falhou(self):
+        postar_inventario(ler_inventario())
+        postar_inventario(ler_inventario(remover_softwares=2))
+        primeiro = InventarioPendente.objects.earliest("id")
+
+        with patch("ativos.fila.registrar_inventario", side_effect=ValueError("xi")):
+            self.assertEqual(processar_fila(), (0, 1))
+
+        primeiro.refresh_from_db()
+        self.assertEqual(primeiro.tentativas, 1)
+        self.assertEqual(primeiro.erro, "ValueError: xi")
+        self.assertGreater(primeiro.processar_apos, timezone.now())
+        # o seguinte espera o que falhou
+        self.assertEqual(processar_fila(), (0, 0))
+        self.assertFalse(Computer.objects.exists())
+
+        InventarioPendente.objects.filter(pk=primeiro.pk).update(
+            processar_apos=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(processar_fila(), (1, 0))
+        self.assertEqual(processar_fila(), (1, 0))
+        self.assertFalse(InventarioPendente.objects.exists())
+
+    def test_fila_desiste_apos_o_maximo_de_tentativas(self):
+        postar_inventario(ler_inventario())
+        InventarioPendente.objects.update(tentativas=MAXIMO_TENTATIVAS - 1)
+
+        with patch("ativos.fila.registrar_inventario", side_effect=ValueError("xi")):
+            self.assertEqual(processar_fila(), (0, 1))
+
+        self.assertIsNone(InventarioPendente.objects.get().processar_apos)
+        # um inventário que desistiu não segura os próximos
+        postar_inventario(ler_inventario())
+        self.assertEqual(processar_fila(), (1, 0))
+
+    def test_digest_softwares(self):
+        vim = {"NAME": "vim", "VERSION": "9.1"}
+        git = {"NAME": "git", "VERSION": "2.47", "INSTALLDATE": "22/02/2025"}
+
+        self.assertEqual(digest_softwares([vim, git]), digest_softwares([git, vim]))
+        self.assertEqual(digest_softwares(vim), digest_softwares([vim, dict(vim)]))
+        self.assertNotEqual(
+            digest_softwares([vim, git]),
+            digest_softwares([vim, {**git, "VERSION": "2.48"}]),
+        )
+
+    def test_normalizar_softwares(self):
+        pacote = {"NAME": " vim ", "VERSION": "9.1", "INSTALLDATE": "22/02/2025"}
+
+        # um único <SOFTWARES> chega como dict; repetidos viram um só
+        self.assertEqual(len(normalizar_softwares(pacote)), 1)
+        self.assertEqual(len(normalizar_softwares([pacote, dict(pacote)])), 1)
+
+        (campos,) = normalizar_softwares(pacote).values()
+        self.assertEqual(campos["name"], "vim")
+        self.assertEqual(campos["arch"], "")
+        self.assertEqual(campos["install_date"], date(2025, 2, 22))
+
+        (campos,) = normalizar_softwares(
+            {"NAME": "vim", "INSTALLDATE": "ontem"}
+        ).values()
+        self.assertIsNone(campos["install_date"])
+
+
+class ParsersTestCase(SimpleTestCase):
+    def test_conversao_em_fluxo_igual_a_conversao_da_arvore(self):
+        xml = bytes(ler_inventario(), encoding=settings.DEFAULT_CHARSET)
+        esperado = xml_convert(ElementTree.fromstring(xml))
+
+        self.assertEqual(iter_convert(io.BytesIO(xml), _defused_parser({})), esperado)
+        self.assertEqual(
+            iter_convert(
+                ZlibStream(io.BytesIO(zlib.compress(xml))), _defused_parser({})
+            ),
+            esperado,
+        )
+        self.assertIsInstance(esperado["CONTENT"]["SOFTWARES"], list)
+        self.assertIsNone(esperado["CONTENT"]["BIOS"]["SSN"])
+
+    def test_zlib_descomprime_aos_poucos(self):
+        xml = b"<A>" + b"<B>texto</B>" * 10_000 + b"</A>"
+        stream = io.BytesIO(zlib.compress(xml))
+        fluxo = ZlibStream(stream)
+        fluxo.chunk_size = 64
+
+        partes = list(iter(lambda: fluxo.read(1024), b""))
+
+        self.assertEqual(b"".join(partes), xml)
+        self.assertLessEqual(max(map(len, partes)), 1024)
+        self.assertEqual(ZlibStream(io.BytesIO(zlib.compress(xml))).read(), xml)
+
+    def test_corpo_zlib_invalido(self):
+        response = Client().post(
+            "/ativos/inventory/",
+            b"nao e zlib",
+            content_type="application/x-compress-zlib",
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,157 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse_lazy
+from django.utils import timezone
+
+from core.infrastructure.dashboard import calcular_estatisticas, obter_estatisticas
+from emprestimo.domain.types import EmprestimoEstadoEnum
+from emprestimo.infrastructure.mappers import EmprestimoMapper
+from emprestimo.models import Emprestimo, Ocorrencia, TipoOcorrencia
+from emprestimo.repositories.django import DjangoEmprestimoRepository
+from ensino.models import Aluno, Campus, Curso, FormaSelecao
+from patrimonio.models import (
+    Bem,
+    EstadoConservacao,
+    GrauFragilidade,
+    MarcaModelo,
+    TipoBem,
+)
+
+
+@pytest.fixture(autouse=True)
+def limpar_cache():
+    # o rollback do banco entre testes não dispara signals
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def bens(db):
+    tipo = TipoBem.objects.create(descricao="Projetor")
+    grau_fragilidade = GrauFragilidade.objects.create(descricao="Médio", nivel=3)
+    estado_conservacao = EstadoConservacao.objects.create(descricao="Bom", nivel=4)
+    marca_modelo = MarcaModelo.objects.create(marca="Epson", modelo="X49")
+    return [
+        Bem.objects.create(
+            patrimonio=f"000.000.000.00{i}",
+            descricao=f"Bem {i}",
+            tipo=tipo,
+            grau_fragilidade=grau_fragilidade,
+            estado_conservacao=estado_conservacao,
+            marca_modelo=marca_modelo,
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def alunos(db):
+    campus = Campus.objects.create(sigla="PNG", nome="Paranaguá")
+    curso = Curso.objects.create(sigla="TADS", nome="TADS", campus=campus)
+    forma_selecao = FormaSelecao.objects.create(
+        descricao="Edital N°01/2020",
+        periodo_inicio=timezone.localdate(),
+        periodo_fim=timezone.localdate(),
+    )
+    return [
+        Aluno.objects.create(
+            nome=f"Aluno {i}",
+            cpf=f"0000000000{i}",
+            email=f"aluno{i}@ifpr.edu.br",
+            matricula=f"202500{i}",
+            telefone="41999990001",
+            forma_selecao=forma_selecao,
+            curso=curso,
+        )
+        for i in range(2)
+    ]
+
+
+@pytest.fixture
+def emprestimos(bens, alunos):
+    hoje = timezone.localdate()
+    ativo = Emprestimo.objects.create(
+        aluno=alunos[0],
+        bem=bens[0],
+        data_emprestimo=hoje - timedelta(days=7),
+        data_devolucao_prevista=hoje,
+        estado=EmprestimoEstadoEnum.ATIVO,
+    )
+    devolvido = Emprestimo.objects.create(
+        aluno=alunos[1],
+        bem=bens[1],
+        data_emprestimo=hoje - timedelta(days=7),
+        data_devolucao_prevista=hoje + timedelta(days=7),
+        data_devolucao=hoje,
+        estado=EmprestimoEstadoEnum.FINALIZADO,
+    )
+    Bem.objects.filter(pk=bens[0].pk).update(disponivel=False)
+    tipo = TipoOcorrencia.objects.create(descricao="Dano")
+    Ocorrencia.objects.create(data_ocorrencia=hoje, emprestimo=ativo, tipo=tipo)
+    return [ativo, devolvido]
+
+
+def test_estatisticas_painel(emprestimos):
+    estatisticas = obter_estatisticas()
+
+    assert estatisticas.emprestimos_ativos == 1
+    assert estatisticas.emprestimos_vencendo == 1
+    assert estatisticas.alunos == 2
+    assert estatisticas.novos_alunos == 2
+    assert estatisticas.bens_disponiveis == 2
+    assert estatisticas.bens_com_ocorrencias == 1
+    assert estatisticas.ocorrencias == 1
+
+
+def test_estatisticas_painel_em_uma_consulta(emprestimos, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        calcular_estatisticas()
+
+
+@pytest.mark.django_db
+def test_estatisticas_painel_sem_registros():
+    estatisticas = calcular_estatisticas()
+
+    assert estatisticas.emprestimos_ativos == 0
+    assert estatisticas.alunos == 0
+    assert estatisticas.ocorrencias == 0
+
+
+def test_estatisticas_painel_usa_cache(emprestimos, django_assert_num_queries):
+    obter_estatisticas()
+
+    with django_assert_num_queries(0):
+        obter_estatisticas()
+
+
+def test_estatisticas_painel_invalidadas_ao_salvar(emprestimos):
+    assert obter_estatisticas().emprestimos_ativos == 1
+
+    emprestimo = emprestimos[0]
+    emprestimo.estado = EmprestimoEstadoEnum.FINALIZADO
+    emprestimo.save()
+
+    assert obter_estatisticas().emprestimos_ativos == 0
+
+
+def test_estatisticas_painel_invalidadas_ao_editar_pelo_repositorio(
+    emprestimos, admin_user
+):
+    assert obter_estatisticas().emprestimos_vencendo == 1
+
+    entity = EmprestimoMapper.from_model(emprestimos[0])
+    entity.data_devolucao_prevista = timezone.localdate() + timedelta(days=1)
+    DjangoEmprestimoRepository().editar_emprestimo(entity, admin_user)
+
+    assert obter_estatisticas().emprestimos_vencendo == 0
+
+
+def test_home_exibe_estatisticas(admin_client, emprestimos):
+    response = admin_client.get(reverse_lazy("core:home"))
+
+    assert response.status_code == 200
+    assert response.context["count_emprestimos_ativos"] == 1
+    assert response.context["count_bens_disponiveis"] == 2
@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+
+from emprestimo.domain.entities import EmprestimoEntity
+from emprestimo.domain.types import EmprestimoEstadoEnum
+from ensino.domain.entities import AlunoEntity
+
+
+@pytest.fixture
+def emprestimo():
+    return EmprestimoEntity(
+        id=1,
+        data_emprestimo=date(2025, 9, 1),
+        data_devolucao_prevista=date(2025, 9, 8),
+        estado=EmprestimoEstadoEnum.ATIVO,
+        bem_id=2,
+        bem_descricao="Notebook",
+        aluno_id=3,
+        aluno_nome="João da Silva",
+        criado_por=4,
+    )
+
+
+@pytest.fixture
+def aluno():
+    return AlunoEntity(
+        id=1,
+        nome="João da Silva",
+        cpf="12345678901",
+        email="joao.silva@ifpr.edu.br",
+        matricula="2025001",
+        telefone="41999990001",
+        forma_selecao_id=1,
+        curso_id=1,
+        curso_nome="Informática",
+    )
+
+
+def test_to_dict_exclude_padrao(emprestimo):
+    dados = emprestimo.to_dict()
+
+    assert dados["aluno_id"] == 3
+    assert "aluno_nome" not in dados
+    assert "bem_descricao" not in dados
+    assert "criado_por" not in dados
+
+
+def test_to_dict_exclude_timestamps_e_campos(emprestimo):
+    dados = emprestimo.to_dict(["timestamps", "id"])
+
+    assert "id" not in dados
+    assert "criado_em" not in dados
+    assert "removido_em" not in dados
+    assert dados["bem_descricao"] == "Notebook"
+
+
+def test_to_dict_sem_exclude(emprestimo):
+    dados = emprestimo.to_dict([])
+
+    assert dados["criado_por"] == 4
+    assert dados["aluno_nome"] == "João da Silva"
+
+
+def test_to_dict_nunca_serializa_campos_derivados(aluno):
+    exclude = ["timestamps"]
+
+    assert "curso_nome" not in aluno.to_dict()
+    assert "curso_nome" not in aluno.to_dict(exclude)
+    assert exclude == ["timestamps"]
+
+
+def test_entidade_sem_dict(aluno):
+    with pytest.raises(AttributeError):
+        aluno.campo_inexistente = 1
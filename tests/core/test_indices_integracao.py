@@ -0,0 +1,128 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.repositories.pagination import PROXIMA, _codificar_cursor
+from emprestimo.domain.types import EmprestimoEstadoEnum
+from emprestimo.models import Emprestimo
+from emprestimo.repositories.django import (
+    ORDENACAO_EMPRESTIMOS,
+    DjangoEmprestimoRepository,
+    DjangoNotificacaoRepository,
+    DjangoOcorrenciaRepository,
+)
+from ensino.repositories.django import DjangoAlunoRepository
+from patrimonio.models import Bem
+from patrimonio.repositories.django import DjangoBemRepository
+
+
+def planos_de_execucao(consultar) -> str:
+    """
+    Executa `consultar` e devolve o EXPLAIN de cada SQL emitido.
+
+    As tabelas de teste são minúsculas, então no PostgreSQL o seq scan é
+    desligado para que o plano mostre os índices disponíveis.
+    """
+    with CaptureQueriesContext(connection) as consultas:
+        consultar()
+
+    explain = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+
+    planos = []
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        for consulta in consultas.captured_queries:
+            cursor.execute(explain + consulta["sql"])
+            planos.extend(str(linha) for linha in cursor.fetchall())
+
+    return "\n".join(planos)
+
+
+@pytest.mark.django_db
+def test_lembretes_de_devolucao_usam_indice():
+    plano = planos_de_execucao(
+        lambda: list(
+            DjangoEmprestimoRepository().listar_devolucoes_ate(date(2025, 9, 25))
+        )
+    )
+
+    assert "emprestimo_estado_devol_idx" in plano
+
+
+@pytest.mark.django_db
+def test_listagem_de_emprestimos_usa_indice():
+    repo = DjangoEmprestimoRepository()
+    ultimo = Emprestimo(
+        id=10,
+        data_emprestimo=date(2025, 9, 1),
+        estado=EmprestimoEstadoEnum.ATIVO,
+        data_devolucao_prevista=date(2025, 9, 25),
+    )
+    cursor = _codificar_cursor(PROXIMA, ultimo, ORDENACAO_EMPRESTIMOS)
+
+    for pagina in (None, cursor):
+        plano = planos_de_execucao(lambda: repo.listar_por_cursor(pagina, 20))
+
+        assert "emprestimo_listagem_idx" in plano
+        # o índice já entrega as linhas na ordem da listagem
+        assert "TEMP B-TREE" not in plano
+        assert "Sort" not in plano
+
+
+@pytest.mark.django_db
+def test_notificacoes_pendentes_usam_indice():
+    agora = timezone.now()
+    plano = planos_de_execucao(
+        lambda: DjangoNotificacaoRepository().reservar_pendentes(agora, 100, agora)
+    )
+
+    assert "notificacao_pendente_idx" in plano
+
+
+@pytest.mark.django_db
+def test_emprestimos_ativos_do_aluno_usam_indice():
+    plano = planos_de_execucao(
+        lambda: DjangoEmprestimoRepository().buscar_ativos_por_aluno(1)
+    )
+
+    assert (
+        "emprestimo_aluno_estado_idx" in plano
+        or "emprestimo_ativo_unico_por_aluno" in plano
+    )
+
+
+@pytest.mark.django_db
+def test_ocorrencias_do_emprestimo_usam_indice():
+    plano = planos_de_execucao(
+        lambda: DjangoOcorrenciaRepository().listar_ocorrencias_do_emprestimo(1)
+    )
+
+    assert "ocorrencia_emprestimo_data_idx" in plano
+
+
+@pytest.mark.django_db
+def test_busca_de_bem_por_patrimonio_usa_indice():
+    def consultar():
+        with pytest.raises(Bem.DoesNotExist):
+            DjangoBemRepository().buscar_por_patrimonio("000.000.000.000")
+
+    assert "bem_patrimonio_idx" in planos_de_execucao(consultar)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "filtro, indice",
+    [
+        ({"matricula": "2025001"}, "aluno_matricula_idx"),
+        ({"cpf": "12345678901"}, "aluno_cpf_idx"),
+    ],
+)
+def test_busca_de_aluno_usa_indice(filtro, indice):
+    plano = planos_de_execucao(lambda: DjangoAlunoRepository().buscar(**filtro))
+
+    assert indice in plano
@@ -0,0 +1,11 @@
+from core.infrastructure.search import montar_texto, normalizar
+
+
+def test_normalizar_remove_acentos_e_caixa():
+    assert normalizar("  Conceição  ÁVILA ") == "conceicao avila"
+    assert normalizar("Çãõ ü ñ") == "cao u n"
+    assert normalizar(None) == ""
+
+
+def test_montar_texto_ignora_partes_vazias():
+    assert montar_texto("João", None, "", "2025001") == "joao 2025001"
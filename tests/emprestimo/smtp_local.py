@@ -0,0 +1,103 @@
+"""
+Servidor SMTP mínimo, em processo, que aceita e descarta as mensagens.
+
+Substituto local de um servidor real, usado pelos testes de e-mail e pelo
+benchmark de notificações. Conta conexões e mensagens recebidas:
+
+    with ServidorSMTPLocal() as servidor:
+        settings.EMAIL_HOST, settings.EMAIL_PORT = servidor.endereco
+        ...
+        servidor.conexoes, servidor.mensagens
+"""
+
+import socket
+import socketserver
+import threading
+import time
+from typing import Optional
+
+
+class _Sessao(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        # respostas curtas: sem Nagle cada comando custaria um delayed ACK
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def responder(self, linha: str):
+        self.wfile.write(f"{linha}\r\n".encode())
+
+    def handle(self):
+        servidor: ServidorSMTPLocal = self.server.dono
+        primeira = servidor._registrar("conexoes") == 1
+        recebidas = 0
+
+        self.responder("220 localhost SMTP local")
+        while linha := self.rfile.readline():
+            comando = linha.decode(errors="replace").strip().upper()
+
+            if comando.startswith("EHLO"):
+                self.wfile.write(b"250-localhost\r\n250 8BITMIME\r\n")
+            elif comando.startswith("DATA"):
+                self.responder("354 fim com <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                if servidor.atraso:
+                    time.sleep(servidor.atraso)
+                servidor._registrar("mensagens")
+                self.responder("250 OK")
+                recebidas += 1
+                if primeira and recebidas == servidor.queda_apos:
+                    # derruba a conexão sem QUIT, como um relay que caiu
+                    return
+            elif comando.startswith("QUIT"):
+                self.responder("221 tchau")
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET, NOOP
+                self.responder("250 OK")
+
+
+class _Servidor(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ServidorSMTPLocal:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        porta: int = 0,
+        atraso: float = 0.0,
+        queda_apos: Optional[int] = None,
+    ) -> None:
+        # `atraso`: segundos até aceitar cada mensagem, simulando um relay real
+        self.atraso = atraso
+        # `queda_apos`: a primeira conexão cai depois de tantas mensagens
+        self.queda_apos = queda_apos
+        self._servidor = _Servidor((host, porta), _Sessao)
+        self._servidor.dono = self
+        self._trava = threading.Lock()
+        self.conexoes = 0
+        self.mensagens = 0
+
+    @property
+    def endereco(self) -> tuple[str, int]:
+        return self._servidor.server_address
+
+    def _registrar(self, contador: str) -> int:
+        with self._trava:
+            valor = getattr(self, contador) + 1
+            setattr(self, contador, valor)
+            return valor
+
+    def zerar(self):
+        with self._trava:
+            self.conexoes = self.mensagens = 0
+
+    def __enter__(self):
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._servidor.shutdown()
+        self._servidor.server_close()
@@ -0,0 +1,95 @@
+import os
+from unittest import mock
+
+import pytest
+
+from emprestimo.infrastructure.services import cache_pdf
+from emprestimo.infrastructure.services.cache_pdf import CachePDF, hash_template
+
+
+def test_cache_pdf_guarda_e_busca(tmp_path):
+    cache = CachePDF(tmp_path, tamanho_maximo=1024)
+    chave = CachePDF.chave(1, "2025-09-01 10:00", "abc")
+
+    assert cache.buscar(chave) is None
+
+    cache.guardar(chave, b"%PDF-1")
+
+    assert cache.buscar(chave) == b"%PDF-1"
+    assert CachePDF.chave(1, "2025-09-01 10:00", "abc") == chave
+    assert CachePDF.chave(1, "2025-09-02 10:00", "abc") != chave
+
+
+def test_cache_pdf_despeja_o_menos_usado(tmp_path):
+    cache = CachePDF(tmp_path, tamanho_maximo=25)
+
+    for i, chave in enumerate(["a", "b"]):
+        cache.guardar(chave, b"0123456789")
+        os.utime(cache._caminho(chave), (1000 + i, 1000 + i))
+
+    # ler "a" o torna o mais recente; "b" passa a ser o menos usado
+    assert cache.buscar("a")
+    cache.guardar("c", b"0123456789")
+
+    assert cache.buscar("b") is None
+    assert cache.buscar("a") and cache.buscar("c")
+
+
+@pytest.fixture
+def templates(settings, tmp_path):
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [tmp_path],
+        }
+    ]
+    hash_template.cache_clear()
+    yield tmp_path
+    hash_template.cache_clear()
+
+
+def hash_apos_reiniciar(template_path: str) -> str:
+    # o hash é calculado uma vez por processo
+    hash_template.cache_clear()
+    return hash_template(template_path)
+
+
+def test_hash_template_muda_quando_o_template_muda(templates):
+    template = templates / "termo.html"
+
+    template.write_text("<p>versão 1</p>")
+    antes = hash_template("termo.html")
+
+    template.write_text("<p>versão 2</p>")
+
+    assert hash_apos_reiniciar("termo.html") != antes
+
+
+@pytest.mark.parametrize(
+    "termo",
+    [
+        '{% include "assinatura.html" %}',
+        '{% extends "assinatura.html" %}',
+        '{% if x %}{% include "assinatura.html" with y=1 %}{% endif %}',
+    ],
+)
+def test_hash_template_inclui_os_templates_usados(templates, termo):
+    (templates / "termo.html").write_text(termo)
+    assinatura = templates / "assinatura.html"
+
+    assinatura.write_text("<p>versão 1</p>")
+    antes = hash_apos_reiniciar("termo.html")
+
+    assinatura.write_text("<p>versão 2</p>")
+
+    assert hash_apos_reiniciar("termo.html") != antes
+
+
+def test_hash_template_calculado_uma_vez_por_processo(templates):
+    (templates / "termo.html").write_text("<p>termo</p>")
+    antes = hash_template("termo.html")
+
+    with mock.patch.object(cache_pdf, "get_template") as get_template:
+        assert hash_template("termo.html") == antes
+
+    get_template.assert_not_called()
@@ -1,6 +1,10 @@
+import zipfile
 from datetime import datetime, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.urls import reverse_lazy
 from pytest_django.asserts import (
     assertContains,
@@ -9,8 +13,10 @@ from pytest_django.asserts import (
     assertTemplateUsed,
 )
 
+from emprestimo.domain.exceptions import BemComEmprestimoAtivoError
 from emprestimo.domain.types import EmprestimoEstadoEnum
 from emprestimo.infrastructure.mappers import EmprestimoMapper
+from emprestimo.infrastructure.services.termos_lote import DjangoTermosEmLoteService
 from ensino.domain.entities import (
     AlunoEntity,
     CampusEntity,
@@ -28,6 +34,12 @@ from patrimonio.models import (
 )
 from emprestimo.domain.entities import EmprestimoEntity
 from emprestimo.models import Emprestimo
+from emprestimo.repositories.django import DjangoEmprestimoRepository
+from emprestimo.infrastructure.services import django as services_django
+from emprestimo.infrastructure.services.django import (
+    TEMPLATE_TERMO_RESPONSABILIDADE,
+    DjangoWeasyPDFService,
+)
 
 
 @pytest.fixture
@@ -159,15 +171,16 @@ def bens(db, lista_grau_fragilidade, tipos_de_bem, estados_conservacao, marcas_m
 
 
 @pytest.fixture()
-def bem(db):
+def bem(db, lista_grau_fragilidade, tipos_de_bem, estados_conservacao, marcas_modelos):
+    # o termo imprime tipo, marca/modelo etc.: os registros precisam existir
     entity = BemEntity(
         id=1,
         patrimonio="000.000.000.000",
         descricao="Projetor Epson X1000",
-        tipo_id=1,
-        grau_fragilidade_id=2,
-        estado_conservacao_id=1,
-        marca_modelo_id=1,
+        tipo_id=tipos_de_bem[0].id,
+        grau_fragilidade_id=lista_grau_fragilidade[1].id,
+        estado_conservacao_id=estados_conservacao[0].id,
+        marca_modelo_id=marcas_modelos[0].id,
     )
     model, _criado = Bem.objects.get_or_create(**entity.to_dict())
     yield model
@@ -349,6 +362,7 @@ def emprestimo(db, aluno, bem):
         observacoes="Empréstimo para aula de programação",
     )
     model, _criado = Emprestimo.objects.get_or_create(**entity.to_dict())
+    Bem.objects.filter(pk=bem.id).update(disponivel=False)
     yield model
 
     model.delete()
@@ -386,6 +400,128 @@ def test_listar_emprestimos(lista_emprestimos_em_andamento, admin_client):
     assert response.status_code == 200
 
 
+@pytest.fixture
+def historico_emprestimos(db, aluno, bem):
+    hoje = datetime.now().date()
+    models = [
+        Emprestimo.objects.create(
+            aluno=aluno,
+            bem=bem,
+            data_emprestimo=hoje - timedelta(days=30 + i),
+            data_devolucao_prevista=hoje - timedelta(days=23 + i),
+            data_devolucao=hoje - timedelta(days=23 + i),
+            estado=EmprestimoEstadoEnum.FINALIZADO,
+            observacoes=f"Empréstimo histórico {i}",
+        )
+        for i in range(15)
+    ]
+
+    yield models
+
+    for model in models:
+        model.delete()
+
+
+@pytest.mark.django_db
+def test_listar_emprestimos_mapeia_apenas_pagina_visivel(
+    admin_client, historico_emprestimos
+):
+    url = reverse_lazy("emprestimo:listar_emprestimos")
+
+    with mock.patch(
+        "emprestimo.repositories.django.EmprestimoMapper.from_model",
+        wraps=EmprestimoMapper.from_model,
+    ) as from_model:
+        response = admin_client.get(url)
+
+    assert response.status_code == 200
+    assert from_model.call_count == 10
+    assert len(response.context["emprestimos"]) == 10
+    assert response.context["emprestimos"][0].id == historico_emprestimos[0].id
+
+    pagina = response.context["page_obj"]
+    assert pagina.tem_proxima
+    assert not pagina.tem_anterior
+
+    response = admin_client.get(url, {"cursor": pagina.proximo_cursor})
+
+    assert response.status_code == 200
+    assert [e.id for e in response.context["emprestimos"]] == [
+        e.id for e in historico_emprestimos[10:]
+    ]
+
+    pagina = response.context["page_obj"]
+    assert not pagina.tem_proxima
+    assert pagina.tem_anterior
+
+    response = admin_client.get(url, {"cursor": pagina.anterior_cursor})
+
+    assert [e.id for e in response.context["emprestimos"]] == [
+        e.id for e in historico_emprestimos[:10]
+    ]
+
+
+@pytest.mark.django_db
+def test_listar_emprestimos_cursor_invalido(admin_client, historico_emprestimos):
+    url = reverse_lazy("emprestimo:listar_emprestimos")
+
+    response = admin_client.get(url, {"cursor": "invalido"})
+
+    assert response.status_code == 200
+    assert len(response.context["emprestimos"]) == 0
+    assert any(
+        "Cursor de paginação inválido" in str(m) for m in response.context["messages"]
+    )
+
+
+@pytest.mark.django_db
+def test_listar_emprestimos_consultas_constantes(
+    historico_emprestimos, django_assert_num_queries
+):
+    repo = DjangoEmprestimoRepository()
+
+    with django_assert_num_queries(1):
+        emprestimos = repo.listar_emprestimos()
+
+    assert len(emprestimos) == len(historico_emprestimos)
+    assert {e.aluno_nome for e in emprestimos} == {historico_emprestimos[0].aluno.nome}
+
+    with django_assert_num_queries(1):
+        pagina = repo.listar_por_cursor(None, 10)
+
+    assert len(pagina.itens) == 10
+
+
+@pytest.mark.django_db
+def test_listar_emprestimos_projecao_equivale_ao_mapper(historico_emprestimos):
+    esperado = [
+        EmprestimoMapper.from_model(e)
+        for e in Emprestimo.objects.order_by("-data_emprestimo", "-id")
+    ]
+
+    assert DjangoEmprestimoRepository().listar_emprestimos() == esperado
+
+
+@pytest.mark.django_db
+def test_filtrar_emprestimos_por_texto(
+    admin_client, lista_emprestimos_em_andamento, lista_alunos
+):
+    repo = DjangoEmprestimoRepository()
+    aluno = lista_alunos[0]
+
+    por_nome = repo.listar(texto="joao da")
+    por_bem = repo.listar(texto="PROJETOR")
+    termo_curto = repo.listar(texto="jo")
+
+    assert [e.aluno_id for e in por_nome] == [aluno.id]
+    assert {e.bem_id for e in por_bem} == {
+        e.bem_id
+        for e in lista_emprestimos_em_andamento
+        if "Projetor" in e.bem.descricao
+    }
+    assert aluno.id in {e.aluno_id for e in termo_curto}
+
+
 @pytest.mark.django_db
 def test_nao_pode_listar_emprestimos(client, test_user, lista_emprestimos_em_andamento):
     client.force_login(test_user)
@@ -417,6 +553,9 @@ def test_cadastrar_emprestimo(admin_client, aluno, bem):
     emprestimo_cadastrado = Emprestimo.objects.filter(aluno=aluno, bem=bem)
     assert response.status_code == 200
     assert emprestimo_cadastrado.exists()
+
+    bem.refresh_from_db()
+    assert not bem.disponivel
     assertTemplateUsed(response, "emprestimo/emprestimo/emprestimo_list.html")
 
 
@@ -463,6 +602,36 @@ def test_nao_pode_cadastrar_emprestimo_quando_aluno_tem_ativo(
     )
 
 
+@pytest.mark.django_db
+def test_cadastrar_emprestimo_conflitante_vira_erro_de_dominio(
+    emprestimo, lista_alunos, admin_user
+):
+    repo = DjangoEmprestimoRepository()
+    novo = EmprestimoMapper.from_model(emprestimo)
+    novo.id = None
+    novo.aluno_id = lista_alunos[1].id
+
+    with pytest.raises(BemComEmprestimoAtivoError) as excinfo:
+        repo.cadastrar_emprestimo(novo, admin_user)
+
+    assert excinfo.value.emprestimo_id == emprestimo.id
+    assert Emprestimo.objects.filter(bem=emprestimo.bem).count() == 1
+
+
+@pytest.mark.django_db
+def test_cadastrar_emprestimo_apos_devolucao(emprestimo, admin_user):
+    repo = DjangoEmprestimoRepository()
+    repo.registrar_devolucao(EmprestimoMapper.from_model(emprestimo), admin_user)
+
+    novo = EmprestimoMapper.from_model(emprestimo)
+    novo.id = None
+    novo.estado = EmprestimoEstadoEnum.ATIVO
+    novo.data_devolucao = None
+    novo.devolucao_ciente_por_id = None
+
+    assert repo.cadastrar_emprestimo(novo, admin_user).id != emprestimo.id
+
+
 def test_visualizar_detalhes_emprestimo_ativo(admin_client, emprestimo: Emprestimo):
     url = reverse_lazy("emprestimo:visualizar_emprestimo", args=[emprestimo.id])
 
@@ -521,6 +690,7 @@ def test_registrar_devolucao_emprestimo(admin_client, emprestimo):
     emprestimo.refresh_from_db()
     assert response.status_code == 200
     assert emprestimo.data_devolucao is not None
+    assert Bem.objects.get(pk=emprestimo.bem_id).disponivel
     assertTemplateUsed(response, "emprestimo/emprestimo/emprestimo_detail.html")
 
 
@@ -564,6 +734,35 @@ def test_editar_emprestimo(admin_client, emprestimo, lista_alunos):
     assertTemplateUsed(response, "emprestimo/emprestimo/emprestimo_list.html")
 
 
+@pytest.mark.django_db
+def test_editar_emprestimo_atualiza_disponibilidade_dos_bens(
+    emprestimo,
+    bem,
+    admin_user,
+    tipos_de_bem,
+    lista_grau_fragilidade,
+    estados_conservacao,
+    marcas_modelos,
+):
+    outro_bem = Bem.objects.create(
+        patrimonio="000.000.000.001",
+        descricao="Projetor Epson X2000",
+        tipo=tipos_de_bem[0],
+        grau_fragilidade=lista_grau_fragilidade[0],
+        estado_conservacao=estados_conservacao[0],
+        marca_modelo=marcas_modelos[0],
+    )
+
+    entity = EmprestimoMapper.from_model(emprestimo)
+    entity.bem_id = outro_bem.id
+    DjangoEmprestimoRepository().editar_emprestimo(entity, admin_user)
+
+    bem.refresh_from_db()
+    outro_bem.refresh_from_db()
+    assert bem.disponivel
+    assert not outro_bem.disponivel
+
+
 @pytest.mark.django_db
 def test_nao_pode_editar_emprestimo(client, test_user, emprestimo):
     client.force_login(test_user)
@@ -593,6 +792,7 @@ def test_remover_emprestimo(admin_client, emprestimo):
     assert not Emprestimo.objects.filter(
         id=emprestimo.id, removido_em__isnull=True
     ).exists()
+    assert Bem.objects.get(pk=emprestimo.bem_id).disponivel
     assertTemplateUsed(response, "emprestimo/emprestimo/emprestimo_list.html")
 
 
@@ -617,6 +817,143 @@ def test_gerar_termo_responsabilidade_sucesso(admin_client, emprestimo):
     assert response["Content-Type"] == "application/pdf"
 
 
+@pytest.fixture
+def gerar_pdf(settings, tmp_path):
+    settings.TERMOS_CACHE_DIR = tmp_path
+    with mock.patch.object(
+        DjangoWeasyPDFService,
+        "gerar_pdf_de_template",
+        autospec=True,
+        side_effect=DjangoWeasyPDFService.gerar_pdf_de_template,
+    ) as gerar_pdf:
+        yield gerar_pdf
+
+
+@pytest.mark.django_db
+def test_gerar_termo_responsabilidade_usa_cache(
+    admin_client, admin_user, emprestimo, gerar_pdf
+):
+    url = reverse_lazy("emprestimo:gerar_termo_responsabilidade", args=[emprestimo.id])
+
+    primeira = admin_client.get(url)
+    segunda = admin_client.get(url)
+
+    assert gerar_pdf.call_count == 1
+    assert segunda["Content-Type"] == "application/pdf"
+    assert segunda.content == primeira.content
+
+    # editar o empréstimo muda a chave e o termo é gerado de novo
+    entity = DjangoEmprestimoRepository().buscar_por_id(emprestimo.id)
+    entity.observacoes = "Carregador incluso"
+    DjangoEmprestimoRepository().editar_emprestimo(entity, admin_user)
+
+    admin_client.get(url)
+    assert gerar_pdf.call_count == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "relacionado",
+    ["aluno.curso", "aluno.curso.campus", "aluno.forma_selecao", "bem.marca_modelo"],
+)
+def test_termo_em_cache_muda_com_os_registros_impressos(
+    admin_client, emprestimo, gerar_pdf, relacionado
+):
+    url = reverse_lazy("emprestimo:gerar_termo_responsabilidade", args=[emprestimo.id])
+    admin_client.get(url)
+
+    registro = emprestimo
+    for campo in relacionado.split("."):
+        registro = getattr(registro, campo)
+    registro.save()
+
+    admin_client.get(url)
+    assert gerar_pdf.call_count == 2
+
+
+@pytest.mark.django_db
+def test_termo_em_cache_monta_a_chave_em_uma_consulta(
+    emprestimo, gerar_pdf, django_assert_num_queries
+):
+    service = DjangoWeasyPDFService(None)
+    service.pdf_do_termo(emprestimo.id, TEMPLATE_TERMO_RESPONSABILIDADE)
+
+    # com o PDF em cache, só a consulta do empréstimo e seus relacionados
+    with django_assert_num_queries(1):
+        service.pdf_do_termo(emprestimo.id, TEMPLATE_TERMO_RESPONSABILIDADE)
+
+
+@pytest.fixture
+def pre_renderizar_na_hora():
+    # executa o job de pré-renderização na própria thread do teste
+    executor = mock.Mock(submit=lambda funcao, *args: funcao(*args))
+    with mock.patch.object(services_django, "_executor_termos", return_value=executor):
+        yield
+
+
+@pytest.mark.django_db
+def test_cadastrar_emprestimo_pre_renderiza_termo(
+    admin_client,
+    aluno,
+    bem,
+    gerar_pdf,
+    pre_renderizar_na_hora,
+    django_capture_on_commit_callbacks,
+):
+    data = {
+        "aluno": aluno.id,
+        "bem": bem.id,
+        "data_emprestimo": datetime.now().date(),
+        "data_devolucao_prevista": datetime.now().date() + timedelta(days=7),
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_client.post(reverse_lazy("emprestimo:criar_emprestimo"), data)
+
+    assert gerar_pdf.call_count == 1
+
+    emprestimo = Emprestimo.objects.get(aluno=aluno, bem=bem)
+    url = reverse_lazy("emprestimo:gerar_termo_responsabilidade", args=[emprestimo.id])
+    response = admin_client.get(url)
+
+    # a view serve o arquivo pré-renderizado, sem gerar o PDF de novo
+    assert response["Content-Type"] == "application/pdf"
+    assert gerar_pdf.call_count == 1
+
+
+@pytest.mark.django_db
+def test_registrar_devolucao_pre_renderiza_termo(
+    admin_client,
+    emprestimo,
+    gerar_pdf,
+    pre_renderizar_na_hora,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse_lazy("emprestimo:registrar_devolucao", args=[emprestimo.id])
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_client.post(url)
+
+    url = reverse_lazy("emprestimo:gerar_termo_devolucao", args=[emprestimo.id])
+    response = admin_client.get(url)
+
+    assert response["Content-Type"] == "application/pdf"
+    assert gerar_pdf.call_count == 1
+
+
+@pytest.mark.django_db
+def test_pre_renderizacao_desligada(
+    admin_client, emprestimo, settings, gerar_pdf, django_capture_on_commit_callbacks
+):
+    settings.TERMOS_PRE_RENDERIZAR = False
+
+    url = reverse_lazy("emprestimo:registrar_devolucao", args=[emprestimo.id])
+    with django_capture_on_commit_callbacks() as callbacks:
+        admin_client.post(url)
+
+    assert callbacks == []
+    assert gerar_pdf.call_count == 0
+
+
 @pytest.mark.django_db
 def test_gerar_termo_responsabilidade_sem_permissao(client, test_user, emprestimo):
     client.force_login(test_user)
@@ -686,3 +1023,95 @@ def test_gerar_termo_devolucao_erro_repo(admin_client, emprestimo_devolvido):
     response = admin_client.get(url)
 
     assert response.status_code == 404
+
+
+def ler_zip(conteudo: bytes) -> dict[str, bytes]:
+    with zipfile.ZipFile(BytesIO(conteudo)) as arquivo:
+        return {nome: arquivo.read(nome) for nome in arquivo.namelist()}
+
+
+@pytest.mark.django_db
+def test_gerar_termos_em_lote(admin_client, emprestimo, curso, gerar_pdf):
+    url = reverse_lazy("emprestimo:gerar_termos_em_lote")
+
+    response = admin_client.get(url, {"tipo": "responsabilidade", "curso": curso.id})
+
+    assert response["Content-Type"] == "application/zip"
+    termos = ler_zip(b"".join(response.streaming_content))
+    assert list(termos) == [f"termo-responsabilidade-{emprestimo.id}.pdf"]
+    assert termos[f"termo-responsabilidade-{emprestimo.id}.pdf"].startswith(b"%PDF")
+
+    # o lote passa pelo cache: o download individual não gera de novo
+    admin_client.get(
+        reverse_lazy("emprestimo:gerar_termo_responsabilidade", args=[emprestimo.id])
+    )
+    assert gerar_pdf.call_count == 1
+
+
+@pytest.mark.django_db
+def test_gerar_termos_em_lote_usa_processos_da_web(
+    admin_client, emprestimo, gerar_pdf, settings
+):
+    settings.TERMOS_LOTE_PROCESSOS = 8
+    url = reverse_lazy("emprestimo:gerar_termos_em_lote")
+
+    with mock.patch(
+        "emprestimo.presentation.views.DjangoTermosEmLoteService",
+        wraps=DjangoTermosEmLoteService,
+    ) as service:
+        response = admin_client.get(url, {"tipo": "responsabilidade"})
+        b"".join(response.streaming_content)
+
+    service.assert_called_once_with(settings.TERMOS_LOTE_PROCESSOS_WEB)
+
+
+@pytest.mark.django_db
+def test_gerar_termos_em_lote_sem_emprestimos(admin_client, emprestimo):
+    url = reverse_lazy("emprestimo:gerar_termos_em_lote")
+
+    # só há um empréstimo ativo, nenhum termo de devolução a gerar
+    response = admin_client.get(url, {"tipo": "devolucao"}, follow=True)
+
+    assertTemplateUsed(response, "emprestimo/emprestimo/emprestimo_list.html")
+    assertContains(response, "Nenhum empréstimo encontrado")
+
+
+@pytest.mark.django_db
+def test_gerar_termos_em_lote_registra_falhas(admin_client, emprestimo, gerar_pdf):
+    gerar_pdf.side_effect = RuntimeError("falha no WeasyPrint")
+    url = reverse_lazy("emprestimo:gerar_termos_em_lote")
+
+    response = admin_client.get(url, {"tipo": "responsabilidade"})
+
+    termos = ler_zip(b"".join(response.streaming_content))
+    assert list(termos) == ["falhas.txt"]
+    assert str(emprestimo.id) in termos["falhas.txt"].decode()
+
+
+@pytest.mark.django_db
+def test_gerar_termos_em_lote_sem_permissao(client, test_user, emprestimo):
+    client.force_login(test_user)
+    url = reverse_lazy("emprestimo:gerar_termos_em_lote")
+
+    response = client.get(url, {"tipo": "responsabilidade"})
+
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_comando_gerar_termos(admin_user, emprestimo, gerar_pdf, tmp_path):
+    saida = tmp_path / "termos.zip"
+    stdout = StringIO()
+
+    call_command(
+        "gerar_termos",
+        str(saida),
+        usuario=admin_user.username,
+        data_emprestimo_inicio=emprestimo.data_emprestimo,
+        stdout=stdout,
+    )
+
+    assert list(ler_zip(saida.read_bytes())) == [
+        f"termo-responsabilidade-{emprestimo.id}.pdf"
+    ]
+    assert "1/1 termos" in stdout.getvalue()
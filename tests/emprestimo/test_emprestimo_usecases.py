@@ -3,17 +3,23 @@ from unittest import mock
 from datetime import date
 import pytest
 
-from core.types import ResultError, ResultSuccess
+from core.types import Pagina, PaginaCursor, ResultError, ResultSuccess
 from emprestimo.domain.entities import EmprestimoEntity
-from emprestimo.domain.types import EmprestimoEstadoEnum
+from emprestimo.domain.exceptions import (
+    AlunoComEmprestimoAtivoError,
+    BemComEmprestimoAtivoError,
+)
+from emprestimo.domain.types import EmprestimoEstadoEnum, TermoTipoEnum
 from emprestimo.infrastructure.services.contracts import PDFService
 from emprestimo.usecases import (
     ListarEmprestimosUsecase,
+    ListarEmprestimosPorCursorUsecase,
     CadastrarEmprestimoUsecase,
     EditarEmprestimoUsecase,
     RemoverEmprestimoUsecase,
     GerarTermoResponsabilidadeUsecase,
     GerarTermoDevolucaoUsecase,
+    GerarTermosEmLoteUsecase,
     RegistrarDevolucaoEmprestimoUsecase,
 )
 
@@ -81,6 +87,65 @@ def test_listar_emprestimos(lista_emprestimos_em_andamento):
     assert result.value == lista_emprestimos_em_andamento
 
 
+def test_listar_pagina_emprestimos(lista_emprestimos_em_andamento):
+    repo = mock.Mock()
+    policy = mock.Mock()
+
+    pagina = Pagina(
+        itens=lista_emprestimos_em_andamento[2:4], total=4, offset=2, limite=2
+    )
+    repo.listar_pagina.return_value = pagina
+    policy.pode_listar.return_value = True
+
+    usecase = ListarEmprestimosUsecase(repo, policy)
+    result = usecase.execute({"estado": EmprestimoEstadoEnum.ATIVO}, offset=2, limite=2)
+
+    repo.listar_pagina.assert_called_with(2, 2, estado=EmprestimoEstadoEnum.ATIVO)
+    repo.listar_emprestimos.assert_not_called()
+    repo.listar.assert_not_called()
+
+    assert isinstance(result, ResultSuccess)
+    assert result.value == pagina
+    assert not result.value.tem_proxima
+
+
+def test_listar_emprestimos_por_cursor(lista_emprestimos_em_andamento):
+    repo = mock.Mock()
+    policy = mock.Mock()
+
+    pagina = PaginaCursor(
+        itens=lista_emprestimos_em_andamento[:2], limite=2, proximo_cursor="abc"
+    )
+    repo.listar_por_cursor.return_value = pagina
+    policy.pode_listar.return_value = True
+
+    usecase = ListarEmprestimosPorCursorUsecase(repo, policy)
+    result = usecase.execute({"estado": EmprestimoEstadoEnum.ATIVO}, limite=2)
+
+    repo.listar_por_cursor.assert_called_with(
+        None, 2, estado=EmprestimoEstadoEnum.ATIVO
+    )
+
+    assert isinstance(result, ResultSuccess)
+    assert result.value == pagina
+    assert result.value.tem_proxima
+    assert not result.value.tem_anterior
+
+
+def test_listar_emprestimos_por_cursor_invalido():
+    repo = mock.Mock()
+    policy = mock.Mock()
+
+    repo.listar_por_cursor.side_effect = ValueError("Cursor de paginação inválido")
+    policy.pode_listar.return_value = True
+
+    usecase = ListarEmprestimosPorCursorUsecase(repo, policy)
+    result = usecase.execute(cursor="xyz")
+
+    assert isinstance(result, ResultError)
+    assert "Cursor de paginação inválido" in result.mensagem
+
+
 def test_nao_pode_listar_emprestimos_usecase(lista_emprestimos_em_andamento):
     repo = mock.Mock()
     policy = mock.Mock()
@@ -99,22 +164,40 @@ def test_cadastrar_emprestimo_usecase(emprestimo):
     user = mock.Mock()
     policy.user = user
 
-    repo.buscar_ativo_por_bem.return_value = None
-    repo.buscar_ativos_por_aluno.return_value = []
     repo.cadastrar_emprestimo.return_value = emprestimo
     policy.pode_criar.return_value = True
 
     usecase = CadastrarEmprestimoUsecase(repo, policy)
     result = usecase.execute(emprestimo)
 
-    repo.buscar_ativo_por_bem.assert_called_with(emprestimo.bem_id)
-    repo.buscar_ativos_por_aluno.assert_called_with(emprestimo.aluno_id)
+    repo.buscar_ativo_por_bem.assert_not_called()
+    repo.buscar_ativos_por_aluno.assert_not_called()
     repo.cadastrar_emprestimo.assert_called_with(emprestimo, user)
 
     assert isinstance(result, ResultSuccess)
     assert result.value == emprestimo
 
 
+def test_cadastrar_emprestimo_agenda_termo_de_responsabilidade(emprestimo):
+    repo = mock.Mock()
+    policy = mock.Mock()
+    termos = mock.Mock()
+    policy.pode_criar.return_value = True
+    repo.cadastrar_emprestimo.return_value = emprestimo
+
+    usecase = CadastrarEmprestimoUsecase(repo, policy, termos)
+    usecase.execute(emprestimo)
+
+    termos.agendar_termo_responsabilidade.assert_called_once_with(emprestimo)
+
+    # sem cadastro, nada a pré-renderizar
+    termos.reset_mock()
+    repo.cadastrar_emprestimo.side_effect = BemComEmprestimoAtivoError(3)
+    usecase.execute(emprestimo)
+
+    termos.agendar_termo_responsabilidade.assert_not_called()
+
+
 def test_nao_pode_cadastrar_emprestimo_usecase(emprestimo):
     repo = mock.Mock()
     policy = mock.Mock()
@@ -143,17 +226,28 @@ def test_nao_pode_cadastrar_emprestimo_quando_aluno_tem_ativo(emprestimo):
     policy.user = user
     policy.pode_criar.return_value = True
 
-    repo.buscar_ativo_por_bem.return_value = None
-    repo.buscar_ativos_por_aluno.return_value = [
-        mock.Mock(estado=EmprestimoEstadoEnum.ATIVO)
-    ]
+    repo.cadastrar_emprestimo.side_effect = AlunoComEmprestimoAtivoError(2)
     usecase = CadastrarEmprestimoUsecase(repo, policy)
 
     result = usecase.execute(emprestimo)
 
-    repo.buscar_ativo_por_bem.assert_called_with(emprestimo.bem_id)
-    repo.buscar_ativos_por_aluno.assert_called_with(emprestimo.aluno_id)
+    repo.cadastrar_emprestimo.assert_called_with(emprestimo, user)
     assert isinstance(result, ResultError)
+    assert result.mensagem == "Aluno possui empréstimo ativo: 2"
+
+
+def test_nao_pode_cadastrar_emprestimo_quando_bem_tem_ativo(emprestimo):
+    repo = mock.Mock()
+    policy = mock.Mock()
+    policy.pode_criar.return_value = True
+
+    repo.cadastrar_emprestimo.side_effect = BemComEmprestimoAtivoError(3)
+    usecase = CadastrarEmprestimoUsecase(repo, policy)
+
+    result = usecase.execute(emprestimo)
+
+    assert isinstance(result, ResultError)
+    assert result.mensagem == "Bem possui empréstimo ativo: 3"
 
 
 def test_registrar_devolucao_emprestimo_usecase():
@@ -190,6 +284,20 @@ def test_registrar_devolucao_emprestimo_usecase():
     assert result.value.estado == EmprestimoEstadoEnum.FINALIZADO
 
 
+def test_registrar_devolucao_agenda_termo_de_devolucao(emprestimo):
+    repo = mock.Mock()
+    policy = mock.Mock()
+    termos = mock.Mock()
+    policy.pode_editar.return_value = True
+    repo.registrar_devolucao.return_value = emprestimo
+
+    usecase = RegistrarDevolucaoEmprestimoUsecase(repo, policy, termos)
+    result = usecase.execute(emprestimo)
+
+    assert isinstance(result, ResultSuccess)
+    termos.agendar_termo_devolucao.assert_called_once_with(emprestimo)
+
+
 def test_nao_pode_registrar_devolucao_emprestimo_ja_devolvido_usecase():
     emprestimo = EmprestimoEntity(
         data_emprestimo=date(2025, 9, 1),
@@ -438,3 +546,57 @@ def test_gerar_termo_devolucao_requer_emprestimo_finalizado(
     mock_policy.pode_gerar_termos.assert_called_once()
     mock_pdf_service.gerar_termo_devolucao.assert_not_called()
     assert isinstance(result, ResultError)
+
+
+def test_gerar_termos_em_lote_usecase(lista_emprestimos_em_andamento, mock_policy):
+    repo = mock.Mock()
+    service = mock.Mock()
+    progresso = mock.Mock()
+    repo.contar.return_value = len(lista_emprestimos_em_andamento)
+    repo.iterar.return_value = iter(lista_emprestimos_em_andamento)
+    mock_policy.pode_listar.return_value = True
+    # o segundo empréstimo foi removido
+    mock_policy.pode_gerar_termos.side_effect = lambda e: e.id != 2
+
+    usecase = GerarTermosEmLoteUsecase(repo, mock_policy, service)
+    result = usecase.execute(
+        TermoTipoEnum.RESPONSABILIDADE, {"curso": 1}, progresso=progresso
+    )
+
+    assert isinstance(result, ResultSuccess)
+    assert result.value is service.gerar_zip.return_value
+    repo.iterar.assert_called_once_with(curso=1, estado=EmprestimoEstadoEnum.ATIVO)
+
+    ids, tipo, acompanhar = service.gerar_zip.call_args.args
+    assert list(ids) == [1, 3, 4]
+    assert tipo == TermoTipoEnum.RESPONSABILIDADE
+
+    acompanhar(1)
+    progresso.assert_called_once_with(1, len(lista_emprestimos_em_andamento))
+
+
+def test_gerar_termos_em_lote_usecase_sem_emprestimos(mock_policy):
+    repo = mock.Mock()
+    service = mock.Mock()
+    repo.contar.return_value = 0
+    mock_policy.pode_listar.return_value = True
+
+    usecase = GerarTermosEmLoteUsecase(repo, mock_policy, service)
+    result = usecase.execute(TermoTipoEnum.DEVOLUCAO, {"estado": 1})
+
+    assert isinstance(result, ResultError)
+    repo.contar.assert_called_once_with(estado=EmprestimoEstadoEnum.FINALIZADO)
+    service.gerar_zip.assert_not_called()
+
+
+def test_gerar_termos_em_lote_usecase_sem_permissao(mock_policy):
+    repo = mock.Mock()
+    service = mock.Mock()
+    mock_policy.pode_listar.return_value = False
+
+    usecase = GerarTermosEmLoteUsecase(repo, mock_policy, service)
+    result = usecase.execute(TermoTipoEnum.RESPONSABILIDADE)
+
+    assert isinstance(result, ResultError)
+    repo.contar.assert_not_called()
+    service.gerar_zip.assert_not_called()
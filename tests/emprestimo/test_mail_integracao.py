@@ -0,0 +1,118 @@
+import time
+from unittest import mock
+
+import pytest
+from django.core import mail
+
+from emprestimo.domain.contracts.mail import Email
+from emprestimo.infrastructure.services import mail_django
+from emprestimo.infrastructure.services.mail_django import (
+    BaldeDeTokens,
+    DjangoMailService,
+    DjangoMailServiceConcorrente,
+)
+from tests.emprestimo.smtp_local import ServidorSMTPLocal
+
+
+@pytest.fixture
+def servidor_smtp(settings):
+    with ServidorSMTPLocal() as servidor:
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST, settings.EMAIL_PORT = servidor.endereco
+        settings.EMAIL_USE_TLS = False
+        settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+        yield servidor
+
+
+def emails(quantidade):
+    return [
+        Email(f"Mensagem {i}", [f"aluno{i}@ifpr.edu.br"], assunto=f"Aviso {i}")
+        for i in range(quantidade)
+    ]
+
+
+def test_enviar_emails_usa_uma_conexao():
+    emails = [
+        Email("Mensagem 1", ["aluno1@ifpr.edu.br"], assunto="Aviso 1"),
+        Email(
+            "Mensagem 2",
+            ["aluno2@ifpr.edu.br"],
+            assunto="Aviso 2",
+            mensagem_html="<p>Mensagem 2</p>",
+        ),
+    ]
+
+    with mock.patch.object(
+        mail_django, "get_connection", wraps=mail_django.get_connection
+    ) as get_connection:
+        enviados = DjangoMailService().enviar_emails(emails)
+
+    get_connection.assert_called_once()
+    assert enviados == [1, 1]
+    assert [m.subject for m in mail.outbox] == ["Aviso 1", "Aviso 2"]
+    assert mail.outbox[1].alternatives[0].content == "<p>Mensagem 2</p>"
+
+
+def test_enviar_emails_concorrente_usa_varias_conexoes(servidor_smtp):
+    enviados = DjangoMailServiceConcorrente(conexoes=3).enviar_emails(emails(30))
+
+    assert enviados == [1] * 30
+    assert servidor_smtp.mensagens == 30
+    assert 1 < servidor_smtp.conexoes <= 3
+
+
+def test_enviar_emails_concorrente_respeita_limite_de_taxa(servidor_smtp):
+    service = DjangoMailServiceConcorrente(conexoes=4, taxa=20, rajada=2)
+
+    inicio = time.monotonic()
+    enviados = service.enviar_emails(emails(10))
+    decorrido = time.monotonic() - inicio
+
+    # 2 saem na rajada inicial, os outros 8 a 20 por segundo
+    assert enviados == [1] * 10
+    assert decorrido >= 8 / 20 * 0.9
+
+
+def test_enviar_emails_concorrente_conexao_cai_no_meio(servidor_smtp):
+    servidor_smtp.atraso = 0.01
+    servidor_smtp.queda_apos = 2
+
+    enviados = DjangoMailServiceConcorrente(conexoes=2).enviar_emails(emails(10))
+
+    # o que a conexão perdida não enviou fica com a outra thread
+    assert enviados == [1] * 10
+    assert servidor_smtp.mensagens == 10
+
+
+def test_enviar_emails_conexao_cai_no_meio(servidor_smtp):
+    servidor_smtp.queda_apos = 2
+
+    enviados = DjangoMailService().enviar_emails(emails(5))
+
+    assert enviados == [1, 1, 0, 0, 0]
+    assert servidor_smtp.mensagens == 2
+
+
+def test_enviar_emails_concorrente_servidor_indisponivel(settings):
+    with ServidorSMTPLocal() as servidor:
+        endereco = servidor.endereco
+
+    settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST, settings.EMAIL_PORT = endereco
+    settings.EMAIL_USE_TLS = False
+
+    assert DjangoMailServiceConcorrente(conexoes=2).enviar_emails(emails(3)) == [
+        0,
+        0,
+        0,
+    ]
+
+
+def test_balde_de_tokens_limita_a_taxa():
+    balde = BaldeDeTokens(taxa=50, capacidade=5)
+
+    inicio = time.monotonic()
+    for _ in range(15):
+        balde.aguardar()
+
+    assert time.monotonic() - inicio >= 10 / 50 * 0.9
@@ -1,12 +1,25 @@
-from datetime import date, datetime
+from dataclasses import replace
+from datetime import date, datetime, timedelta
 import pytest
 
-from core.types import ResultSuccess
+from core.types import ResultError, ResultSuccess
 from emprestimo.domain.contracts.mail import MailService
-from emprestimo.domain.entities import EmprestimoEntity
-from emprestimo.domain.types import EmprestimoEstadoEnum
-from emprestimo.repositories.contracts import EmprestimoRepository
-from emprestimo.usecases import NotificarDevolucaoUsecase
+from emprestimo.domain.entities import EmprestimoEntity, NotificacaoEntity
+from emprestimo.domain.types import (
+    CronogramaLembretes,
+    EmprestimoEstadoEnum,
+    NotificacaoTipoEnum,
+)
+from emprestimo.repositories.contracts import (
+    EmprestimoRepository,
+    NotificacaoRepository,
+)
+from emprestimo.infrastructure.services.contracts import TemplateService
+from emprestimo.usecases import (
+    EntregarNotificacoesUsecase,
+    NotificarDevolucaoPorAlunoUsecase,
+    NotificarDevolucaoUsecase,
+)
 from unittest.mock import Mock
 
 from ensino.domain.entities import AlunoEntity
@@ -18,6 +31,17 @@ def data_devolucao():
     return date(2025, 9, 25)
 
 
+@pytest.fixture
+def hoje(data_devolucao):
+    # primeiro dia da etapa D-7
+    return data_devolucao - timedelta(days=7)
+
+
+@pytest.fixture
+def agora():
+    return datetime(2025, 9, 18, 8, 0)
+
+
 @pytest.fixture
 def emprestimo(data_devolucao):
     return EmprestimoEntity(
@@ -45,21 +69,311 @@ def aluno():
     )
 
 
-def test_notificacao_devolucao_envia_email(
+@pytest.fixture
+def notificacao(data_devolucao, aluno):
+    return NotificacaoEntity(
+        id=1,
+        emprestimo_id=1,
+        tipo=NotificacaoTipoEnum.LEMBRETE_DEVOLUCAO,
+        data_referencia=data_devolucao,
+        destinatario=aluno.email,
+        assunto="[SIGEMP] - Lembrete",
+        mensagem="Devolução prevista para 25/09/2025",
+    )
+
+
+def test_notificacao_devolucao_enfileira_lembretes(
+    emprestimo, aluno: AlunoEntity, data_devolucao, hoje
+):
+    emprestimo_repo = Mock(spec=EmprestimoRepository)
+    aluno_repo = Mock(spec=AlunoRepository)
+    notificacao_repo = Mock(spec=NotificacaoRepository)
+
+    aluno_repo.buscar_emails.return_value = {aluno.id: aluno.email}
+    emprestimo_repo.listar_devolucoes_ate.return_value = iter([emprestimo])
+
+    usecase = NotificarDevolucaoUsecase(emprestimo_repo, aluno_repo, notificacao_repo)
+    result = usecase.execute(hoje)
+
+    assert isinstance(result, ResultSuccess)
+    assert result.value == 1
+
+    # uma única consulta cobre todas as etapas até a maior antecedência
+    emprestimo_repo.listar_devolucoes_ate.assert_called_once_with(data_devolucao)
+
+    (lembretes,), _kwargs = notificacao_repo.enfileirar.call_args
+    assert [
+        (n.emprestimo_id, n.data_referencia, n.destinatario) for n in lembretes
+    ] == [(emprestimo.id, hoje, aluno.email)]
+    assert lembretes[0].tipo == NotificacaoTipoEnum.LEMBRETE_DEVOLUCAO
+
+    emprestimo_repo.registrar_lembretes.assert_called_once_with({emprestimo.id: hoje})
+
+
+def test_notificacao_devolucao_ignora_etapa_ja_notificada(
+    emprestimo, aluno: AlunoEntity, data_devolucao, hoje
+):
+    emprestimo_repo = Mock(spec=EmprestimoRepository)
+    aluno_repo = Mock(spec=AlunoRepository)
+    notificacao_repo = Mock(spec=NotificacaoRepository)
+
+    emprestimo_repo.listar_devolucoes_ate.return_value = iter(
+        [replace(emprestimo, ultimo_lembrete_em=hoje)]
+    )
+
+    usecase = NotificarDevolucaoUsecase(emprestimo_repo, aluno_repo, notificacao_repo)
+    result = usecase.execute(hoje + timedelta(days=1))
+
+    aluno_repo.buscar_emails.assert_not_called()
+    notificacao_repo.enfileirar.assert_not_called()
+    assert result.value == 0
+
+
+def test_notificacao_devolucao_cobra_atraso(
     emprestimo, aluno: AlunoEntity, data_devolucao
 ):
-    mail_service = Mock(spec=MailService)
     emprestimo_repo = Mock(spec=EmprestimoRepository)
     aluno_repo = Mock(spec=AlunoRepository)
+    notificacao_repo = Mock(spec=NotificacaoRepository)
+
+    aluno_repo.buscar_emails.return_value = {aluno.id: aluno.email}
+    emprestimo_repo.listar_devolucoes_ate.return_value = iter(
+        [replace(emprestimo, ultimo_lembrete_em=data_devolucao - timedelta(days=1))]
+    )
+
+    usecase = NotificarDevolucaoUsecase(
+        emprestimo_repo,
+        aluno_repo,
+        notificacao_repo,
+        CronogramaLembretes(dias_antes=(7, 1), atraso_a_cada=3),
+    )
+    usecase.execute(data_devolucao + timedelta(days=5))
+
+    (lembretes,), _kwargs = notificacao_repo.enfileirar.call_args
+    assert lembretes[0].data_referencia == data_devolucao + timedelta(days=4)
+    assert "atraso" in lembretes[0].assunto
+
+
+def test_notificacao_devolucao_busca_emails_por_lote(
+    emprestimo, aluno: AlunoEntity, hoje
+):
+    emprestimo_repo = Mock(spec=EmprestimoRepository)
+    aluno_repo = Mock(spec=AlunoRepository)
+    notificacao_repo = Mock(spec=NotificacaoRepository)
+
+    emprestimos = [replace(emprestimo, id=i, bem_id=i, aluno_id=i) for i in range(5)]
+    aluno_repo.buscar_emails.side_effect = lambda ids: {
+        i: f"aluno{i}@ifpr.edu.br" for i in ids if i != 3
+    }
+    emprestimo_repo.listar_devolucoes_ate.return_value = iter(emprestimos)
+
+    usecase = NotificarDevolucaoUsecase(
+        emprestimo_repo, aluno_repo, notificacao_repo, tamanho_lote=2
+    )
+    result = usecase.execute(hoje)
+
+    assert aluno_repo.buscar_emails.call_count == 3
+    assert notificacao_repo.enfileirar.call_count == 3
+    aluno_repo.buscar_por_id.assert_not_called()
+
+    # aluno sem e-mail não gera lembrete
+    assert isinstance(result, ResultSuccess)
+    assert result.value == 4
+
+
+def test_notificacao_devolucao_erro_ao_enfileirar(emprestimo, aluno: AlunoEntity, hoje):
+    emprestimo_repo = Mock(spec=EmprestimoRepository)
+    aluno_repo = Mock(spec=AlunoRepository)
+    notificacao_repo = Mock(spec=NotificacaoRepository)
+
+    aluno_repo.buscar_emails.return_value = {aluno.id: aluno.email}
+    emprestimo_repo.listar_devolucoes_ate.return_value = iter([emprestimo])
+    notificacao_repo.enfileirar.side_effect = Exception("banco indisponível")
+
+    usecase = NotificarDevolucaoUsecase(emprestimo_repo, aluno_repo, notificacao_repo)
+    result = usecase.execute(hoje)
+
+    # sem enfileirar, a etapa não é registrada e sai na próxima execução
+    emprestimo_repo.registrar_lembretes.assert_not_called()
+    assert isinstance(result, ResultError)
+
+
+def test_notificacao_devolucao_por_aluno_enfileira_um_resumo_por_aluno(
+    emprestimo, aluno: AlunoEntity, data_devolucao, hoje
+):
+    emprestimo_repo = Mock(spec=EmprestimoRepository)
+    aluno_repo = Mock(spec=AlunoRepository)
+    notificacao_repo = Mock(spec=NotificacaoRepository)
+    template_service = Mock(spec=TemplateService)
+
+    outro = replace(emprestimo, id=2, bem_id=2)
+    ja_notificado = replace(emprestimo, id=3, bem_id=3, ultimo_lembrete_em=hoje)
+    emprestimo_repo.agrupar_devolucoes_ate_por_aluno.return_value = iter(
+        [(aluno.id, [emprestimo, outro, ja_notificado])]
+    )
+    aluno_repo.buscar_emails.return_value = {aluno.id: aluno.email}
+    template_service.renderizar.side_effect = lambda path, context: path
+
+    usecase = NotificarDevolucaoPorAlunoUsecase(
+        emprestimo_repo, aluno_repo, notificacao_repo, template_service
+    )
+    result = usecase.execute(hoje)
+
+    assert isinstance(result, ResultSuccess)
+    assert result.value == 1
+
+    (resumos,), _kwargs = notificacao_repo.enfileirar.call_args
+    assert len(resumos) == 1
+    assert resumos[0].aluno_id == aluno.id
+    assert resumos[0].emprestimo_id is None
+    assert resumos[0].tipo == NotificacaoTipoEnum.RESUMO_DEVOLUCAO
+    assert resumos[0].mensagem.endswith(".txt")
+    assert resumos[0].mensagem_html.endswith(".html")
+
+    _path, context = template_service.renderizar.call_args.args
+    assert context["emprestimos"] == [emprestimo, outro]
+
+    emprestimo_repo.registrar_lembretes.assert_called_once_with(
+        {emprestimo.id: hoje, outro.id: hoje}
+    )
+
+
+@pytest.mark.parametrize(
+    "dias_para_o_prazo, ultimo_lembrete, etapa",
+    [
+        (10, None, None),
+        (7, None, -7),
+        # um dia sem cron não perde a etapa
+        (6, None, -7),
+        (6, -7, None),
+        (3, -7, -3),
+        # etapas atrasadas são puladas: só a vigente é enviada
+        (1, None, -1),
+        (0, -1, None),
+        (-1, -1, 1),
+        (-3, 1, None),
+        (-4, 1, 4),
+        (-5, None, 4),
+    ],
+)
+def test_cronograma_lembretes_etapa_pendente(
+    data_devolucao, dias_para_o_prazo, ultimo_lembrete, etapa
+):
+    cronograma = CronogramaLembretes(dias_antes=(7, 3, 1), atraso_a_cada=3)
+
+    def dia(deslocamento):
+        if deslocamento is None:
+            return None
+        return data_devolucao + timedelta(days=deslocamento)
+
+    hoje = data_devolucao - timedelta(days=dias_para_o_prazo)
+    assert cronograma.etapa_pendente(data_devolucao, dia(ultimo_lembrete), hoje) == dia(
+        etapa
+    )
+
+
+def test_cronograma_lembretes_sem_cobranca_de_atraso(data_devolucao):
+    cronograma = CronogramaLembretes(dias_antes=(7,), atraso_a_cada=None)
+
+    assert cronograma.etapa(data_devolucao, data_devolucao + timedelta(days=1)) is None
+
+
+def test_entregar_notificacoes_marca_enviadas(notificacao, agora):
+    repo = Mock(spec=NotificacaoRepository)
+    mail_service = Mock(spec=MailService)
+
+    outra = replace(notificacao, id=2)
+    repo.reservar_pendentes.side_effect = [[notificacao, outra], []]
+    mail_service.enviar_emails.return_value = [1, 1]
+
+    usecase = EntregarNotificacoesUsecase(repo, mail_service)
+    result = usecase.execute(lambda: agora)
+
+    (emails,), _kwargs = mail_service.enviar_emails.call_args
+    assert [e.destinatarios for e in emails] == [[notificacao.destinatario]] * 2
+    assert emails[0].mensagem_html is None
 
-    aluno_repo.buscar_por_id.return_value = aluno
-    emprestimo_repo.listar_emprestimos_devolucao_proxima.return_value = [emprestimo]
+    repo.marcar_enviadas.assert_called_once_with([1, 2], agora)
+    repo.reagendar.assert_not_called()
+
+    assert isinstance(result, ResultSuccess)
+    assert result.value == {"enviadas": 2, "reagendadas": 0, "descartadas": 0}
+
+
+def test_entregar_notificacoes_reagenda_com_espera_exponencial(notificacao, agora):
+    repo = Mock(spec=NotificacaoRepository)
+    mail_service = Mock(spec=MailService)
+
+    terceira_tentativa = replace(notificacao, id=2, tentativas=2)
+    repo.reservar_pendentes.side_effect = [[notificacao, terceira_tentativa], []]
+    mail_service.enviar_emails.return_value = [0, 0]
+
+    usecase = EntregarNotificacoesUsecase(
+        repo, mail_service, espera_base=timedelta(minutes=5)
+    )
+    result = usecase.execute(lambda: agora)
+
+    erro = "E-mail não aceito pelo servidor."
+    repo.reagendar.assert_any_call(1, agora + timedelta(minutes=5), erro)
+    repo.reagendar.assert_any_call(2, agora + timedelta(minutes=20), erro)
+    repo.marcar_enviadas.assert_called_once_with([], agora)
+
+    assert isinstance(result, ResultError)
+
+
+def test_entregar_notificacoes_descarta_apos_max_tentativas(notificacao, agora):
+    repo = Mock(spec=NotificacaoRepository)
+    mail_service = Mock(spec=MailService)
+
+    ultima_tentativa = replace(notificacao, tentativas=4)
+    repo.reservar_pendentes.side_effect = [[ultima_tentativa], []]
+    mail_service.enviar_emails.side_effect = ConnectionRefusedError("recusada")
+
+    usecase = EntregarNotificacoesUsecase(repo, mail_service, max_tentativas=5)
+    result = usecase.execute(lambda: agora)
+
+    repo.descartar.assert_called_once_with(notificacao.id, "recusada")
+    repo.reagendar.assert_not_called()
+
+    assert isinstance(result, ResultError)
+
+
+def test_entregar_notificacoes_reserva_cada_lote_com_a_hora_atual(notificacao, agora):
+    repo = Mock(spec=NotificacaoRepository)
+    mail_service = Mock(spec=MailService)
+
+    repo.reservar_pendentes.side_effect = [
+        [notificacao],
+        [replace(notificacao, id=2)],
+        [],
+    ]
+    mail_service.enviar_emails.return_value = [1]
+    # cada lote demora 20 minutos, mais que a reserva de 15
+    horas = iter(agora + timedelta(minutes=20 * i) for i in range(3))
+
+    usecase = EntregarNotificacoesUsecase(
+        repo, mail_service, tamanho_lote=1, reserva=timedelta(minutes=15)
+    )
+    result = usecase.execute(lambda: next(horas))
+
+    segunda = agora + timedelta(minutes=20)
+    assert repo.reservar_pendentes.call_args_list[1].args == (
+        segunda,
+        1,
+        segunda + timedelta(minutes=15),
+    )
+    repo.marcar_enviadas.assert_any_call([2], segunda)
+    assert result.value["enviadas"] == 2
+
+
+def test_entregar_notificacoes_sem_pendentes(agora):
+    repo = Mock(spec=NotificacaoRepository)
+    mail_service = Mock(spec=MailService)
 
-    mail_service.enviar_email.return_value = 1
+    repo.reservar_pendentes.return_value = []
 
-    usecase = NotificarDevolucaoUsecase(emprestimo_repo, aluno_repo, mail_service)
-    result = usecase.execute(data_devolucao)
+    result = EntregarNotificacoesUsecase(repo, mail_service).execute(lambda: agora)
 
+    mail_service.enviar_emails.assert_not_called()
     assert isinstance(result, ResultSuccess)
-    assert aluno.email in result.value.keys()
-    assert result.value[aluno.email] == 1
+    assert result.value == {"enviadas": 0, "reagendadas": 0, "descartadas": 0}
@@ -0,0 +1,112 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from emprestimo.domain.types import EmprestimoEstadoEnum
+from ensino.models import Aluno, Campus, Curso, FormaSelecao
+from patrimonio.models import (
+    Bem,
+    EstadoConservacao,
+    GrauFragilidade,
+    MarcaModelo,
+    TipoBem,
+)
+
+
+@pytest.fixture
+def migrar(transactional_db):
+    """Migra o app emprestimo até `destino` e devolve os models daquele estado."""
+
+    def migrar(destino: str):
+        executor = MigrationExecutor(connection)
+        executor.migrate([("emprestimo", destino)])
+        executor.loader.build_graph()
+        return executor.loader.project_state([("emprestimo", destino)]).apps
+
+    yield migrar
+
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+
+@pytest.fixture
+def bens(transactional_db):
+    tipo = TipoBem.objects.create(descricao="Projetor")
+    grau_fragilidade = GrauFragilidade.objects.create(descricao="Médio", nivel=3)
+    estado_conservacao = EstadoConservacao.objects.create(descricao="Bom", nivel=4)
+    marca_modelo = MarcaModelo.objects.create(marca="Epson", modelo="X49")
+    return [
+        Bem.objects.create(
+            patrimonio=f"000.000.000.00{i}",
+            descricao=f"Bem {i}",
+            tipo=tipo,
+            grau_fragilidade=grau_fragilidade,
+            estado_conservacao=estado_conservacao,
+            marca_modelo=marca_modelo,
+            disponivel=False,
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def alunos(transactional_db):
+    campus = Campus.objects.create(sigla="PNG", nome="Paranaguá")
+    curso = Curso.objects.create(sigla="TADS", nome="TADS", campus=campus)
+    forma_selecao = FormaSelecao.objects.create(
+        descricao="Edital N°01/2020",
+        periodo_inicio=timezone.localdate(),
+        periodo_fim=timezone.localdate(),
+    )
+    return [
+        Aluno.objects.create(
+            nome=f"Aluno {i}",
+            cpf=f"0000000000{i}",
+            email=f"aluno{i}@ifpr.edu.br",
+            matricula=f"202500{i}",
+            telefone="41999990001",
+            forma_selecao=forma_selecao,
+            curso=curso,
+        )
+        for i in range(3)
+    ]
+
+
+def test_migracao_resolve_emprestimos_ativos_duplicados(migrar, bens, alunos):
+    apps = migrar("0007_ocorrencia_descricao")
+    Emprestimo = apps.get_model("emprestimo", "Emprestimo")
+
+    def emprestar(bem, aluno, dia, estado=EmprestimoEstadoEnum.ATIVO):
+        return Emprestimo.objects.create(
+            bem_id=bem.id,
+            aluno_id=aluno.id,
+            data_emprestimo=date(2025, 9, dia),
+            data_devolucao_prevista=date(2025, 9, 30),
+            estado=estado,
+        ).id
+
+    # dois ativos para o mesmo bem
+    bem_antigo = emprestar(bens[0], alunos[0], 1)
+    bem_recente = emprestar(bens[0], alunos[1], 2)
+    finalizado = emprestar(bens[0], alunos[0], 3, EmprestimoEstadoEnum.FINALIZADO)
+    # dois ativos para o mesmo aluno
+    aluno_antigo = emprestar(bens[1], alunos[2], 1)
+    aluno_recente = emprestar(bens[2], alunos[2], 2)
+
+    apps = migrar("0009_emprestimo_ativo_unico")
+    Emprestimo = apps.get_model("emprestimo", "Emprestimo")
+
+    removidos = Emprestimo.objects.filter(removido_em__isnull=False)
+    assert sorted(removidos.values_list("id", flat=True)) == [bem_antigo, aluno_antigo]
+    assert sorted(
+        Emprestimo.objects.filter(removido_em__isnull=True).values_list("id", flat=True)
+    ) == [bem_recente, finalizado, aluno_recente]
+    # o bem do empréstimo removido por conflito de aluno volta a ficar livre
+    assert list(Bem.objects.order_by("id").values_list("disponivel", flat=True)) == [
+        False,
+        True,
+        False,
+    ]
@@ -0,0 +1,273 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from emprestimo.domain.types import EmprestimoEstadoEnum, NotificacaoEstadoEnum
+from emprestimo.domain.types import NotificacaoTipoEnum
+from emprestimo.infrastructure.services import django as services_django
+from emprestimo.infrastructure.services.django import DjangoTemplateService
+from emprestimo.infrastructure.services.mail_django import DjangoMailService
+from emprestimo.models import Emprestimo, Notificacao
+from emprestimo.repositories.django import (
+    DjangoEmprestimoRepository,
+    DjangoNotificacaoRepository,
+)
+from emprestimo.usecases import (
+    EntregarNotificacoesUsecase,
+    NotificarDevolucaoPorAlunoUsecase,
+    NotificarDevolucaoUsecase,
+)
+from ensino.models import Aluno, Campus, Curso, FormaSelecao
+from ensino.repositories.django import DjangoAlunoRepository
+from patrimonio.models import (
+    Bem,
+    EstadoConservacao,
+    GrauFragilidade,
+    MarcaModelo,
+    TipoBem,
+)
+
+
+@pytest.fixture
+def data_devolucao():
+    return timezone.localdate() + timedelta(days=7)
+
+
+@pytest.fixture
+def emprestimos(db, data_devolucao):
+    tipo = TipoBem.objects.create(descricao="Projetor")
+    grau_fragilidade = GrauFragilidade.objects.create(descricao="Médio", nivel=3)
+    estado_conservacao = EstadoConservacao.objects.create(descricao="Bom", nivel=4)
+    marca_modelo = MarcaModelo.objects.create(marca="Epson", modelo="X49")
+    campus = Campus.objects.create(sigla="PNG", nome="Paranaguá")
+    curso = Curso.objects.create(sigla="TADS", nome="TADS", campus=campus)
+    forma_selecao = FormaSelecao.objects.create(
+        descricao="Edital N°01/2020",
+        periodo_inicio=timezone.localdate(),
+        periodo_fim=timezone.localdate(),
+    )
+
+    emprestimos = []
+    for i in range(3):
+        bem = Bem.objects.create(
+            patrimonio=f"000.000.000.00{i}",
+            descricao=f"Bem {i}",
+            tipo=tipo,
+            grau_fragilidade=grau_fragilidade,
+            estado_conservacao=estado_conservacao,
+            marca_modelo=marca_modelo,
+            disponivel=False,
+        )
+        aluno = Aluno.objects.create(
+            nome=f"Aluno {i}",
+            cpf=f"0000000000{i}",
+            email=f"aluno{i}@ifpr.edu.br",
+            matricula=f"202500{i}",
+            telefone="41999990001",
+            forma_selecao=forma_selecao,
+            curso=curso,
+        )
+        emprestimos.append(
+            Emprestimo.objects.create(
+                aluno=aluno,
+                bem=bem,
+                data_emprestimo=timezone.localdate(),
+                data_devolucao_prevista=data_devolucao,
+                estado=EmprestimoEstadoEnum.ATIVO,
+            )
+        )
+
+    return emprestimos
+
+
+def enfileirar(hoje=None):
+    return NotificarDevolucaoUsecase(
+        DjangoEmprestimoRepository(),
+        DjangoAlunoRepository(),
+        DjangoNotificacaoRepository(),
+        tamanho_lote=2,
+    ).execute(hoje or timezone.localdate())
+
+
+def entregar(agora, service=None):
+    return EntregarNotificacoesUsecase(
+        DjangoNotificacaoRepository(), service or DjangoMailService(), tamanho_lote=2
+    ).execute(lambda: agora)
+
+
+def test_enfileirar_lembretes_e_idempotente(emprestimos, data_devolucao):
+    assert enfileirar().value == 3
+    assert enfileirar().value == 0
+
+    assert Notificacao.objects.count() == 3
+    assert set(Notificacao.objects.values_list("emprestimo_id", flat=True)) == {
+        e.id for e in emprestimos
+    }
+
+
+def test_entregar_notificacoes_envia_uma_unica_vez(emprestimos, data_devolucao):
+    enfileirar()
+    agora = timezone.now()
+
+    resultado = entregar(agora)
+
+    assert resultado.value["enviadas"] == 3
+    assert sorted(m.subject for m in mail.outbox) == sorted(
+        Notificacao.objects.values_list("assunto", flat=True)
+    )
+    assert not Notificacao.objects.exclude(estado=NotificacaoEstadoEnum.ENVIADA)
+
+    # nova execução (ou novo enfileiramento do mesmo dia) não reenvia
+    enfileirar()
+    assert entregar(agora + timedelta(hours=1)).value["enviadas"] == 0
+    assert len(mail.outbox) == 3
+
+
+def test_entrega_demorada_nao_reenvia_lotes(emprestimos, data_devolucao):
+    enfileirar()
+    agora = timezone.now()
+    horas = []
+
+    def relogio():
+        # cada lote leva 20 minutos, mais que a reserva de 15
+        horas.append(agora + timedelta(minutes=20 * len(horas)))
+        return horas[-1]
+
+    class Lento(DjangoMailService):
+        def enviar_emails(self, emails):
+            # a próxima execução do cron começa antes deste lote terminar
+            if len(horas) == 2:
+                assert entregar(horas[-1] + timedelta(minutes=1)).value == {
+                    "enviadas": 0,
+                    "reagendadas": 0,
+                    "descartadas": 0,
+                }
+            return super().enviar_emails(emails)
+
+    resultado = EntregarNotificacoesUsecase(
+        DjangoNotificacaoRepository(), Lento(), tamanho_lote=2
+    ).execute(relogio)
+
+    assert resultado.value["enviadas"] == 3
+    assert len(mail.outbox) == 3
+
+
+def test_entregar_notificacoes_reagenda_falhas(emprestimos, data_devolucao):
+    enfileirar()
+    agora = timezone.now()
+
+    service = DjangoMailService()
+    with mock.patch.object(
+        service, "enviar_emails", side_effect=lambda emails: [0] * len(emails)
+    ):
+        assert not entregar(agora, service)
+
+    falhas = Notificacao.objects.filter(estado=NotificacaoEstadoEnum.PENDENTE)
+    assert falhas.count() == 3
+    assert all(n.tentativas == 1 and n.ultimo_erro for n in falhas)
+    assert all(n.proxima_tentativa_em > agora for n in falhas)
+
+    # antes do prazo de espera nada é reenviado
+    assert entregar(agora).value["enviadas"] == 0
+
+    resultado = entregar(agora + timedelta(minutes=5))
+    assert resultado.value["enviadas"] == 3
+    assert len(mail.outbox) == 3
+
+
+def test_entregar_notificacoes_descarta_apos_max_tentativas(
+    emprestimos, data_devolucao
+):
+    enfileirar()
+
+    service = DjangoMailService()
+    with mock.patch.object(service, "enviar_emails", side_effect=OSError("recusada")):
+        EntregarNotificacoesUsecase(
+            DjangoNotificacaoRepository(), service, max_tentativas=1
+        ).execute(timezone.now)
+
+    assert (
+        Notificacao.objects.filter(
+            estado=NotificacaoEstadoEnum.DESCARTADA, ultimo_erro="recusada"
+        ).count()
+        == 3
+    )
+
+
+def enfileirar_resumos(hoje=None):
+    return NotificarDevolucaoPorAlunoUsecase(
+        DjangoEmprestimoRepository(),
+        DjangoAlunoRepository(),
+        DjangoNotificacaoRepository(),
+        DjangoTemplateService(),
+    ).execute(hoje or timezone.localdate())
+
+
+def test_resumo_por_aluno_envia_texto_e_html(emprestimos, data_devolucao):
+    assert enfileirar_resumos().value == 3
+    enfileirar_resumos()
+
+    notificacoes = Notificacao.objects.order_by("aluno_id")
+    assert [n.aluno_id for n in notificacoes] == sorted(e.aluno_id for e in emprestimos)
+    assert all(n.tipo == NotificacaoTipoEnum.RESUMO_DEVOLUCAO for n in notificacoes)
+    assert all(n.emprestimo_id is None for n in notificacoes)
+
+    assert entregar(timezone.now()).value["enviadas"] == 3
+
+    emprestimo = emprestimos[0]
+    (email,) = [m for m in mail.outbox if emprestimo.bem.patrimonio in m.subject]
+    html, _tipo = email.alternatives[0]
+    assert emprestimo.aluno.nome in email.body
+    assert emprestimo.bem.patrimonio in email.body
+    assert f"{emprestimo.bem.descricao} ({emprestimo.bem.patrimonio})" in html
+    assert f"<strong>{data_devolucao.strftime('%d/%m/%Y')}</strong>" in html
+    assert data_devolucao.strftime("%d/%m/%Y") in email.body
+
+
+def test_templates_do_resumo_sao_compilados_uma_vez(emprestimos, data_devolucao):
+    services_django._template.cache_clear()
+
+    enfileirar_resumos()
+
+    # 3 resumos, texto e HTML: 2 compilações e 4 reaproveitamentos
+    info = services_django._template.cache_info()
+    assert (info.misses, info.hits) == (2, 4)
+
+
+def test_lembretes_seguem_as_etapas_do_cronograma(emprestimos, data_devolucao):
+    hoje = timezone.localdate()
+    atrasado = emprestimos[2]
+    Emprestimo.objects.filter(pk=atrasado.pk).update(
+        data_devolucao_prevista=hoje - timedelta(days=2)
+    )
+
+    # D-7 para os dois em dia e a primeira cobrança do atrasado
+    assert enfileirar(hoje).value == 3
+    assert Emprestimo.objects.get(pk=atrasado.pk).ultimo_lembrete_em == (
+        hoje - timedelta(days=1)
+    )
+    assert Emprestimo.objects.get(pk=emprestimos[0].pk).ultimo_lembrete_em == hoje
+
+    # dentro da mesma etapa nada sai
+    assert enfileirar(hoje + timedelta(days=1)).value == 0
+
+    # D-3 para os dois em dia e a segunda cobrança do atrasado
+    assert enfileirar(hoje + timedelta(days=4)).value == 3
+    assert Notificacao.objects.count() == 6
+
+
+def test_alterar_prazo_reinicia_as_etapas(emprestimos, data_devolucao, admin_user):
+    enfileirar()
+    emprestimo = emprestimos[0]
+
+    entity = DjangoEmprestimoRepository().buscar_por_id(emprestimo.id)
+    assert entity.ultimo_lembrete_em == timezone.localdate()
+
+    entity.data_devolucao_prevista = data_devolucao - timedelta(days=1)
+    entity = DjangoEmprestimoRepository().editar_emprestimo(entity, admin_user)
+
+    assert entity.ultimo_lembrete_em is None
+    assert enfileirar().value == 1
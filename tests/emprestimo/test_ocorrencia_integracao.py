@@ -18,6 +18,7 @@ from emprestimo.domain.entities import (
 )
 from emprestimo.domain.types import EmprestimoEstadoEnum
 from emprestimo.models import Ocorrencia, Emprestimo, TipoOcorrencia
+from emprestimo.repositories.django import DjangoOcorrenciaRepository
 
 from ensino.domain.entities import (
     AlunoEntity,
@@ -613,6 +614,17 @@ def test_listar_ocorrencias(admin_client, lista_ocorrencias):
     assert response.status_code == 200
 
 
+@pytest.mark.django_db
+def test_listar_ocorrencias_consultas_constantes(
+    lista_ocorrencias, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        ocorrencias = DjangoOcorrenciaRepository().listar()
+
+    assert len(ocorrencias) == len(lista_ocorrencias)
+    assert all(o.tipo_descricao and o.aluno_nome for o in ocorrencias)
+
+
 @pytest.mark.django_db
 def test_listar_ocorrencias_sem_permissao(client, test_user, lista_ocorrencias):
     client.force_login(test_user)
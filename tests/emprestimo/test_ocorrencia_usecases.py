@@ -2,7 +2,7 @@ from datetime import date
 from unittest import mock
 import pytest
 
-from core.types import ResultError, ResultSuccess
+from core.types import Pagina, PaginaCursor, ResultError, ResultSuccess
 from emprestimo.domain.entities import OcorrenciaEntity
 from emprestimo.policies.contracts import OcorrenciaPolicy
 from emprestimo.repositories.contracts import OcorrenciaRepository
@@ -13,6 +13,7 @@ from tests.ensino.test_aluno_usecases import aluno  # noqa: F401  # pyright: ign
 
 from emprestimo.usecases import (
     ListarOcorrenciasUsecase,
+    ListarOcorrenciasPorCursorUsecase,
     ListarOcorrenciasBemUsecase,
     ListarOcorrenciasAlunoUsecase,
     ListarOcorrenciasEmprestimoUsecase,
@@ -79,6 +80,54 @@ def test_listar_ocorrencias_usecase(mock_repo, mock_policy, lista_ocorrencias):
     assert result.value == lista_ocorrencias
 
 
+def test_listar_pagina_ocorrencias_usecase(mock_repo, mock_policy, lista_ocorrencias):
+    mock_policy.pode_listar.return_value = True
+    pagina = Pagina(itens=lista_ocorrencias[:2], total=4, offset=0, limite=2)
+    mock_repo.listar_pagina.return_value = pagina
+
+    usecase = ListarOcorrenciasUsecase(mock_repo, mock_policy)
+    result = usecase.execute(offset=0, limite=2)
+
+    mock_repo.listar_pagina.assert_called_once_with(0, 2)
+    mock_repo.listar_ocorrencias.assert_not_called()
+    assert isinstance(result, ResultSuccess)
+    assert result.value == pagina
+    assert result.value.tem_proxima
+
+
+def test_listar_ocorrencias_por_cursor_usecase(
+    mock_repo, mock_policy, lista_ocorrencias
+):
+    mock_policy.pode_listar.return_value = True
+    pagina = PaginaCursor(itens=lista_ocorrencias[2:], limite=2, anterior_cursor="a")
+    mock_repo.listar_por_cursor.return_value = pagina
+
+    usecase = ListarOcorrenciasPorCursorUsecase(mock_repo, mock_policy)
+    result = usecase.execute(cursor="b", limite=2)
+
+    mock_repo.listar_por_cursor.assert_called_once_with("b", 2)
+    assert isinstance(result, ResultSuccess)
+    assert result.value == pagina
+    assert result.value.tem_anterior
+    assert not result.value.tem_proxima
+
+
+def test_listar_pagina_ocorrencias_do_aluno_usecase(
+    mock_repo, mock_policy, aluno, lista_ocorrencias
+):
+    mock_policy.pode_listar.return_value = True
+    pagina = Pagina(itens=lista_ocorrencias, total=4, offset=0, limite=10)
+    mock_repo.listar_pagina.return_value = pagina
+
+    usecase = ListarOcorrenciasAlunoUsecase(mock_repo, mock_policy)
+    result = usecase.execute(aluno.id, offset=0, limite=10)
+
+    mock_repo.listar_pagina.assert_called_once_with(0, 10, aluno_id=aluno.id)
+    mock_repo.listar_ocorrencias_do_aluno.assert_not_called()
+    assert isinstance(result, ResultSuccess)
+    assert result.value == pagina
+
+
 def test_listar_ocorrencias_sem_permissao_usecase(
     mock_repo, mock_policy, lista_ocorrencias
 ):
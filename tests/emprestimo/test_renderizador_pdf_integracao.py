@@ -0,0 +1,47 @@
+import threading
+from urllib.parse import urljoin
+
+import pytest
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+from emprestimo.infrastructure.services.renderizador_pdf import (
+    BASE_URL,
+    buscar_arquivo_local,
+    renderizador_termos,
+)
+
+
+def test_arquivo_estatico_lido_do_disco():
+    url = urljoin(BASE_URL, static("emprestimo/css/termo.css"))
+
+    recurso = buscar_arquivo_local(url)
+
+    with open(finders.find("emprestimo/css/termo.css"), "rb") as arquivo:
+        assert recurso["string"] == arquivo.read()
+    assert recurso["mime_type"] == "text/css"
+
+
+@pytest.mark.parametrize(
+    "url, erro",
+    [
+        ("https://www.ifpr.edu.br/logo.png", ValueError),
+        (urljoin(BASE_URL, static("emprestimo/css/nao_existe.css")), FileNotFoundError),
+    ],
+)
+def test_recursos_fora_dos_estaticos_sao_recusados(url, erro):
+    with pytest.raises(erro):
+        buscar_arquivo_local(url)
+
+
+def test_renderizador_reaproveitado_por_thread():
+    renderizador = renderizador_termos()
+    assert renderizador_termos() is renderizador
+
+    outra_thread = []
+    thread = threading.Thread(target=lambda: outra_thread.append(renderizador_termos()))
+    thread.start()
+    thread.join()
+
+    assert outra_thread[0] is not renderizador
+    assert outra_thread[0].fontes is not renderizador.fontes
@@ -17,6 +17,7 @@ from ensino.domain.entities import (
 )
 from ensino.infrastructure.mappers import AlunoMapper
 from ensino.models import Aluno, Campus, Curso, FormaSelecao
+from ensino.repositories.django import DjangoAlunoRepository
 
 from pprint import pprint as print
 
@@ -189,6 +190,53 @@ def test_listar_alunos(lista_alunos, admin_client):
     assertTemplateUsed(response, "ensino/aluno/aluno_list.html")
 
 
+@pytest.mark.django_db
+def test_listar_alunos_consultas_constantes(lista_alunos, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        alunos = DjangoAlunoRepository().listar_alunos()
+
+    assert len(alunos) == len(lista_alunos)
+    assert all(a.campus_sigla and a.forma_selecao_descricao for a in alunos)
+
+
+@pytest.mark.django_db
+def test_buscar_emails_em_uma_consulta(lista_alunos, django_assert_num_queries):
+    ids = [a.id for a in lista_alunos]
+
+    with django_assert_num_queries(1):
+        emails = DjangoAlunoRepository().buscar_emails(ids)
+
+    assert emails == {a.id: a.email for a in lista_alunos}
+
+
+@pytest.mark.django_db
+def test_listar_alunos_projecao_equivale_ao_mapper(lista_alunos):
+    esperado = [
+        AlunoMapper.from_model(a) for a in Aluno.objects.order_by("curso__nome", "nome")
+    ]
+
+    assert DjangoAlunoRepository().listar_alunos() == esperado
+
+
+@pytest.mark.django_db
+def test_buscar_alunos_ignora_acentos(lista_alunos, admin_client):
+    response = admin_client.get(reverse_lazy("ensino:listar_alunos"), {"nome": "JOAO"})
+
+    assert [a.nome for a in response.context["lista_alunos"]] == ["João da Silva"]
+
+
+@pytest.mark.django_db
+def test_busca_de_alunos_acompanha_edicao(admin_client, aluno: Aluno):
+    repo = DjangoAlunoRepository()
+    entity = AlunoMapper.from_model(aluno)
+    entity.nome = "Estêvão Conceição"
+
+    repo.editar_aluno(entity, None)
+
+    assert [a.id for a in repo.listar(nome="estevao concei")] == [aluno.id]
+    assert repo.listar(nome=aluno.matricula)[0].id == aluno.id
+
+
 @pytest.mark.django_db
 def test_listar_aluno_sem_permissao(client, test_user):
     client.force_login(test_user)
@@ -16,6 +16,8 @@ from patrimonio.models import (
     EstadoConservacao,
     MarcaModelo,
 )
+from patrimonio.infrastructure.mappers import BemMapper
+from patrimonio.repositories.django import DjangoBemRepository
 
 
 @pytest.fixture
@@ -190,6 +192,67 @@ def test_listar_bens(bens, admin_client):
     assertTemplateUsed(response, "patrimonio/bem/bem_list.html")
 
 
+@pytest.mark.django_db
+def test_listar_bens_consultas_constantes(
+    tipos_de_bem,
+    estados_conservacao,
+    lista_grau_fragilidade,
+    marcas_modelos,
+    django_assert_num_queries,
+):
+    Bem.objects.bulk_create(
+        Bem(
+            patrimonio=f"000.000.001.{i:03}",
+            descricao=f"Notebook {i}",
+            tipo=tipos_de_bem[i % len(tipos_de_bem)],
+            estado_conservacao=estados_conservacao[i % len(estados_conservacao)],
+            grau_fragilidade=lista_grau_fragilidade[0],
+            marca_modelo=marcas_modelos[0],
+        )
+        for i in range(10)
+    )
+
+    with django_assert_num_queries(1):
+        lista_bens = DjangoBemRepository().listar_bens()
+
+    assert len(lista_bens) == 10
+    assert all(b.tipo_descricao and b.estado_conservacao_descricao for b in lista_bens)
+
+
+@pytest.mark.django_db
+def test_listar_bens_projecao_equivale_ao_mapper(bem):
+    esperado = [BemMapper.from_model(b) for b in Bem.objects.order_by("patrimonio")]
+
+    assert DjangoBemRepository().listar_bens() == esperado
+
+
+@pytest.mark.django_db
+def test_busca_de_bens_acompanha_marca_modelo(bem, marcas_modelos):
+    repo = DjangoBemRepository()
+    marca_modelo = bem.marca_modelo
+
+    assert [b.id for b in repo.listar(texto="powerlite")] == [bem.id]
+
+    marca_modelo.modelo = "Ômega Pró"
+    marca_modelo.save()
+
+    assert [b.id for b in repo.listar(texto="omega pro")] == [bem.id]
+    assert repo.listar(texto="powerlite") == []
+
+
+@pytest.mark.django_db
+def test_filtrar_bens_por_disponibilidade(bem):
+    repo = DjangoBemRepository()
+
+    assert [b.id for b in repo.listar(eh_disponivel="s")] == [bem.id]
+    assert repo.listar(eh_disponivel="n") == []
+
+    Bem.objects.filter(pk=bem.id).update(disponivel=False)
+
+    assert repo.listar(eh_disponivel="s") == []
+    assert [b.id for b in repo.listar(eh_disponivel="n")] == [bem.id]
+
+
 @pytest.mark.django_db
 def test_listar_bem_sem_permissao(client, test_user):
     client.force_login(test_user)
@@ -186,7 +186,7 @@ def test_nao_pode_editar_para_patrimonio_existente_usecase(bem, lista_bem):
     repo.buscar_por_patrimonio.return_value = lista_bem[1]
 
     usecase = EditarBemUsecase(repo, policy)
-    bem.patirmonio = lista_bem[1].patrimonio
+    bem.patrimonio = lista_bem[1].patrimonio
     result = usecase.execute(bem)
 
     repo.editar_bem.assert_not_called()